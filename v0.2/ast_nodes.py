@@ -6,40 +6,59 @@ da linguagem Atom v0.2.
 """
 
 from typing import List, Union, Optional, Any
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
+
+def ast_node(*annotation_slots: str):
+    """
+    Decorador dos nós da AST: @dataclass + __slots__ (sem __dict__ por instância).
+    annotation_slots declara os atributos que as fases seguintes anexam ao nó
+    (SemanticAnalyzer, module_loader). Não são campos do dataclass: ficam fora de
+    __init__/__repr__/__eq__ e de generic_visit, e um slot não atribuído levanta
+    AttributeError, então getattr(nó, nome, padrão) continua funcionando.
+    """
+    def wrap(cls):
+        cls = dataclass(cls)
+        inherited = {name for base in cls.__mro__[1:] for name in getattr(base, '__slots__', ())}
+        names = [f.name for f in fields(cls)] + list(annotation_slots)
+        cls_dict = dict(cls.__dict__)
+        for name in names: cls_dict.pop(name, None) # Valores padrão na classe conflitam com os slots
+        cls_dict.pop('__dict__', None); cls_dict.pop('__weakref__', None)
+        cls_dict['__slots__'] = tuple(name for name in names if name not in inherited)
+        return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    return wrap
 
 # --- Classes Base ---
 
-@dataclass
+@ast_node()
 class Node:
     """Classe base para todos os nós da AST."""
     # O dataclass gera __init__, __repr__, __eq__ etc. automaticamente
     pass
 
-@dataclass
+@ast_node()
 class Statement(Node):
     """Classe base para nós que representam comandos ou declarações."""
     pass
 
-@dataclass
+@ast_node('atom_type', 'resolved_base_type_for_field_access')
 class Expression(Node):
     """Classe base para nós que representam expressões."""
     pass
 
-@dataclass
+@ast_node('canonical_type') # Tipo internado equivalente, anotado pelo SemanticAnalyzer (chave do cache de tipos LLVM)
 class Type(Node):
     """Classe base para nós que representam tipos da linguagem."""
     pass
 
 # --- Nós de Tipo Específicos (v0.2) ---
 
-@dataclass
+@ast_node()
 class PrimitiveType(Type):
     """Representa um tipo primitivo nomeado (ex: 'int', 'u8', 'bool')."""
     name: str
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node()
 class PointerType(Type):
     """Representa um tipo ponteiro bruto (ex: '*const u8', '*mut i32')."""
     pointee_type: Type # O tipo para o qual aponta
@@ -50,7 +69,7 @@ class PointerType(Type):
         mod = "mut" if self.is_mutable else "const"
         return f"PointerType(modifier='{mod}', pointee={self.pointee_type!r})"
 
-@dataclass
+@ast_node()
 class ReferenceType(Type):
     """Representa um tipo referência segura (borrow) (ex: '&T', '&mut T')."""
     referenced_type: Type # O tipo referenciado
@@ -61,14 +80,14 @@ class ReferenceType(Type):
         mod = "&mut" if self.is_mutable else "&"
         return f"ReferenceType(modifier='{mod}', referenced={self.referenced_type!r})"
 
-@dataclass
+@ast_node()
 class ArrayType(Type):
     """Representa um tipo array de tamanho fixo (ex: '[u8; 1024]')."""
     element_type: Type
     size: Expression # Tamanho deve ser expressão constante (verificado semanticamente)
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node()
 class SliceType(Type):
     """Representa um tipo slice (view) (ex: '&[u8]', '&mut [i32]')."""
     element_type: Type
@@ -79,18 +98,18 @@ class SliceType(Type):
         mod = "&mut" if self.is_mutable else "&"
         return f"SliceType(modifier='{mod}', element={self.element_type!r})"
 
-@dataclass
+@ast_node()
 class UnitType(Type):
     """Representa o tipo 'Unit' (vazio), denotado por '()'. """
     pass # Não precisa de campos. __init__ e __repr__ gerados.
 
-@dataclass
+@ast_node()
 class CustomType(Type):
     """Representa um tipo definido pelo usuário (struct/enum) referenciado por nome."""
     name: 'Identifier' # Nome do tipo (precisa ser resolvido semanticamente)
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node()
 class LiteralIntegerType(Type):
     """Tipo intermediário para literais inteiros, usado na análise semântica."""
     value: int
@@ -102,77 +121,77 @@ class LiteralIntegerType(Type):
 
 # --- Nós de Expressão Específicos (v0.2) ---
 
-@dataclass
+@ast_node('definition_node')
 class Identifier(Expression):
     """Representa um identificador."""
     name: str
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node()
 class Literal(Expression):
     """Classe base abstrata para literais."""
     # Nota: Fazer Literal ser @dataclass pode exigir que subclasses definam 'value'
     value: Any
 
-@dataclass
+@ast_node()
 class IntegerLiteral(Literal):
     """Representa um literal inteiro."""
     # 'value' é herdado e __init__ gerado. Sobrescreve __repr__ se necessário.
     value: int # Especifica o tipo para o dataclass
     # __repr__ gerado é bom: IntegerLiteral(value=123)
 
-@dataclass
+@ast_node()
 class StringLiteral(Literal):
     """Representa um literal de string."""
     value: str # Espera string Python já processada
     # __repr__ gerado: StringLiteral(value='hello')
 
-@dataclass
+@ast_node()
 class ByteStringLiteral(Literal):
      """Representa um literal de byte string."""
      value: bytes # Espera objeto bytes Python
      # __repr__ gerado: ByteStringLiteral(value=b'data')
 
-@dataclass
+@ast_node()
 class BooleanLiteral(Literal):
     """Representa um literal booleano."""
     value: bool
     # __repr__ gerado: BooleanLiteral(value=True)
 
-@dataclass
+@ast_node()
 class CharLiteral(Literal):
      """Representa um literal de caractere."""
      value: str # Espera string Python de tamanho 1
      # __repr__ gerado: CharLiteral(value='a')
 
-@dataclass
+@ast_node()
 class ArrayLiteral(Expression):
     """Representa um literal de array (ex: '[1, 2, 3]')."""
     elements: List[Expression] # Lista de nós de expressão para os elementos
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node()
 class StructLiteralField(Node): # Não é Expression nem Statement por si só
     """Representa um campo individual em um struct literal (ex: 'x: 10')."""
     name: Identifier # Nome do campo
     value: Expression # Expressão do valor do campo
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node()
 class StructLiteral(Expression):
     """Representa um literal de struct (ex: 'Point { x: 10, y: 20 }')."""
     type_name: Identifier # Nome do struct sendo instanciado
     fields: List[StructLiteralField] # Lista dos campos inicializados
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node()
 class FunctionCall(Expression):
     """Representa uma chamada de função."""
     callee: Expression # Expressão que resulta na função a ser chamada
     args: List[Expression] # Lista de expressões dos argumentos
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node('arith_no_wrap')
 class BinaryOp(Expression):
     """Representa uma operação binária."""
     op: str # O operador como string (ex: "+", "==")
@@ -180,28 +199,30 @@ class BinaryOp(Expression):
     right: Expression
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node()
 class UnaryOp(Expression):
     """Representa uma operação unária prefixa."""
     op: str # O operador como string (ex: "!", "-", "*", "&", "&mut")
     operand: Expression
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node()
 class FieldAccess(Expression):
     """Representa acesso a campo de struct (ex: 'player.pos')."""
     obj: Expression # A expressão que resulta no struct
     field: Identifier # O identificador do campo acessado
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+# bounds_proven: True se o bounds_analysis provou o índice dentro do array/slice (CodeGen omite o check)
+# bounds_unchecked: origem do opt-out ('unchecked func f', 'mem unchecked'), anotada pelo SemanticAnalyzer
+@ast_node('bounds_proven', 'bounds_unchecked')
 class IndexAccess(Expression):
     """Representa acesso a índice de array/slice (ex: 'buffer[i]')."""
     array: Expression # A expressão que resulta no array/slice
     index: Expression # A expressão que calcula o índice
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node()
 class CastExpr(Expression):
     """Representa uma expressão de cast (ex: 'val as u32')."""
     expr: Expression # A expressão sendo convertida
@@ -211,20 +232,20 @@ class CastExpr(Expression):
 # GroupedExpr não é necessário se o parser lida com precedência e o transformer
 # extrai a expressão interna diretamente.
 
-@dataclass
+@ast_node()
 class Underscore(Expression):
     """Representa o underscore '_' usado como expressão/placeholder."""
     # Geralmente não tem valor, mas pode ter metadados no futuro.
     pass # __init__ e __repr__ gerados
 
-@dataclass
+@ast_node()
 class ArrayRepeatExpr(Expression):
     """Representa uma expressão de inicialização de array: [valor; tamanho]"""
     value: Expression  # O valor a ser repetido
     size: Expression   # A expressão que define o tamanho
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node('resolved_variant_value', 'resolved_enum_def_node')
 class NamespaceAccess(Expression):
     """Representa acesso a um item dentro de um namespace/enum (ex: Color::Red)."""
     namespace: Identifier # O nome do namespace/enum/módulo
@@ -233,14 +254,15 @@ class NamespaceAccess(Expression):
 
 # --- Nós de Declaração/Comando Específicos (v0.2) ---
 
-@dataclass
+# noalias: parâmetro '&mut' que toda chamada do programa recebe como empréstimo exclusivo (SemanticAnalyzer; CodeGen marca noalias)
+@ast_node('resolved_type', 'noalias')
 class Parameter(Node):
     """Representa um parâmetro na definição de uma função (nome: tipo)."""
     name: Identifier
     type: Type
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node('declared_type')
 class LetBinding(Statement):
     """Representa uma declaração 'let' (vinculação imutável)."""
     name: Identifier
@@ -248,7 +270,7 @@ class LetBinding(Statement):
     value: Expression # Expressão de inicialização
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node('declared_type')
 class MutBinding(Statement):
     """Representa uma declaração 'mut' (vinculação mutável)."""
     name: Identifier
@@ -256,26 +278,28 @@ class MutBinding(Statement):
     value: Expression
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node()
 class Assignment(Statement):
     """Representa uma atribuição a um L-Value."""
     target: Expression # Alvo (Identifier, FieldAccess, IndexAccess, Underscore)
     value: Expression  # Valor a ser atribuído
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node()
 class MemBlock(Statement):
     """Representa um bloco 'mem { ... }'."""
     body: List[Statement] # Lista de statements dentro do bloco
+    unchecked: bool = False # 'mem unchecked': indexação de arrays/slices sem bounds check
     # __init__ e __repr__ gerados automaticamente
     
-@dataclass
+@ast_node()
 class EMemBlock(Statement): # <--- NOVA CLASSE
     """Representa um bloco 'e_mem { ... } end' que cria um novo escopo."""
     body: List[Statement]
+    unchecked: bool = False # 'e_mem unchecked': indexação de arrays/slices sem bounds check
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node()
 class IfStmt(Statement):
     """Representa uma declaração condicional 'if'/'else if'/'else'."""
     condition: Expression
@@ -284,36 +308,53 @@ class IfStmt(Statement):
     else_block: Optional[Union['IfStmt', List[Statement]]]
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node()
 class LoopStmt(Statement):
     """Representa um loop infinito 'loop { ... }'."""
     body: List[Statement]
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node()
 class WhileStmt(Statement):
     """Representa um loop condicional 'while condition { ... }'."""
     condition: Expression
     body: List[Statement]
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node('declared_type') # declared_type: tipo inteiro da variável de laço (anotado pelo SemanticAnalyzer)
+class ForRangeStmt(Statement):
+    """Representa um laço 'for i in inicio..fim ... end' (fim exclusivo, avaliados uma vez na entrada)."""
+    var: Identifier # Variável de laço, imutável dentro do corpo
+    start: Expression
+    end: Expression
+    body: List[Statement]
+    # __init__ e __repr__ gerados automaticamente
+
+@ast_node('declared_type') # declared_type: tipo do elemento (anotado pelo SemanticAnalyzer)
+class ForSliceStmt(Statement):
+    """Representa um laço 'for x in colecao ... end' sobre os elementos (cópias) de um slice ou array."""
+    var: Identifier # Variável de laço, imutável dentro do corpo
+    iterable: Expression
+    body: List[Statement]
+    # __init__ e __repr__ gerados automaticamente
+
+@ast_node()
 class BreakStmt(Statement):
     """Representa o comando 'break'."""
     pass # __init__ e __repr__ gerados
 
-@dataclass
+@ast_node()
 class ContinueStmt(Statement):
     """Representa o comando 'continue'."""
     pass # __init__ e __repr__ gerados
 
-@dataclass
+@ast_node()
 class ReturnStmt(Statement):
     """Representa o comando 'return [expression]'."""
     value: Optional[Expression] # A expressão retornada (ou None)
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node()
 class ExpressionStatement(Statement):
     """Representa uma expressão usada como uma instrução (terminada por ';')."""
     expression: Expression
@@ -322,7 +363,7 @@ class ExpressionStatement(Statement):
 
 # --- Nós de Definição/Declaração de Top-Level (v0.2) ---
 
-@dataclass
+@ast_node('resolved_return_type', 'is_extern', 'is_var_arg_resolved')
 class FunctionDecl(Node):
     """Representa a declaração de uma função externa."""
     name: Identifier
@@ -335,14 +376,14 @@ class FunctionDecl(Node):
     def __repr__(self):
          return f"FunctionDecl(name={self.name!r}, params={self.params!r}, return_type={self.return_type!r}, vararg={self.is_var_arg})"
 
-@dataclass
+@ast_node()
 class ExternBlock(Node):
     """Representa um bloco 'extern "ABI" { ... }'."""
     abi: StringLiteral # A ABI como um literal de string
     declarations: List[FunctionDecl]
     # __init__ e __repr__ gerados automaticamente
     
-@dataclass
+@ast_node()
 class FunctionType(Type):
     """Representa um tipo ponteiro para função (ex: func(i32) -> bool)."""
     param_types: List[Type] # Lista dos tipos dos parâmetros
@@ -355,43 +396,44 @@ class FunctionType(Type):
         vararg_str = ", ..." if self.is_var_arg else "" # <<< Atualiza repr
         return f"FunctionType(params=[{params_str}{vararg_str}], return={self.return_type!r})"
         
-@dataclass
+@ast_node('resolved_return_type')
 class FunctionDef(Node):
     """Representa a definição de uma função completa."""
     name: Identifier
     params: List[Parameter]
     return_type: Type
     body: List[Statement] # Lista de statements do corpo
+    unchecked: bool = False # 'unchecked func': indexação de arrays/slices sem bounds check no corpo todo
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node('resolved_type')
 class StructFieldDef(Node):
     """Representa a definição de um campo dentro de um 'struct'."""
     name: Identifier
     type: Type
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node()
 class StructDef(Node):
     """Representa a definição de um struct."""
     name: Identifier
     fields: List[StructFieldDef]
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node('value')
 class EnumVariantDef(Node):
     """Representa a definição de uma variante dentro de um 'enum'."""
     name: Identifier
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node()
 class EnumDef(Node):
     """Representa a definição de um enum."""
     name: Identifier
     variants: List[EnumVariantDef]
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node('resolved_type')
 class ConstDef(Node):
     """Representa a definição de uma constante."""
     name: Identifier
@@ -399,13 +441,14 @@ class ConstDef(Node):
     value: Expression # Deve ser avaliável em tempo de compilação
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+@ast_node('interface')
 class ImportDecl(Node):
     """Representa uma declaração de importação."""
     path: StringLiteral # O caminho como um StringLiteral
     # __init__ e __repr__ gerados automaticamente
 
-@dataclass
+# exports_functions: as funções do módulo podem ser chamadas por quem o importa (module_loader), fora desta AST
+@ast_node('imported_items', 'exports_functions')
 class Program(Node):
     """Nó raiz da AST."""
     body: List[Node] # Lista de itens de nível superior
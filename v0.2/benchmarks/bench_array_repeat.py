@@ -0,0 +1,72 @@
+# bench_array_repeat.py - Custo de compilação de [v; N] em função de N
+#
+# Uso: python benchmarks/bench_array_repeat.py [N_max] [N_max_antigo]
+# Para N = 16, 64, ..., N_max (padrão 1M) mede, por forma de repeat:
+#   tempo do CodeGen, tamanho do IR textual e tempo do backend (parse do IR + objeto).
+# 'antes' usa a lowering antiga (N insert_value), limitada a N_max_antigo (padrão 1024).
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import llvmlite.ir as ir
+import llvmlite.binding as llvm
+from codegen_llvm import CodeGenVisitor
+from run_suite import frontend
+
+FORMS = {
+    "zero u8":      ("u8", "0 as u8"),
+    "const i32":    ("i32", "7"),
+    "variável i32": ("i32", "x"),
+}
+
+def make_program(elem_type: str, value: str, n: int) -> str:
+    return f"""
+func f(x: {elem_type}) -> {elem_type}
+    mut a: [{elem_type}; {n}] = [{value}; {n}];
+    return a[{n - 1}];
+end
+"""
+
+class LegacyRepeatCodeGen(CodeGenVisitor):
+    """Lowering antiga: agregado SSA com N insert_value (referência 'antes')."""
+    def bind_array_repeat(self, value_node, var_name, expected_llvm_type):
+        prepared = self.prepare_array_repeat(value_node, expected_llvm_type)
+        if prepared is None: return None
+        array_type, value = prepared
+        agg = ir.Constant(array_type, None)
+        for i in range(array_type.count): agg = self.builder.insert_value(agg, value, i, name=f"repeat.elem{i}")
+        llvm_ptr = self.create_entry_alloca(array_type, name=var_name + ".addr")
+        self.builder.store(agg, llvm_ptr)
+        return llvm_ptr
+
+def measure(cls, program):
+    generator = cls()
+    t0 = time.perf_counter(); llvm_ir = generator.generate_code(program); t_codegen = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    module = llvm.parse_assembly(llvm_ir); module.verify()
+    generator.target_machine.emit_object(module)
+    t_backend = time.perf_counter() - t0
+    return t_codegen, len(llvm_ir), t_backend
+
+def main():
+    n_max = int(sys.argv[1]) if len(sys.argv) > 1 else 1 << 20
+    n_max_legacy = int(sys.argv[2]) if len(sys.argv) > 2 else 1024
+    sizes = []
+    n = 16
+    while n <= n_max: sizes.append(n); n *= 4
+    print(f"{'forma':<13} {'N':>8} | {'codegen ms':>10} {'IR bytes':>10} {'backend ms':>10} | {'antes: codegen ms':>17} {'IR bytes':>10} {'backend ms':>10}")
+    for label, (elem_type, value) in FORMS.items():
+        for n in sizes:
+            program = frontend(make_program(elem_type, value, n))
+            t_cg, ir_size, t_be = measure(CodeGenVisitor, program)
+            legacy = ""
+            if n <= n_max_legacy:
+                l_cg, l_size, l_be = measure(LegacyRepeatCodeGen, program)
+                legacy = f"{l_cg * 1000:17.1f} {l_size:10d} {l_be * 1000:10.1f}"
+            print(f"{label:<13} {n:8d} | {t_cg * 1000:10.1f} {ir_size:10d} {t_be * 1000:10.1f} | {legacy}")
+
+if __name__ == '__main__':
+    main()
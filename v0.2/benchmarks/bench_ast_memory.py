@@ -0,0 +1,94 @@
+# bench_ast_memory.py - Memória da AST: nós com __slots__ vs. dataclass com __dict__ por instância
+#
+# Uso: python benchmarks/bench_ast_memory.py [num_statements] [statements_por_funcao]
+# Gera um programa sintético (padrão 100k statements em funções de 100) e, para cada layout, em um
+# processo novo (o pico de RSS só cresce dentro de um processo):
+#   'slots' - ast_nodes.py como está (ast_node: dataclass + __slots__ com os slots de anotação)
+#   'dict'  - o mesmo ast_nodes.py com ast_node trocado por @dataclass puro (layout antigo)
+# faz parse_atom + analyze_semantics e mostra os nós da AST (incluindo os tipos anexados pela
+# análise), bytes por nó (objeto + __dict__, se houver) após o parse e após a análise, e o pico de RSS.
+import os
+import sys
+import gc
+import json
+import time
+import types
+import resource
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+COMPILER_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, COMPILER_DIR)
+
+def make_program(num_statements: int, per_func: int) -> str:
+    parts = []
+    for i in range((num_statements + per_func - 1) // per_func):
+        body = "\n".join(f"    acc = acc + (a * {k} - k) % 7;" if k % 2 else f"    k = k + {k};" for k in range(per_func))
+        parts.append(f"""
+func f{i}(a: i32) -> i32
+    mut acc: i32 = 0;
+    mut k: i32 = 0;
+{body}
+    return acc;
+end
+""")
+    parts.append("\nfunc main() -> i32\n    return f0(1) % 256;\nend\n")
+    return "".join(parts)
+
+def install_dict_layout():
+    # Carrega ast_nodes.py com ast_node = @dataclass puro antes de o parser/analisador importarem o módulo
+    with open(os.path.join(COMPILER_DIR, "ast_nodes.py"), encoding="utf8") as f: source = f.read()
+    source = source.replace("\n# --- Classes Base ---", "\nast_node = lambda *annotation_slots: dataclass\n# --- Classes Base ---", 1)
+    module = types.ModuleType("ast_nodes"); module.__file__ = os.path.join(COMPILER_DIR, "ast_nodes.py")
+    sys.modules["ast_nodes"] = module
+    exec(compile(source, module.__file__, "exec"), module.__dict__)
+
+def node_attributes(node):
+    if hasattr(node, "__dict__"): return list(node.__dict__.values())
+    return [getattr(node, name) for cls in type(node).__mro__ for name in getattr(cls, "__slots__", ()) if hasattr(node, name)]
+
+def measure_nodes(root, node_class):
+    # Percorre campos e anotações; cada nó é contado uma vez (definition_node aponta para nós já vistos)
+    seen = set(); stack = [root]; total_bytes = 0
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, list): stack.extend(obj); continue
+        if not isinstance(obj, node_class) or id(obj) in seen: continue
+        seen.add(id(obj))
+        total_bytes += sys.getsizeof(obj) + (sys.getsizeof(obj.__dict__) if hasattr(obj, "__dict__") else 0)
+        stack.extend(node_attributes(obj))
+    return len(seen), total_bytes
+
+def run_child(layout: str, num_statements: int, per_func: int):
+    if layout == "dict": install_dict_layout()
+    import ast_nodes
+    from parser_lark import parse_atom
+    from semantic_analyzer import analyze_semantics
+    source = make_program(num_statements, per_func)
+    t0 = time.perf_counter(); program = parse_atom(source); t_parse = time.perf_counter() - t0
+    gc.collect(); parsed_nodes, parsed_bytes = measure_nodes(program, ast_nodes.Node)
+    errors = analyze_semantics(program)
+    if errors: raise RuntimeError(f"erros semânticos: {errors[:1]}")
+    gc.collect(); analyzed_nodes, analyzed_bytes = measure_nodes(program, ast_nodes.Node)
+    print(json.dumps({'parse_s': t_parse, 'parsed_nodes': parsed_nodes, 'parsed_bytes': parsed_bytes,
+                      'analyzed_nodes': analyzed_nodes, 'analyzed_bytes': analyzed_bytes,
+                      'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+
+def main():
+    num_statements = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    per_func = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    print(f"programa: {num_statements} statements em funções de {per_func}")
+    print(f"{'layout':<6} | {'nós':>8} {'B/nó parse':>10} {'nós+tipos':>10} {'B/nó sem.':>10} | {'AST MB':>7} {'pico RSS MB':>11} | {'parse s':>7}")
+    results = {}
+    for layout in ("dict", "slots"):
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", layout, str(num_statements), str(per_func)],
+                             capture_output=True, text=True, check=True).stdout
+        r = results[layout] = json.loads(out.strip().splitlines()[-1])
+        print(f"{layout:<6} | {r['parsed_nodes']:8d} {r['parsed_bytes'] / r['parsed_nodes']:10.1f} {r['analyzed_nodes']:10d} "
+              f"{r['analyzed_bytes'] / r['analyzed_nodes']:10.1f} | {r['analyzed_bytes'] / 2**20:7.1f} {r['peak_rss_kb'] / 1024:11.1f} | {r['parse_s']:7.1f}")
+    old, new = results["dict"], results["slots"]
+    print(f"AST: {old['analyzed_bytes'] / new['analyzed_bytes']:.2f}x menor; pico de RSS: -{(old['peak_rss_kb'] - new['peak_rss_kb']) / 1024:.1f} MB")
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == "--child": run_child(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))
+    else: main()
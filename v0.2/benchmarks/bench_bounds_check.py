@@ -0,0 +1,113 @@
+# bench_bounds_check.py - Custo do bounds check em um laço de soma sobre &[i32]
+#
+# Uso: python benchmarks/bench_bounds_check.py [N] [repetições] [opt_level]
+# Compila o mesmo programa Atom com os dois esquemas de bounds check:
+#   'runtime' - call @atom_do_bounds_check(idx, len) por acesso (esquema antigo)
+#   'inline'  - icmp uge + br para o bloco de pânico frio compartilhado (esquema atual)
+# otimiza em processo (llvmlite, -O<opt_level>, padrão 2), liga com runtime.c e mede a execução.
+import os
+import re
+import sys
+import time
+import shutil
+import tempfile
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import llvmlite.ir as ir
+import llvmlite.binding as llvm
+from codegen_llvm import CodeGenVisitor
+from run_suite import frontend
+
+RUNTIME_C = os.path.join(os.path.dirname(BENCH_DIR), "runtime.c")
+
+def make_program(n: int, reps: int) -> str:
+    return f"""
+extern "C"
+    func printf(*const char, ...) -> i32;
+end
+
+func sum(s: &[i32]) -> i32
+    mut total: i32 = 0;
+    mut i: usize = 0 as usize;
+    while i < s.len
+        total = total + s[i];
+        i = i + (1 as usize);
+    end
+    return total;
+end
+
+func main() -> i32
+    mut data: [i32; {n}] = [1; {n}];
+    let s: &[i32] = &data;
+    mut acc: i32 = 0;
+    mut r: i32 = 0;
+    while r < {reps}
+        data[0] = r;
+        acc = acc + sum(s);
+        r = r + 1;
+    end
+    mem printf("%d\\n", acc); end
+    return 0;
+end
+"""
+
+class RuntimeCallBoundsCodeGen(CodeGenVisitor):
+    """Esquema antigo: chamada opaca ao helper do runtime.c em cada indexação."""
+    def emit_bounds_check(self, llvm_index_val, llvm_length):
+        check_func = self.module.globals.get("atom_do_bounds_check")
+        if not isinstance(check_func, ir.Function): return False
+        self.builder.call(check_func, [llvm_index_val, llvm_length])
+        return True
+
+def build(cls, program, opt_level: int, work_dir: str, runtime_obj: str):
+    generator = cls()
+    llvm_ir = generator.generate_code(program)
+    module = llvm.parse_assembly(llvm_ir); module.verify()
+    pmb = llvm.create_pass_manager_builder(); pmb.opt_level = opt_level
+    pm = llvm.create_module_pass_manager(); pmb.populate(pm); pm.run(module)
+    target_machine = generator.target.create_target_machine(opt=opt_level, reloc='pic')
+    obj_path = os.path.join(work_dir, f"{cls.__name__}.o")
+    exe_path = os.path.join(work_dir, cls.__name__)
+    with open(obj_path, "wb") as f: f.write(target_machine.emit_object(module))
+    subprocess.run(["cc", obj_path, runtime_obj, "-o", exe_path], check=True)
+    return exe_path, str(module)
+
+def run_best(exe_path: str, runs: int = 5):
+    best, output = None, None
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        proc = subprocess.run([exe_path], capture_output=True, text=True, check=True)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+        output = proc.stdout.strip()
+    return best, output
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 4096
+    reps = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    opt_level = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+    program = frontend(make_program(n, reps))
+    work_dir = tempfile.mkdtemp(prefix="atom_bench_bounds_")
+    try:
+        runtime_obj = os.path.join(work_dir, "runtime.o")
+        subprocess.run(["cc", "-O2", "-c", RUNTIME_C, "-o", runtime_obj], check=True)
+        print(f"soma de &[i32] com N={n}, {reps} repetições, -O{opt_level}")
+        print(f"{'esquema':<8} | {'melhor ms':>10} {'ns/elem':>8} {'calls check':>11} {'vetorizado':>10} | saída")
+        results = {}
+        for label, cls in (("runtime", RuntimeCallBoundsCodeGen), ("inline", CodeGenVisitor)):
+            exe_path, optimized_ir = build(cls, program, opt_level, work_dir, runtime_obj)
+            best, output = run_best(exe_path)
+            results[label] = (best, output)
+            check_calls = len(re.findall(r'call void @"?atom_do_bounds_check"?\(', optimized_ir))
+            vectorized = "<4 x i32>" in optimized_ir or "<8 x i32>" in optimized_ir
+            print(f"{label:<8} | {best * 1000:10.1f} {best * 1e9 / (n * reps):8.2f} {check_calls:11d} {'sim' if vectorized else 'não':>10} | {output}")
+        if results["runtime"][1] != results["inline"][1]: print("ERRO: saídas diferentes entre os esquemas")
+        print(f"speedup inline/runtime: {results['runtime'][0] / results['inline'][0]:.2f}x")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
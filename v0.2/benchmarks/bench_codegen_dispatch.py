@@ -0,0 +1,90 @@
+# bench_codegen_dispatch.py - Nós/segundo do CodeGenVisitor (despacho de visit)
+#
+# Uso: python benchmarks/bench_codegen_dispatch.py [num_funcoes] [repeticoes]
+# Compara o despacho atual (tabela por classe de nó) com o antigo, que chamava
+# inspect.signature a cada nó visitado, sobre um programa sintético grande.
+import os
+import sys
+import time
+import inspect
+import traceback
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from codegen_llvm import CodeGenVisitor
+from run_suite import frontend
+
+def make_program(num_funcs: int) -> str:
+    parts = []
+    for i in range(num_funcs):
+        parts.append(f"""
+func f{i}(a: i32, b: i32) -> i32
+    mut acc: i32 = 0;
+    mut k: i32 = 0;
+    while k < b
+        acc = acc + (a * k - (k / 2)) % 7;
+        if (acc & 1) == 1
+            acc = acc ^ (k << 1);
+        end
+        k = k + 1;
+    end
+    return acc;
+end
+""")
+    calls = "\n".join(f"    total = total + f{i}(total, {i % 13 + 1});" for i in range(num_funcs))
+    parts.append(f"""
+func main() -> i32
+    mut total: i32 = 1;
+{calls}
+    return total;
+end
+""")
+    return "".join(parts)
+
+class LegacyDispatchCodeGen(CodeGenVisitor):
+    """Despacho antigo: getattr + inspect.signature em todo nó (referência 'antes')."""
+    def visit(self, node, expected_llvm_type=None):
+        if node is None: return None
+        method_name = f'visit_{node.__class__.__name__}'
+        visitor_method = getattr(self, method_name, self.generic_visit)
+        sig = inspect.signature(visitor_method)
+        try:
+            if 'expected_llvm_type' in sig.parameters:
+                 return visitor_method(node, expected_llvm_type=expected_llvm_type)
+            return visitor_method(node)
+        except Exception as e:
+            self.add_error(f"Erro interno ao visitar nó {type(node).__name__} com método {method_name}: {e}", node)
+            traceback.print_exc()
+            return None
+
+class CountingCodeGen(CodeGenVisitor):
+    def __init__(self):
+        super().__init__(); self.visited = 0
+    def visit(self, node, expected_llvm_type=None):
+        if node is not None: self.visited += 1
+        return super().visit(node, expected_llvm_type)
+
+def _time_codegen(cls, program, reps: int) -> float:
+    best = float("inf")
+    for _ in range(reps):
+        generator = cls()
+        t0 = time.perf_counter(); generator.generate_code(program); elapsed = time.perf_counter() - t0
+        best = min(best, elapsed)
+    return best
+
+def main():
+    num_funcs = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    reps = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    program = frontend(make_program(num_funcs))
+    counter = CountingCodeGen(); counter.generate_code(program)
+
+    legacy = _time_codegen(LegacyDispatchCodeGen, program, reps)
+    current = _time_codegen(CodeGenVisitor, program, reps)
+    print(f"CodeGen: {num_funcs} funções, {counter.visited} visitas a nós (melhor de {reps})")
+    print(f"  antes (inspect.signature): {legacy * 1000:9.1f} ms  {counter.visited / legacy:12.0f} nós/s")
+    print(f"  depois (tabela)          : {current * 1000:9.1f} ms  {counter.visited / current:12.0f} nós/s")
+    print(f"  speedup                  : {legacy / current:9.2f}x")
+
+if __name__ == '__main__':
+    main()
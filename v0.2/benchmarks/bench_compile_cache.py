@@ -0,0 +1,93 @@
+# bench_compile_cache.py - Rebuild de um corpus de 500 fontes com o cache de compilação
+#
+# Uso: python benchmarks/bench_compile_cache.py [num_arquivos] [--obj]
+# Gera um corpus sintético (padrão 500 arquivos) e mede, com um diretório de cache temporário:
+#   frio     - cache vazio: todas as fontes passam por parse -> semântica -> CodeGen
+#   quente   - mesmo processo, nada mudou: só acertos
+#   1 mudou  - uma fonte editada: 1 falta, o resto acertos
+#   CLI      - rebuild quente num processo novo (python compile_cache.py), como num job de CI
+import os
+import sys
+import time
+import shutil
+import tempfile
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from compile_cache import CompileCache, compile_source
+
+def make_source(i: int) -> str:
+    return f"""
+extern "C"
+    func printf(*const char, ...) -> i32;
+end
+
+struct Acc{i}
+    total: i32,
+    steps: i32,
+end
+
+func step{i}(acc: Acc{i}, k: i32) -> Acc{i}
+    mut t: i32 = acc.total;
+    if (k & 1) == 1
+        t = t + k * {i % 17 + 1};
+    end
+    return Acc{i} {{ total: t ^ (k << 1), steps: acc.steps + 1 }};
+end
+
+func main() -> i32
+    mut acc = Acc{i} {{ total: {i}, steps: 0 }};
+    mut k: i32 = 0;
+    while k < {i % 50 + 10}
+        acc = step{i}(acc, k);
+        k = k + 1;
+    end
+    mem printf("%d %d\\n", acc.total, acc.steps); end
+    return 0;
+end
+"""
+
+def build_all(sources, kind, cache):
+    t0 = time.perf_counter()
+    for source in sources: compile_source(source, kind, cache=cache)
+    return time.perf_counter() - t0
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    num_files = int(args[0]) if args else 500
+    kind = 'obj' if "--obj" in sys.argv else 'ir'
+    work_dir = tempfile.mkdtemp(prefix="atom_bench_ccache_")
+    try:
+        cache_dir = os.path.join(work_dir, "cache"); src_dir = os.path.join(work_dir, "src"); out_dir = os.path.join(work_dir, "out")
+        os.makedirs(src_dir); os.makedirs(out_dir)
+        sources = [make_source(i) for i in range(num_files)]
+        paths = []
+        for i, source in enumerate(sources):
+            path = os.path.join(src_dir, f"mod{i}.atom"); paths.append(path)
+            with open(path, "w") as f: f.write(source)
+
+        print(f"corpus: {num_files} arquivos, artefato '{kind}'")
+        cache = CompileCache(cache_dir)
+        t_cold = build_all(sources, kind, cache); print(f"frio    : {t_cold * 1000:9.1f} ms  {cache.stats()}")
+        cache = CompileCache(cache_dir)
+        t_warm = build_all(sources, kind, cache); print(f"quente  : {t_warm * 1000:9.1f} ms  {cache.stats()}")
+        cache = CompileCache(cache_dir)
+        sources[num_files // 2] = sources[num_files // 2].replace("k < ", "k <= ", 1)
+        t_one = build_all(sources, kind, cache); print(f"1 mudou : {t_one * 1000:9.1f} ms  {cache.stats()}")
+
+        env = dict(os.environ, ATOM_COMPILE_CACHE_DIR=cache_dir)
+        command = [sys.executable, os.path.join(ROOT_DIR, "compile_cache.py"), "-o", out_dir, "--stats"] + (["--obj"] if kind == 'obj' else []) + paths
+        t0 = time.perf_counter()
+        proc = subprocess.run(command, env=env, capture_output=True, text=True, check=True)
+        t_cli = time.perf_counter() - t0
+        hits = next((line for line in proc.stdout.splitlines() if line.startswith("hits:")), "?")
+        print(f"CLI     : {t_cli * 1000:9.1f} ms  (processo novo, {hits})")
+        print(f"speedup quente/frio: {t_cold / t_warm:.0f}x (em processo), {t_cold / t_cli:.0f}x (CLI)")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
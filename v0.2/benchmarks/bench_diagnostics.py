@@ -0,0 +1,65 @@
+# bench_diagnostics.py - Erros semânticos: DiagnosticEngine (dedupe por set, sem console) vs. lista + print
+#
+# Uso: python benchmarks/bench_diagnostics.py [num_erros...]
+# Para cada tamanho (padrão 1000 4000 16000), gera um programa com num_erros usos de variáveis não
+# declaradas (um erro distinto por linha) e mede analyze_semantics com:
+#   'lista+print' - add_error antigo: 'if msg not in self.errors' (O(n) por erro) e print de cada erro
+#   'engine'      - SemanticAnalyzer atual: DiagnosticEngine, logger desligado (sem ATOM_LOG)
+# O stdout vai para os.devnull (escritas reais, como um console redirecionado). Confere que as duas
+# listas de erros são idênticas.
+import os
+import sys
+import time
+import statistics
+import contextlib
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from parser_lark import parse_atom
+from semantic_analyzer import SemanticAnalyzer
+
+def make_program(num_errors: int) -> str:
+    lines = "\n".join(f"    let v{i}: i32 = indefinida{i};" for i in range(num_errors))
+    return f"func main() -> i32\n{lines}\n    return 0;\nend\n"
+
+class ListPrintAnalyzer(SemanticAnalyzer):
+    """add_error antigo: lista com busca linear para dedupe e um print por erro."""
+    legacy_errors = []
+
+    @property
+    def errors(self): return self.legacy_errors
+
+    def analyze(self, program_node):
+        self.legacy_errors = []
+        return super().analyze(program_node)
+
+    def add_error(self, message, node=None):
+        pos_info = ""
+        if node and hasattr(node, 'meta') and hasattr(node.meta, 'line'):
+            pos_info = f" (linha {node.meta.line}, col {getattr(node.meta, 'column', '?')})"
+        full_message = f"Erro Semântico{pos_info}: {message}"
+        if full_message not in self.legacy_errors:
+            self.legacy_errors.append(full_message)
+            print(f"SEMANTIC ERROR:{pos_info} {message}")
+
+def time_analysis(analyzer_class, program, reps: int = 3):
+    samples, errors = [], None
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(reps):
+            analyzer = analyzer_class()
+            t0 = time.perf_counter(); errors = analyzer.analyze(program); samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000, errors
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [1000, 4000, 16000]
+    print(f"{'erros':>6} | {'lista+print ms':>14} | {'engine ms':>9} | speedup | erros iguais")
+    for num_errors in sizes:
+        program = parse_atom(make_program(num_errors))
+        t_old, old_errors = time_analysis(ListPrintAnalyzer, program)
+        t_new, new_errors = time_analysis(SemanticAnalyzer, program)
+        same = old_errors == new_errors and len(new_errors) >= num_errors
+        print(f"{len(new_errors):6d} | {t_old:14.1f} | {t_new:9.1f} | {t_old / t_new:6.2f}x | {'sim' if same else 'NÃO'}")
+
+if __name__ == '__main__':
+    main()
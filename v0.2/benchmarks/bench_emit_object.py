@@ -0,0 +1,51 @@
+# bench_emit_object.py - .ll em disco + driver externo vs. emit_object() em processo
+#
+# Uso: python benchmarks/bench_emit_object.py [num_funcs ...]
+# Para programas sintéticos de tamanho crescente (padrão 100, 400, 1600 funções) mede, após o CodeGen:
+#   'externo'  - grava o .ll e chama clang -fPIE -c (ou llc -O0 -relocation-model=pic, se não houver clang)
+#   'processo' - CodeGenVisitor.emit_object(): um parse do módulo em memória + target_machine.emit_object
+# e quebra o caminho em processo em serialização do IR, parse+verify e geração do objeto.
+import os
+import sys
+import time
+import shutil
+import tempfile
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import llvmlite.binding as llvm
+from bench_codegen_dispatch import make_program
+from run_suite import build_module
+
+def external_command(ll_path: str, obj_path: str):
+    if shutil.which("clang"): return ["clang", "-fPIE", "-c", ll_path, "-o", obj_path]
+    return ["llc", "-O0", "-relocation-model=pic", "-filetype=obj", ll_path, "-o", obj_path]
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [100, 400, 1600]
+    work_dir = tempfile.mkdtemp(prefix="atom_bench_emit_")
+    try:
+        print(f"externo = {external_command('x.ll', 'x.o')[0]}")
+        print(f"{'funções':>7} {'IR KB':>7} | {'externo ms':>10} | {'processo ms':>11} {'str(IR)':>8} {'parse':>8} {'objeto':>8} | {'speedup':>7}")
+        for num_funcs in sizes:
+            generator = build_module(make_program(num_funcs))
+
+            ll_path = os.path.join(work_dir, "prog.ll"); obj_path = os.path.join(work_dir, "prog_ext.o")
+            t0 = time.perf_counter()
+            llvm_ir = str(generator.module)
+            with open(ll_path, "w") as f: f.write(llvm_ir)
+            subprocess.run(external_command(ll_path, obj_path), check=True)
+            t_external = time.perf_counter() - t0
+
+            t0 = time.perf_counter(); llvm_ir = str(generator.module); t_str = time.perf_counter() - t0
+            t0 = time.perf_counter(); llvm_module = llvm.parse_assembly(llvm_ir); llvm_module.verify(); t_parse = time.perf_counter() - t0
+            t0 = time.perf_counter(); generator.emit_object(os.path.join(work_dir, "prog.o"), llvm_module); t_emit = time.perf_counter() - t0
+            t_process = t_str + t_parse + t_emit
+            print(f"{num_funcs:7d} {len(llvm_ir) / 1024:7.0f} | {t_external * 1000:10.1f} | {t_process * 1000:11.1f} {t_str * 1000:8.1f} {t_parse * 1000:8.1f} {t_emit * 1000:8.1f} | {t_external / t_process:6.2f}x")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+# bench_for_loops.py - Laços 'while' com índice manual vs. 'for' (phi canônico, incremento nsw/nuw, latch único)
+#
+# Uso: python benchmarks/bench_for_loops.py [-O nível ...] [--runs N]
+# Cada kernel existe em duas versões com a mesma semântica: 'while' (índice em 'mut', incremento
+# comum) e 'for' (for i in a..b / for x in s). Para cada nível (padrão -O 2) compila as duas com
+# run_suite.compile_program e mostra: se o laço do kernel foi vetorizado (tipos <N x ...> no IR
+# otimizado da função), as instruções do IR otimizado, os bounds checks gerados e o tempo de
+# execução (melhor de --runs), conferindo que a saída é a mesma.
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from codegen_llvm import parse_opt_level
+from run_suite import build_module, compile_program, run_binary
+
+# nome -> (kernel com 'while', kernel com 'for'); o kernel se chama 'kernel' e recebe &mut [i32] e i32
+KERNELS = {
+    "soma_slice": (r"""
+func kernel(s: &mut [i32], k: i32) -> i32
+    mut total: i32 = k;
+    mut i: usize = 0 as usize;
+    while i < s.len
+        total = total + s[i];
+        i = i + (1 as usize);
+    end
+    return total;
+end
+""", r"""
+func kernel(s: &mut [i32], k: i32) -> i32
+    mut total: i32 = k;
+    for v in s
+        total = total + v;
+    end
+    return total;
+end
+"""),
+    "escala_in_place": (r"""
+func kernel(s: &mut [i32], k: i32) -> i32
+    mut i: usize = 0 as usize;
+    while i < s.len
+        s[i] = s[i] * 3 + k;
+        i = i + (1 as usize);
+    end
+    return s[0];
+end
+""", r"""
+func kernel(s: &mut [i32], k: i32) -> i32
+    for i in (0 as usize)..s.len
+        s[i] = s[i] * 3 + k;
+    end
+    return s[0];
+end
+"""),
+    "faixa_i32": (r"""
+func kernel(s: &mut [i32], k: i32) -> i32
+    mut total: i32 = 0;
+    mut i: i32 = k % 7;
+    let n: i32 = (s.len as i32) + k % 5;
+    while i < n
+        total = total + i * i;
+        i = i + 1;
+    end
+    return total;
+end
+""", r"""
+func kernel(s: &mut [i32], k: i32) -> i32
+    mut total: i32 = 0;
+    for i in k % 7..(s.len as i32) + k % 5
+        total = total + i * i;
+    end
+    return total;
+end
+"""),
+}
+
+MAIN = r"""
+extern "C"
+    func printf(*const char, ...) -> i32;
+end
+%KERNEL%
+func main() -> i32
+    mut data: [i32; 4096] = [0; 4096];
+    mut k: usize = 0 as usize;
+    while k < (4096 as usize)
+        data[k] = (k as i32) * 7 % 101;
+        k = k + (1 as usize);
+    end
+    let s: &mut [i32] = &mut data;
+    mut acc: i32 = 0;
+    mut r: i32 = 0;
+    while r < 20000
+        acc = (acc + kernel(s, r) % 1000003) % 1000003;
+        s[(r % 4096) as usize] = r % 97;
+        r = r + 1;
+    end
+    mem printf("%d\n", acc); end
+    return 0;
+end
+"""
+
+def kernel_is_vectorized(source: str, level: str) -> bool:
+    opt_level, opt_preset = parse_opt_level(level)
+    llvm_module = build_module(source, opt_level, opt_preset).optimize_module()
+    kernel_ir = str(llvm_module.get_function("kernel"))
+    return " x i32>" in kernel_ir
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Laços 'while' vs. 'for' (IR canônico) em kernels de slice.")
+    arg_parser.add_argument("-O", dest="levels", action="append", help="Nível de otimização (repetível; padrão: 2)")
+    arg_parser.add_argument("--runs", type=int, default=7, help="Execuções do binário por medida (melhor tempo)")
+    ns = arg_parser.parse_args()
+    levels = ns.levels or ["2"]
+
+    work_dir = tempfile.mkdtemp(prefix="atom_for_")
+    try:
+        print(f"{'kernel':<16} {'nível':>5} | {'vetor while':>11} {'for':>5} | {'instrs while':>12} {'for':>5} | {'checks':>6} {'for':>4} | {'exec ms':>8} {'for':>8} {'':>6} | saída")
+        for level in levels:
+            for name, (while_kernel, for_kernel) in KERNELS.items():
+                results = []
+                for variant, kernel in (("while", while_kernel), ("for", for_kernel)):
+                    source = MAIN.replace("%KERNEL%", kernel)
+                    exe_path = os.path.join(work_dir, f"{name}_{variant}_O{level}")
+                    compiled = compile_program(source, level, exe_path)
+                    compiled.update(run_binary(exe_path, ns.runs))
+                    compiled['vectorized'] = kernel_is_vectorized(source, level)
+                    results.append(compiled)
+                old, new = results
+                same = old['output'] == new['output'] and old['exit_code'] == new['exit_code'] == 0
+                print(f"{name:<16} {'-O' + level:>5} | {'sim' if old['vectorized'] else 'não':>11} {'sim' if new['vectorized'] else 'não':>5} | "
+                      f"{old['ir_instructions']:12d} {new['ir_instructions']:5d} | {old['bounds_checks']:6d} {new['bounds_checks']:4d} | "
+                      f"{old['run_ms']:8.1f} {new['run_ms']:8.1f} {(new['run_ms'] / old['run_ms'] - 1) * 100:+5.0f}% | {'igual' if same else 'DIFERENTE'}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
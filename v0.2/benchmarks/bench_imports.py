@@ -0,0 +1,109 @@
+# bench_imports.py - Build incremental com imports vs. um único fonte gigante
+#
+# Uso: python benchmarks/bench_imports.py [num_modulos] [funcs_por_modulo]
+# Gera um projeto sintético (padrão 100 módulos de 8 funções + main.atom importando todos) e mede:
+#   monolítico   - tudo concatenado em um fonte só (o que se fazia antes): qualquer mudança recompila tudo
+#   frio         - module_loader, cache vazio
+#   quente       - nada mudou
+#   corpo mudou  - corpo de uma função de um módulo: só aquele módulo recompila
+#   API mudou    - assinatura exportada de um módulo: ele e quem o importa (main) recompilam
+# Cada build usa um ModuleLoader novo (como um processo novo de build), ligando com runtime.o.
+import os
+import sys
+import time
+import shutil
+import tempfile
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from compile_cache import CompileCache, compile_source
+from module_loader import ModuleLoader
+
+def make_module(m: int, funcs: int, ret_type: str = "i32") -> str:
+    parts = [f"""
+struct Stats{m}
+    count: i32,
+    total: i32,
+end
+"""]
+    for f in range(funcs):
+        parts.append(f"""
+func m{m}_f{f}(a: i32, b: i32) -> i32
+    mut acc: i32 = {f};
+    mut k: i32 = 0;
+    while k < b
+        acc = acc + (a * k - (k / 2)) % {m % 7 + 3};
+        k = k + 1;
+    end
+    return acc;
+end
+""")
+    parts.append(f"""
+func m{m}_entry(x: i32) -> {ret_type}
+    let s = Stats{m} {{ count: 1, total: m{m}_f0(x, 3) }};
+    return (s.total + s.count) as {ret_type};
+end
+""")
+    return "".join(parts)
+
+def make_main(modules: int, with_imports: bool = True) -> str:
+    imports = "".join(f'import "lib/mod{m}.atom";\n' for m in range(modules)) if with_imports else ""
+    calls = "\n".join(f"    total = total + (m{m}_entry(total) as i32);" for m in range(modules))
+    return f"""{imports}
+func main() -> i32
+    mut total: i32 = 1;
+{calls}
+    return total % 256;
+end
+"""
+
+def write(path: str, text: str):
+    with open(path, "w") as f: f.write(text)
+
+def timed_build(entry: str, exe: str, cache_dir: str):
+    loader = ModuleLoader(CompileCache(cache_dir))
+    t0 = time.perf_counter()
+    loader.build(entry, exe, os.path.dirname(exe))
+    elapsed = time.perf_counter() - t0
+    stats = loader.cache.stats()
+    return elapsed, loader.parse_count, stats['misses']
+
+def main():
+    modules = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    funcs = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    work_dir = tempfile.mkdtemp(prefix="atom_bench_imports_")
+    try:
+        lib_dir = os.path.join(work_dir, "lib"); out_dir = os.path.join(work_dir, "out"); cache_dir = os.path.join(work_dir, "cache")
+        os.makedirs(lib_dir); os.makedirs(out_dir)
+        for m in range(modules): write(os.path.join(lib_dir, f"mod{m}.atom"), make_module(m, funcs))
+        entry = os.path.join(work_dir, "main.atom"); write(entry, make_main(modules))
+        exe = os.path.join(out_dir, "prog")
+
+        monolithic = "".join(make_module(m, funcs) for m in range(modules)) + make_main(modules, with_imports=False)
+        t0 = time.perf_counter()
+        compile_source(monolithic, 'obj', cache=CompileCache(os.path.join(work_dir, "mono_cache")))
+        t_mono = time.perf_counter() - t0
+
+        print(f"projeto: {modules} módulos x {funcs + 1} funções, {len(monolithic.splitlines())} linhas")
+        print(f"{'cenário':<12} | {'ms':>9} {'parseados':>9} {'faltas':>6} | resultado")
+        print(f"{'monolítico':<12} | {t_mono * 1000:9.1f} {1:9d} {1:6d} | (só o objeto, sem ligação)")
+        results = []
+        def scenario(label: str):
+            elapsed, parsed, misses = timed_build(entry, exe, cache_dir)
+            code = subprocess.run([exe]).returncode
+            results.append(code)
+            print(f"{label:<12} | {elapsed * 1000:9.1f} {parsed:9d} {misses:6d} | exit={code}")
+        scenario("frio")
+        scenario("quente")
+        target = os.path.join(lib_dir, f"mod{modules // 2}.atom")
+        write(target, make_module(modules // 2, funcs).replace("acc = acc + (a * k", "acc = acc + (a * k + 1", 1))
+        scenario("corpo mudou")
+        write(target, make_module(modules // 2, funcs, ret_type="i64"))
+        scenario("API mudou")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# bench_jit.py - Latência de compilar-e-executar: JIT (MCJIT) vs. caminho clang
+#
+# Uso: python benchmarks/bench_jit.py [repetições]
+# Para cada programa, do código-fonte até o código de saída de main:
+#   'clang' - parse + semântica + CodeGen, grava o .ll, clang -fPIE com runtime.o (ou llc -O0 + cc, se
+#             não houver clang) e executa o binário
+#   'jit'   - parse + semântica + run_jit() no próprio processo
+# Mostra a mediana de cada caminho e confere que os dois devolvem o mesmo resultado.
+import os
+import sys
+import time
+import shutil
+import tempfile
+import statistics
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from codegen_llvm import generate_llvm_ir, run_jit, RUNTIME_OBJECT
+from bench_codegen_dispatch import make_program
+from run_suite import frontend
+
+TINY = """
+func main() -> i32
+    mut a: i32 = 0;
+    mut b: i32 = 1;
+    mut k: i32 = 0;
+    while k < 20
+        let t: i32 = a + b;
+        a = b;
+        b = t;
+        k = k + 1;
+    end
+    return a % 256;
+end
+"""
+
+PROGRAMS = {
+    "tiny (fib)": TINY,
+    "10 funções": make_program(10),
+    "50 funções": make_program(50),
+}
+
+def run_clang_path(source: str, work_dir: str) -> int:
+    llvm_ir = generate_llvm_ir(frontend(source))
+    ll_path = os.path.join(work_dir, "prog.ll"); exe_path = os.path.join(work_dir, "prog")
+    with open(ll_path, "w") as f: f.write(llvm_ir)
+    if shutil.which("clang"):
+        subprocess.run(["clang", "-fPIE", ll_path, RUNTIME_OBJECT, "-o", exe_path], check=True)
+    else:
+        obj_path = os.path.join(work_dir, "prog.o")
+        subprocess.run(["llc", "-O0", "-relocation-model=pic", "-filetype=obj", ll_path, "-o", obj_path], check=True)
+        subprocess.run(["cc", obj_path, RUNTIME_OBJECT, "-o", exe_path], check=True)
+    return subprocess.run([exe_path]).returncode
+
+def run_jit_path(source: str) -> int:
+    return run_jit(frontend(source)) & 0xFF # mesmo truncamento do código de saída do processo
+
+def median_ms(fn, reps: int):
+    samples, result = [], None
+    for _ in range(reps):
+        t0 = time.perf_counter(); result = fn(); samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000, result
+
+def main():
+    reps = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    work_dir = tempfile.mkdtemp(prefix="atom_bench_jit_")
+    try:
+        print(f"caminho nativo: {'clang' if shutil.which('clang') else 'llc -O0 + cc'}; mediana de {reps} execuções")
+        print(f"{'programa':<12} | {'clang ms':>9} {'jit ms':>8} | {'speedup':>7} | resultado")
+        for label, source in PROGRAMS.items():
+            t_native, native_result = median_ms(lambda: run_clang_path(source, work_dir), reps)
+            t_jit, jit_result = median_ms(lambda: run_jit_path(source), reps)
+            status = native_result if native_result == jit_result else f"DIFERENTE ({native_result} vs {jit_result})"
+            print(f"{label:<12} | {t_native:9.1f} {t_jit:8.1f} | {t_native / t_jit:6.2f}x | {status}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# bench_literal_pool.py - Pool de literais (dedupe + tail merging) vs. um global por ocorrência
+#
+# Uso: python benchmarks/bench_literal_pool.py [num_chamadas]
+# Programa com num_chamadas (padrão 1000) chamadas a printf repetindo poucas strings de formato, algumas
+# sufixo de outras ("valor: %d\n" / "%d\n"), e byte strings repetidas. Compara:
+#   'por uso' - um global privado novo a cada literal (esquema antigo)
+#   'pool'    - LiteralPool do CodeGenVisitor atual
+# mostrando globais de literais, tamanho do IR, tamanho do objeto (-O0, emit_object) e tempo do CodeGen,
+# e confere que duas compilações seguidas no mesmo processo geram o mesmo IR.
+import os
+import sys
+import time
+import statistics
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import llvmlite.ir as ir
+from codegen_llvm import CodeGenVisitor, LiteralPool
+from run_suite import frontend
+
+FORMATS = ["valor: %d\\n", "%d\\n", "total = %d\\n", "= %d\\n", "erro: %d\\n"]
+
+def make_program(num_calls: int) -> str:
+    calls = "\n".join(f'    mem printf("{FORMATS[i % len(FORMATS)]}", {i}); end\n    n = n + s{i % 3}.len as i32;'
+                      for i in range(num_calls))
+    return f"""
+extern "C"
+    func printf(*const char, ...) -> i32;
+end
+
+func main() -> i32
+    let s0: &[u8] = b"cabecalho";
+    let s1: &[u8] = b"cabecalho";
+    let s2: &[u8] = b"rodape";
+    mut n: i32 = 0;
+{calls}
+    return n % 256;
+end
+"""
+
+class PerUseLiteralPool(LiteralPool):
+    """Esquema antigo: nenhum compartilhamento, um global por literal."""
+    def plan_strings(self, values): pass
+
+    def string_pointer(self, value):
+        self.requests += 1
+        global_var = self.new_global(".str", value.encode('utf8') + b'\x00')
+        return global_var.gep([ir.Constant(ir.IntType(32), 0), ir.Constant(ir.IntType(32), 0)])
+
+    def byte_array(self, value_bytes):
+        self.requests += 1
+        return self.new_global(".bstr", value_bytes)
+
+class PerUseLiteralCodeGen(CodeGenVisitor):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.literal_pool = PerUseLiteralPool(self.module)
+
+def compile_once(codegen_class, program):
+    generator = codegen_class()
+    t0 = time.perf_counter(); llvm_ir = generator.generate_code(program); elapsed = time.perf_counter() - t0
+    obj = generator.emit_object()
+    literal_globals = sum(1 for g in generator.module.global_values if g.name.startswith((".str.", ".bstr.")))
+    return elapsed, llvm_ir, obj, literal_globals, generator.literal_pool.requests
+
+def main():
+    num_calls = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    program = frontend(make_program(num_calls))
+    print(f"programa: {num_calls} printf com {len(FORMATS)} formatos distintos + 3 byte strings (2 iguais)")
+    print(f"{'esquema':<8} | {'usos':>5} {'globais':>7} | {'IR KB':>7} {'objeto KB':>9} | {'codegen ms':>10} | IR determinístico")
+    for label, codegen_class in (("por uso", PerUseLiteralCodeGen), ("pool", CodeGenVisitor)):
+        runs = [compile_once(codegen_class, program) for _ in range(5)]
+        elapsed = statistics.median(r[0] for r in runs)
+        _, llvm_ir, obj, literal_globals, requests = runs[0]
+        same = all(r[1] == llvm_ir for r in runs)
+        print(f"{label:<8} | {requests:5d} {literal_globals:7d} | {len(llvm_ir) / 1024:7.1f} {len(obj) / 1024:9.1f} | {elapsed * 1000:10.1f} | {'sim' if same else 'não'}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# bench_llvm_type_cache.py - Tipos LLVM memoizados vs. recalculados a cada get_llvm_type
+#
+# Uso: python benchmarks/bench_llvm_type_cache.py [num_funcs] [repetições]
+# Programa sintético com structs que guardam slices e arrays (padrão 400 funções) e funções que
+# recebem/declaram &[Vec3], &[&[i32]], [i32; 4] e structs. Mede só generate_code (parse e análise
+# semântica são feitos uma vez) com:
+#   'recalculado' - get_llvm_type refaz a conversão recursiva e o nome Slice.<elemento> (str do tipo
+#                   LLVM + replaces) em toda referência (esquema antigo)
+#   'memoizado'   - CodeGenVisitor atual: cache por nó de tipo + tabela de tipos LLVM do módulo
+# e confere que o IR gerado é idêntico. Como a serialização do módulo (str(module)) domina generate_code,
+# também mostra o tempo gasto só dentro de get_llvm_type (chamadas externas, medido em uma execução à parte).
+import os
+import sys
+import time
+import statistics
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import ast_nodes as ast
+from codegen_llvm import CodeGenVisitor
+from run_suite import frontend
+
+def make_program(num_funcs: int) -> str:
+    parts = ["""
+struct Vec3
+    x: i32,
+    y: i32,
+    z: i32,
+end
+
+struct Mesh
+    verts: &[Vec3],
+    rows: &[&[i32]],
+    scale: [i32; 4],
+end
+"""]
+    for i in range(num_funcs):
+        parts.append(f"""
+func f{i}(m: Mesh, vs: &[Vec3], grid: &[&[i32]]) -> i32
+    let a: &[Vec3] = m.verts;
+    let b: &[&[i32]] = m.rows;
+    let c: &[i32] = b[0];
+    let v: Vec3 = a[{i % 3}];
+    let w: Vec3 = vs[0];
+    let s: [i32; 4] = m.scale;
+    let p: Mesh = Mesh {{ verts: vs, rows: grid, scale: s }};
+    let r: &[i32] = grid[0];
+    return v.x + w.y + c[0] + r[0] + s[1] + p.scale[0];
+end
+""")
+    parts.append("\nfunc main() -> i32\n    return 0;\nend\n")
+    return "".join(parts)
+
+class UncachedTypesCodeGen(CodeGenVisitor):
+    """Esquema antigo: sem cache por nó e sem tabela de tipos; o nome do slice é montado a cada chamada."""
+    def get_llvm_type(self, atom_type):
+        if atom_type is None: return None
+        if isinstance(atom_type, ast.PrimitiveType):
+            llvm_t = self.llvm_types.get(atom_type.name)
+            if llvm_t is None: self.add_error(f"Tipo LLVM desconhecido para primitivo Atom '{atom_type.name}'.", atom_type)
+            return llvm_t
+        return self.lower_llvm_type(atom_type)
+
+    def intern_llvm_type(self, key, make):
+        return make()
+
+def time_codegen(codegen_class, program, reps: int):
+    samples, llvm_ir = [], None
+    for _ in range(reps):
+        generator = codegen_class()
+        t0 = time.perf_counter(); llvm_ir = generator.generate_code(program); samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000, llvm_ir
+
+def time_type_lowering(codegen_class, program):
+    class TimedCodeGen(codegen_class):
+        depth = 0; elapsed = 0.0; calls = 0
+        def get_llvm_type(self, atom_type):
+            if self.depth: return super().get_llvm_type(atom_type) # Chamada recursiva: já está sendo medida
+            self.depth = 1; self.calls += 1; t0 = time.perf_counter()
+            try: return super().get_llvm_type(atom_type)
+            finally: self.elapsed += time.perf_counter() - t0; self.depth = 0
+    generator = TimedCodeGen(); generator.generate_code(program)
+    return generator.elapsed * 1000, generator.calls
+
+def main():
+    num_funcs = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    reps = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    program = frontend(make_program(num_funcs))
+    t_old, old_ir = time_codegen(UncachedTypesCodeGen, program, reps)
+    t_new, new_ir = time_codegen(CodeGenVisitor, program, reps)
+    print(f"programa: {num_funcs} funções com structs/slices; mediana de {reps} execuções de generate_code")
+    types_old, calls = time_type_lowering(UncachedTypesCodeGen, program)
+    types_new, _ = time_type_lowering(CodeGenVisitor, program)
+    print(f"{'esquema':<11} | {'codegen ms':>10} | {'get_llvm_type ms':>16} ({calls} chamadas)")
+    print(f"{'recalculado':<11} | {t_old:10.1f} | {types_old:16.1f}")
+    print(f"{'memoizado':<11} | {t_new:10.1f} | {types_new:16.1f}")
+    print(f"speedup: codegen {t_old / t_new:.2f}x, get_llvm_type {types_old / types_new:.2f}x; IR {'idêntico' if old_ir == new_ir else 'DIFERENTE'}")
+
+if __name__ == '__main__':
+    main()
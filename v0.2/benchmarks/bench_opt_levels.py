@@ -0,0 +1,94 @@
+# bench_opt_levels.py - Efeito de cada nível do pipeline de otimização em processo
+#
+# Uso: python benchmarks/bench_opt_levels.py [N] [repetições]
+# Para -O0..-O3, -Os e -Oz (CodeGenVisitor.optimize_module) mede:
+#   tempo do pipeline, instruções no IR otimizado, tamanho do objeto e tempo de execução
+#   de um programa com laço sobre &[i32] e chamadas pequenas (candidatas a inlining).
+import os
+import sys
+import time
+import shutil
+import tempfile
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from codegen_llvm import CodeGenVisitor, parse_opt_level
+from run_suite import frontend
+
+RUNTIME_C = os.path.join(os.path.dirname(BENCH_DIR), "runtime.c")
+LEVELS = ("0", "1", "2", "3", "s", "z")
+
+def make_program(n: int, reps: int) -> str:
+    return f"""
+extern "C"
+    func printf(*const char, ...) -> i32;
+end
+
+func weight(x: i32, k: i32) -> i32
+    return x * k + (x & 7);
+end
+
+func dot(s: &[i32], k: i32) -> i32
+    mut total: i32 = 0;
+    mut i: usize = 0 as usize;
+    while i < s.len
+        total = total + weight(s[i], k);
+        i = i + (1 as usize);
+    end
+    return total;
+end
+
+func main() -> i32
+    mut data: [i32; {n}] = [3; {n}];
+    let s: &[i32] = &data;
+    mut acc: i32 = 0;
+    mut r: i32 = 0;
+    while r < {reps}
+        data[0] = r;
+        acc = acc + dot(s, r & 15);
+        r = r + 1;
+    end
+    mem printf("%d\\n", acc); end
+    return 0;
+end
+"""
+
+def count_instructions(llvm_module) -> int:
+    return sum(1 for f in llvm_module.functions for b in f.blocks for _ in b.instructions)
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 4096
+    reps = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    program = frontend(make_program(n, reps))
+    work_dir = tempfile.mkdtemp(prefix="atom_bench_opt_")
+    try:
+        runtime_obj = os.path.join(work_dir, "runtime.o")
+        subprocess.run(["cc", "-O2", "-c", RUNTIME_C, "-o", runtime_obj], check=True)
+        print(f"N={n}, {reps} repetições")
+        print(f"{'nível':<5} | {'opt ms':>8} {'instrs':>7} {'obj bytes':>9} | {'exec ms':>9} | saída")
+        outputs = set()
+        for level in LEVELS:
+            opt_level, opt_preset = parse_opt_level(level)
+            generator = CodeGenVisitor(opt_level, opt_preset)
+            generator.generate_code(program)
+            t0 = time.perf_counter(); llvm_module = generator.optimize_module(); t_opt = time.perf_counter() - t0
+            obj = generator.target.create_target_machine(opt=generator.opt_level, reloc='pic').emit_object(llvm_module)
+            obj_path = os.path.join(work_dir, f"O{level}.o"); exe_path = os.path.join(work_dir, f"O{level}")
+            with open(obj_path, "wb") as f: f.write(obj)
+            subprocess.run(["cc", obj_path, runtime_obj, "-o", exe_path], check=True)
+            best = None
+            for _ in range(3):
+                t0 = time.perf_counter()
+                proc = subprocess.run([exe_path], capture_output=True, text=True, check=True)
+                elapsed = time.perf_counter() - t0
+                best = elapsed if best is None else min(best, elapsed)
+            outputs.add(proc.stdout.strip())
+            print(f"-O{level:<3} | {t_opt * 1000:8.1f} {count_instructions(llvm_module):7d} {len(obj):9d} | {best * 1000:9.1f} | {proc.stdout.strip()}")
+        if len(outputs) != 1: print("ERRO: saídas diferentes entre os níveis")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+# bench_parallel_build.py - Speedup do build paralelo (module_loader -j) com 1/2/4/8 processos
+#
+# Uso: python benchmarks/bench_parallel_build.py [num_modulos] [funcs_por_modulo] [jobs ...]
+# Gera o projeto sintético de bench_imports.py (padrão 64 módulos de 8 funções + main) e faz um
+# build frio (cache vazio) para cada número de processos, conferindo o resultado do executável.
+# O speedup é limitado pelos núcleos disponíveis (os.cpu_count() aparece no cabeçalho).
+import os
+import sys
+import time
+import shutil
+import tempfile
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from compile_cache import CompileCache
+from module_loader import ModuleLoader
+from bench_imports import make_module, make_main, write
+
+def main():
+    modules = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    funcs = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    job_counts = [int(a) for a in sys.argv[3:]] or [1, 2, 4, 8]
+    work_dir = tempfile.mkdtemp(prefix="atom_bench_pbuild_")
+    try:
+        lib_dir = os.path.join(work_dir, "lib"); os.makedirs(lib_dir)
+        for m in range(modules): write(os.path.join(lib_dir, f"mod{m}.atom"), make_module(m, funcs))
+        entry = os.path.join(work_dir, "main.atom"); write(entry, make_main(modules))
+
+        print(f"projeto: {modules} módulos x {funcs + 1} funções; CPUs: {os.cpu_count()}")
+        print(f"{'jobs':>4} | {'build frio ms':>13} {'speedup':>8} | resultado")
+        baseline = None
+        for jobs in job_counts:
+            out_dir = os.path.join(work_dir, f"out{jobs}"); exe = os.path.join(out_dir, "prog")
+            loader = ModuleLoader(CompileCache(os.path.join(work_dir, f"cache{jobs}")))
+            t0 = time.perf_counter()
+            loader.build(entry, exe, out_dir, jobs=jobs)
+            elapsed = time.perf_counter() - t0
+            baseline = baseline or elapsed
+            code = subprocess.run([exe]).returncode
+            print(f"{jobs:4d} | {elapsed * 1000:13.1f} {baseline / elapsed:7.2f}x | exit={code}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# bench_parser_cache.py - Latência de parse_atom: frio vs. quente (cache do parser)
+#
+# Uso: python benchmarks/bench_parser_cache.py [repeticoes]
+#   frio (sem cache)     : processo novo, cache em disco vazio
+#   frio (cache em disco): processo novo, cache em disco já preenchido
+#   quente (processo)    : chamadas seguintes no mesmo processo
+import os
+import sys
+import time
+import subprocess
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+COMPILER_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, COMPILER_DIR)
+
+SAMPLE_CODE = r"""
+struct Vec2
+    x: i32,
+    y: i32,
+end
+
+func soma(v: Vec2) -> i32
+    return v.x + v.y;
+end
+
+func main() -> i32
+    mut total: i32 = 0;
+    mut i: i32 = 0;
+    while i < 10
+        total = total + soma(Vec2 { x: i, y: 1 });
+        i = i + 1;
+    end
+    return total;
+end
+"""
+
+# Executado em um processo novo: mede a primeira chamada de parse_atom.
+_CHILD = r"""
+import sys, time
+sys.path.insert(0, sys.argv[1])
+t0 = time.perf_counter()
+import parser_lark
+code = open(sys.argv[2]).read()
+t1 = time.perf_counter()
+parser_lark.parse_atom(code)
+t2 = time.perf_counter()
+print(f"{t2 - t1:.6f}")
+"""
+
+def _fresh_process_first_parse(cache_dir: str, src_path: str) -> float:
+    env = dict(os.environ, ATOM_PARSER_CACHE_DIR=cache_dir)
+    out = subprocess.run([sys.executable, "-c", _CHILD, COMPILER_DIR, src_path],
+                         env=env, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+def main():
+    reps = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    with tempfile.TemporaryDirectory() as tmp:
+        src_path = os.path.join(tmp, "sample.atom")
+        with open(src_path, "w") as f: f.write(SAMPLE_CODE)
+        cache_dir = os.path.join(tmp, "cache")
+
+        cold = []
+        for _ in range(reps):
+            if os.path.isdir(cache_dir):
+                for name in os.listdir(cache_dir): os.remove(os.path.join(cache_dir, name))
+            cold.append(_fresh_process_first_parse(cache_dir, src_path))
+        disk = [_fresh_process_first_parse(cache_dir, src_path) for _ in range(reps)]
+
+        os.environ["ATOM_PARSER_CACHE_DIR"] = cache_dir
+        import parser_lark
+        warm = []
+        parser_lark.parse_atom(SAMPLE_CODE) # aquece o cache do processo
+        for _ in range(reps):
+            t0 = time.perf_counter(); parser_lark.parse_atom(SAMPLE_CODE); warm.append(time.perf_counter() - t0)
+
+    print(f"parse_atom ({reps} repetições, mediana)")
+    print(f"  frio (sem cache)     : {sorted(cold)[len(cold) // 2] * 1000:8.2f} ms")
+    print(f"  frio (cache em disco): {sorted(disk)[len(disk) // 2] * 1000:8.2f} ms")
+    print(f"  quente (processo)    : {sorted(warm)[len(warm) // 2] * 1000:8.2f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# bench_startup.py - Tempo de inicialização de `python parser_lark.py`
+#
+# Uso: python benchmarks/bench_startup.py [repeticoes]
+#   Lark (sem cache)     : ATOM_NO_STANDALONE_PARSER=1, cache de parser em disco vazio
+#   Lark (cache em disco): ATOM_NO_STANDALONE_PARSER=1, cache de parser em disco preenchido
+#   standalone           : atom_parser_standalone.py presente (build_standalone_parser.py)
+# Também informa se o processo chegou a importar o pacote `lark`.
+import os
+import sys
+import time
+import shutil
+import subprocess
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+COMPILER_DIR = os.path.dirname(BENCH_DIR)
+STANDALONE_PATH = os.path.join(COMPILER_DIR, "atom_parser_standalone.py")
+
+def _run_driver(env: dict, workdir: str) -> float:
+    # parser_lark.py grava output_precedence.ll no cwd: roda em um diretório temporário.
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(COMPILER_DIR, "parser_lark.py")], cwd=workdir, env=env,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - t0
+
+def _imports_lark(env: dict) -> bool:
+    out = subprocess.run([sys.executable, "-c", "import sys, parser_lark; parser_lark.get_parser(); print('lark' in sys.modules)"],
+                         cwd=COMPILER_DIR, env=env, capture_output=True, text=True, check=True)
+    return out.stdout.strip().splitlines()[-1] == "True"
+
+def main():
+    reps = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = os.path.join(tmp, "cache")
+        base_env = dict(os.environ, ATOM_PARSER_CACHE_DIR=cache_dir)
+        lark_env = dict(base_env, ATOM_NO_STANDALONE_PARSER="1")
+
+        results = []
+        cold = []
+        for _ in range(reps):
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            cold.append(_run_driver(lark_env, tmp))
+        results.append(("Lark (sem cache)", cold, _imports_lark(lark_env)))
+        results.append(("Lark (cache em disco)", [_run_driver(lark_env, tmp) for _ in range(reps)], _imports_lark(lark_env)))
+        if os.path.exists(STANDALONE_PATH):
+            results.append(("standalone", [_run_driver(base_env, tmp) for _ in range(reps)], _imports_lark(base_env)))
+        else:
+            print("AVISO: atom_parser_standalone.py ausente; rode build_standalone_parser.py para medir o modo standalone.")
+
+    print(f"python parser_lark.py ({reps} repetições, mediana)")
+    for label, times, lark_imported in results:
+        print(f"  {label:<22}: {sorted(times)[len(times) // 2] * 1000:8.1f} ms   (importa lark: {'sim' if lark_imported else 'não'})")
+
+if __name__ == '__main__':
+    main()
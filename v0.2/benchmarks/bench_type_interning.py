@@ -0,0 +1,160 @@
+# bench_type_interning.py - Tipos internados (hash-consing) vs. tipos recriados + igualdade estrutural
+#
+# Uso: python benchmarks/bench_type_interning.py [num_funcs] [profundidade] [repetições]
+# Programa sintético com tipos profundamente aninhados (padrão 300 funções, profundidade 8), por exemplo
+# *mut *const ... i32 e &[&[... i32]]: cada let, atribuição, chamada e comparação resolve e compara esses
+# tipos. Mede só analyze() (o parse é feito uma vez) com:
+#   'estrutural' - _resolve_type aloca nós novos a cada chamada e types_are_equal percorre a estrutura
+#                  (implementação antiga, copiada abaixo)
+#   'internado'  - SemanticAnalyzer atual: resolução memoizada por nó e igualdade por identidade
+# e confere que os dois produzem os mesmos erros.
+import os
+import sys
+import time
+import statistics
+from typing import Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import ast_nodes as ast
+from ast_nodes import PrimitiveType
+from parser_lark import parse_atom
+from semantic_analyzer import SemanticAnalyzer
+
+def nested(depth: int, leaf: str, make) -> str:
+    text = leaf
+    for level in range(depth): text = make(text, level)
+    return text
+
+def make_program(num_funcs: int, depth: int) -> str:
+    ptr = nested(depth, "i32", lambda t, k: f"*mut {t}" if k % 2 else f"*const {t}")
+    slc = nested(depth, "i32", lambda t, k: f"&[{t}]")
+    inner = nested(depth - 1, "i32", lambda t, k: f"&[{t}]")
+    ref = nested(depth, "i64", lambda t, k: f"& {t}")
+    parts = []
+    for i in range(num_funcs):
+        callee = f"g{i - 1}" if i else "g0"
+        call = f"{callee}(a, s, r)" if i else "a"
+        parts.append(f"""
+func g{i}(a: {ptr}, s: {slc}, r: {ref}) -> {ptr}
+    let b: {ptr} = {call};
+    mut c: {ptr} = b;
+    c = a;
+    let t: {slc} = s;
+    let u: {inner} = t[0];
+    let q: {ref} = r;
+    if c == b
+        c = b;
+    end
+    return c;
+end
+""")
+    parts.append("\nfunc main() -> i32\n    return 0;\nend\n")
+    return "".join(parts)
+
+class StructuralTypesAnalyzer(SemanticAnalyzer):
+    """Esquema antigo: tipos resolvidos recriados a cada chamada, igualdade estrutural recursiva."""
+    def _resolve_type(self, type_node: Optional[ast.Type]) -> Optional[ast.Type]:
+        if type_node is None: return None
+        if isinstance(type_node, (ast.PrimitiveType, ast.UnitType, ast.LiteralIntegerType)):
+            if isinstance(type_node, ast.PrimitiveType) and type_node.name != "_error_" and type_node.name not in self.llvm_types:
+                 self.add_error(f"Tipo primitivo desconhecido: '{type_node.name}'", type_node); return ast.PrimitiveType("_error_")
+            return type_node
+        if isinstance(type_node, ast.PointerType):
+            resolved_pointee = self._resolve_type(type_node.pointee_type)
+            if resolved_pointee is None or (isinstance(resolved_pointee, PrimitiveType) and resolved_pointee.name == "_error_"): return ast.PrimitiveType("_error_")
+            return ast.PointerType(pointee_type=resolved_pointee, is_mutable=type_node.is_mutable)
+        if isinstance(type_node, ast.ReferenceType):
+            resolved_referenced = self._resolve_type(type_node.referenced_type)
+            if resolved_referenced is None or (isinstance(resolved_referenced, PrimitiveType) and resolved_referenced.name == "_error_"): return ast.PrimitiveType("_error_")
+            return ast.ReferenceType(referenced_type=resolved_referenced, is_mutable=type_node.is_mutable)
+        if isinstance(type_node, ast.ArrayType):
+            resolved_element = self._resolve_type(type_node.element_type)
+            if resolved_element is None or (isinstance(resolved_element, PrimitiveType) and resolved_element.name == "_error_"): return ast.PrimitiveType("_error_")
+            return ast.ArrayType(element_type=resolved_element, size=type_node.size)
+        if isinstance(type_node, ast.SliceType):
+            resolved_element = self._resolve_type(type_node.element_type)
+            if resolved_element is None or (isinstance(resolved_element, PrimitiveType) and resolved_element.name == "_error_"): return ast.PrimitiveType("_error_")
+            return ast.SliceType(element_type=resolved_element, is_mutable=type_node.is_mutable)
+        if isinstance(type_node, ast.FunctionType):
+             resolved_params = [self._resolve_type(p) for p in type_node.param_types]
+             # Checa se algum parâmetro não pôde ser resolvido
+             if any(rp is None or (isinstance(rp, PrimitiveType) and rp.name=="_error_") for rp in resolved_params): return ast.PrimitiveType("_error_")
+             # Força os tipos None/erro a serem _error_ para consistência
+             safe_resolved_params = [rp if rp else ast.PrimitiveType("_error_") for rp in resolved_params]
+
+             resolved_ret = self._resolve_type(type_node.return_type)
+             if resolved_ret is None or (isinstance(resolved_ret, PrimitiveType) and resolved_ret.name=="_error_"): return ast.PrimitiveType("_error_")
+             safe_resolved_ret = resolved_ret if resolved_ret else ast.PrimitiveType("_error_")
+
+             return ast.FunctionType(param_types=safe_resolved_params, return_type=safe_resolved_ret, is_var_arg=type_node.is_var_arg)
+        if isinstance(type_node, ast.CustomType):
+            type_name = type_node.name.name
+            if type_name in self.struct_defs or type_name in self.enum_defs:
+                return type_node
+            else: self.add_error(f"Tipo customizado '{type_name}' não definido.", type_node.name); return ast.PrimitiveType("_error_")
+        self.add_error(f"Tipo AST não suportado na resolução: {type(type_node).__name__}", type_node)
+        return ast.PrimitiveType("_error_")
+
+    def get_concrete_type(self, type_node: Optional[ast.Type]) -> Optional[ast.Type]:
+        resolved = self._resolve_type(type_node)
+        if isinstance(resolved, ast.LiteralIntegerType):
+            return ast.PrimitiveType(name=resolved.default_type_name)
+        return resolved
+
+    def types_are_equal(self, type1_maybe_literal: Optional[ast.Type], type2_maybe_literal: Optional[ast.Type]) -> bool:
+        t1 = self.get_concrete_type(type1_maybe_literal)
+        t2 = self.get_concrete_type(type2_maybe_literal)
+        if t1 is None or t2 is None: return False
+        if isinstance(t1, PrimitiveType) and t1.name == "_error_": return True # Erro é compatível com tudo para evitar cascata
+        if isinstance(t2, PrimitiveType) and t2.name == "_error_": return True
+        if type(t1) is not type(t2): return False
+        if isinstance(t1, ast.PrimitiveType): return t1.name == t2.name
+        if isinstance(t1, ast.UnitType): return True
+        if isinstance(t1, ast.CustomType): return t1.name.name == t2.name.name
+        if isinstance(t1, ast.PointerType): return t1.is_mutable == t2.is_mutable and self.types_are_equal(t1.pointee_type, t2.pointee_type)
+        if isinstance(t1, ast.ReferenceType): return t1.is_mutable == t2.is_mutable and self.types_are_equal(t1.referenced_type, t2.referenced_type)
+        if isinstance(t1, ast.SliceType): return t1.is_mutable == t2.is_mutable and self.types_are_equal(t1.element_type, t2.element_type)
+        if isinstance(t1, ast.ArrayType):
+            elements_equal = self.types_are_equal(t1.element_type, t2.element_type)
+            size1_val = getattr(t1.size, 'value', None) if isinstance(t1.size, ast.IntegerLiteral) else None
+            size2_val = getattr(t2.size, 'value', None) if isinstance(t2.size, ast.IntegerLiteral) else None
+            # Para igualdade de tipos array, os tamanhos DEVEM ser conhecidos e iguais em tempo de compilação.
+            # Se um dos tamanhos não for literal, não podemos dizer que são iguais aqui.
+            if size1_val is None or size2_val is None or size1_val != size2_val:
+                return False # Tamanhos diferentes ou não conhecidos como literais
+            return elements_equal
+        if isinstance(t1, ast.FunctionType):
+            if len(t1.param_types) != len(t2.param_types) or \
+               t1.is_var_arg != t2.is_var_arg or \
+               not self.types_are_equal(t1.return_type, t2.return_type):
+                return False
+            for p1_type, p2_type in zip(t1.param_types, t2.param_types):
+                if not self.types_are_equal(p1_type, p2_type): return False
+            return True
+        return False
+
+def time_analyze(analyzer_class, program, reps: int):
+    samples, errors = [], None
+    for _ in range(reps):
+        analyzer = analyzer_class()
+        t0 = time.perf_counter(); errors = analyzer.analyze(program); samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000, errors, analyzer
+
+def main():
+    num_funcs = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    reps = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    program = parse_atom(make_program(num_funcs, depth))
+    t_old, old_errors, _ = time_analyze(StructuralTypesAnalyzer, program, reps)
+    t_new, new_errors, analyzer = time_analyze(SemanticAnalyzer, program, reps)
+    print(f"programa: {num_funcs} funções, tipos com profundidade {depth}; mediana de {reps} análises")
+    print(f"{'esquema':<10} | {'ms':>8} | erros")
+    print(f"{'estrutural':<10} | {t_old:8.1f} | {len(old_errors)}")
+    print(f"{'internado':<10} | {t_new:8.1f} | {len(new_errors)}")
+    print(f"speedup: {t_old / t_new:.2f}x; tipos internados: {len(analyzer.type_table)}; nós de tipo memoizados: {len(analyzer.resolved_type_cache)}")
+    if old_errors != new_errors: print("AVISO: os dois esquemas produziram erros diferentes!")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+# bench_unchecked.py - Build padrão (bounds checks) vs. modo sem checks (--unchecked) na suíte de programas
+#
+# Uso: python benchmarks/bench_unchecked.py [-O nível ...] [--only nome ...] [--runs N]
+# Para cada programa de benchmarks/programs e cada nível (padrão -O 0 e -O 2), compila duas vezes com
+# run_suite.measure: padrão (checks que o bounds_analysis não provou) e unchecked_indexing=True (o
+# mesmo que 'unchecked func' em todas as funções). Mostra os checks gerados/abandonados, as instruções
+# do IR otimizado e o tempo de execução (melhor de --runs), e confere que a saída é a mesma.
+# Os programas em que todo índice é provado não mudam; a diferença aparece em indirect_index
+# (gather por permutação e busca binária).
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from run_suite import PROGRAMS_DIR, measure
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Build com bounds checks vs. modo --unchecked.")
+    arg_parser.add_argument("-O", dest="levels", action="append", help="Nível de otimização (repetível; padrão: 0 e 2)")
+    arg_parser.add_argument("--only", nargs="+", default=None, help="Só estes programas (nome sem .atom)")
+    arg_parser.add_argument("--runs", type=int, default=7, help="Execuções do binário por medida (melhor tempo)")
+    ns = arg_parser.parse_args()
+    levels = ns.levels or ["0", "2"]
+    names = ns.only or sorted(f[:-5] for f in os.listdir(PROGRAMS_DIR) if f.endswith(".atom"))
+
+    work_dir = tempfile.mkdtemp(prefix="atom_unchecked_")
+    try:
+        print(f"{'programa':<20} {'nível':>5} | {'checks':>6} {'sem':>4} | {'instrs IR':>9} {'sem chk':>7} | {'exec ms':>8} {'sem chk':>8} {'':>6} | saída")
+        for level in levels:
+            for name in names:
+                checked = measure(name, level, work_dir, ns.runs, 1)
+                unchecked = measure(name, level, work_dir, ns.runs, 1, unchecked_indexing=True)
+                same = checked['output'] == unchecked['output'] and checked['exit_code'] == unchecked['exit_code'] == 0
+                print(f"{name:<20} {'-O' + level:>5} | {checked['bounds_checks']:6d} {unchecked['bounds_checks_unchecked']:4d} | "
+                      f"{checked['ir_instructions']:9d} {unchecked['ir_instructions']:7d} | {checked['run_ms']:8.1f} {unchecked['run_ms']:8.1f} "
+                      f"{(unchecked['run_ms'] / checked['run_ms'] - 1) * 100:+5.0f}% | {'igual' if same else 'DIFERENTE'}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
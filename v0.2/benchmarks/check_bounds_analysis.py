@@ -0,0 +1,157 @@
+# check_bounds_analysis.py - Regressão: quais indexações e contadores a análise de bounds prova
+#
+# Uso: python benchmarks/check_bounds_analysis.py   (código de saída != 0 em caso de regressão)
+# Roda o front-end em laços pequenos e compara, na ordem do fonte de f, o bounds_proven de cada
+# IndexAccess e o arith_no_wrap da atualização do contador (i = i ± 1) com o esperado. Os casos
+# "mantém" cobrem fatos que decide()/proves_no_wrap() não podem mais usar (índice alterado antes
+# do acesso, slice ou tamanho reatribuído, &mut i, contador com sinal decrescente); uma prova a
+# mais neles é um bounds check removido indevidamente.
+import os
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import ast_nodes as ast
+from run_suite import frontend
+
+# (nome, código, bounds_proven dos IndexAccess em f, arith_no_wrap das atualizações de i em f)
+CASES = [
+    ("prova: while i < s.len", r"""
+func f(s: &[i32]) -> i32
+    mut t: i32 = 0;
+    mut i: usize = 0 as usize;
+    while i < s.len
+        t = t + s[i];
+        i = i + (1 as usize);
+    end
+    return t;
+end
+""", [True], [True]),
+    ("prova: for i in 0..s.len", r"""
+func f(s: &[i32]) -> i32
+    mut t: i32 = 0;
+    for i in (0 as usize)..s.len
+        t = t + s[i];
+    end
+    return t;
+end
+""", [True], []),
+    ("prova: let n = s.len", r"""
+func f(s: &[i32]) -> i32
+    mut t: i32 = 0;
+    let n = s.len;
+    mut i: usize = 0 as usize;
+    while i < n
+        t = t + s[i];
+        i = i + (1 as usize);
+    end
+    return t;
+end
+""", [True], [True]),
+    ("prova: i32 crescente", r"""
+func f() -> i32
+    let a: [i32; 16] = [7; 16];
+    mut t: i32 = 0;
+    mut i: i32 = 0;
+    while i < 16
+        t = t + a[i];
+        i = i + 1;
+    end
+    return t;
+end
+""", [True], [True]),
+    ("mantém: i + 1 antes de s[i]", r"""
+func f(s: &[i32]) -> i32
+    mut t: i32 = 0;
+    mut i: usize = 0 as usize;
+    while i < s.len
+        i = i + (1 as usize);
+        t = t + s[i];
+    end
+    return t;
+end
+""", [False], [True]),
+    ("mantém: slice reatribuído", r"""
+func f(s: &[i32], u: &[i32]) -> i32
+    mut t: i32 = 0;
+    mut x: &[i32] = s;
+    mut i: usize = 0 as usize;
+    while i < x.len
+        x = u;
+        t = t + x[i];
+        i = i + (1 as usize);
+    end
+    return t;
+end
+""", [False], [False]),
+    ("mantém: n = x.len; x = u", r"""
+func f(s: &[i32], u: &[i32]) -> i32
+    mut t: i32 = 0;
+    mut x: &[i32] = s;
+    let n = x.len;
+    x = u;
+    mut i: usize = 0 as usize;
+    while i < n
+        t = t + x[i];
+        i = i + (1 as usize);
+    end
+    return t;
+end
+""", [False], [False]),
+    ("mantém: &mut i escapa", r"""
+func bump(p: &mut usize) -> i32
+    return 0;
+end
+func f(s: &[i32]) -> i32
+    mut t: i32 = 0;
+    mut i: usize = 0 as usize;
+    while i < s.len
+        bump(&mut i);
+        t = t + s[i];
+        i = i + (1 as usize);
+    end
+    return t;
+end
+""", [False], [False]),
+    ("mantém: i32 com i = i - 1", r"""
+func f() -> i32
+    let a: [i32; 16] = [7; 16];
+    mut t: i32 = 0;
+    mut i: i32 = 0;
+    while i < 16
+        t = t + a[i];
+        i = i - 1;
+    end
+    return t;
+end
+""", [False], [False]),
+]
+
+def analysis_flags(code: str):
+    """(bounds_proven dos IndexAccess, arith_no_wrap das atualizações 'i = ...') de f, em ordem de fonte."""
+    program = frontend(code)
+    func = next(node for node in program.body if isinstance(node, ast.FunctionDef) and node.name.name == "f")
+    proven, no_wrap = [], []
+    stack = [func.body]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list): stack.extend(reversed(node)); continue
+        if not isinstance(node, ast.Node) or isinstance(node, ast.Type): continue
+        if isinstance(node, ast.IndexAccess): proven.append(bool(getattr(node, 'bounds_proven', False)))
+        if isinstance(node, ast.Assignment) and isinstance(node.target, ast.Identifier) and node.target.name == "i" and isinstance(node.value, ast.BinaryOp):
+            no_wrap.append(bool(getattr(node.value, 'arith_no_wrap', False)))
+        stack.extend(reversed([getattr(node, name) for name in node.__dataclass_fields__]))
+    return proven, no_wrap
+
+def main() -> int:
+    failures = 0
+    for label, code, expected_proven, expected_no_wrap in CASES:
+        proven, no_wrap = analysis_flags(code)
+        ok = proven == expected_proven and no_wrap == expected_no_wrap
+        if not ok: failures += 1
+        print(f"  {'OK' if ok else 'FALHA':<5} {label:<30} provadas {proven} (esperado {expected_proven}), sem overflow {no_wrap} (esperado {expected_no_wrap})")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
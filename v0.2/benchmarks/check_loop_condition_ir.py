@@ -0,0 +1,69 @@
+# check_loop_condition_ir.py - Regressão: operandos de comparação avaliados uma única vez
+#
+# Uso: python benchmarks/check_loop_condition_ir.py   (código de saída != 0 em caso de regressão)
+# Compila laços `while` e conta as instruções emitidas no bloco while.cond. Se
+# visit_BinaryOp voltar a revisitar os operandos da comparação, loads/GEPs/chamadas
+# aparecem em dobro e a contagem sobe.
+import os
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import llvmlite.binding as llvm
+from codegen_llvm import generate_llvm_ir
+from run_suite import frontend
+
+# (nome, código, instruções esperadas em while.cond)
+CASES = [
+    ("i < n (locais)", r"""
+func f(n: i32) -> i32
+    mut i: i32 = 0;
+    while i < n
+        i = i + 1;
+    end
+    return i;
+end
+""", 4), # load i, load n, icmp, br
+    ("i < s.len (slice)", r"""
+func f(s: &[i32]) -> usize
+    mut i: usize = 0 as usize;
+    while i < s.len
+        i = i + (1 as usize);
+    end
+    return i;
+end
+""", 5), # load i, gep len, load len, icmp, br
+    ("g(i) < n (chamada)", r"""
+func g(x: i32) -> i32
+    return x;
+end
+func f(n: i32) -> i32
+    mut i: i32 = 0;
+    while g(i) < n
+        i = i + 1;
+    end
+    return i;
+end
+""", 5), # load i, call g, load n, icmp, br
+]
+
+def loop_condition_instruction_count(code: str) -> int:
+    llvm_ir = generate_llvm_ir(frontend(code))
+    module = llvm.parse_assembly(llvm_ir)
+    module.verify()
+    for block in module.get_function("f").blocks:
+        if block.name == "while.cond": return len(list(block.instructions))
+    raise RuntimeError("Bloco while.cond não encontrado")
+
+def main() -> int:
+    failures = 0
+    for label, code, expected in CASES:
+        count = loop_condition_instruction_count(code)
+        status = "OK" if count == expected else "FALHA"
+        if count != expected: failures += 1
+        print(f"  {status:<5} {label:<22} while.cond: {count} instruções (esperado {expected})")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+# check_noalias.py - Regressão: noalias só em parâmetros &mut provadamente exclusivos
+#
+# Uso: python benchmarks/check_noalias.py   (código de saída != 0 em caso de regressão)
+# Gera o IR de programas pequenos e confere os atributos dos parâmetros de f. Uma chamada que
+# passa a mesma memória em dois argumentos (f(r, r), f(&mut p, &p), f(&mut k, &mut k)) não pode
+# deixar noalias em f: o LLVM manteria valores em registradores e o programa leria dados velhos.
+# Empréstimos novos de lugares disjuntos devem receber noalias, e &T sempre recebe readonly.
+import os
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from run_suite import build_module
+
+PRELUDE = r"""
+struct P
+    x: i32,
+end
+"""
+
+# (nome, f + main, atributos esperados (noalias, readonly) por parâmetro de f)
+CASES = [
+    ("f(r, r)", r"""
+func f(a: &mut P, b: &mut P) -> i32
+    a.x = 1;
+    b.x = 2;
+    return a.x;
+end
+func main() -> i32
+    mut p: P = P { x: 0 };
+    let r: &mut P = &mut p;
+    return f(r, r);
+end
+""", [(False, False), (False, False)]),
+    ("f(&mut p, &p)", r"""
+func f(a: &mut P, b: &P) -> i32
+    a.x = 5;
+    return b.x;
+end
+func main() -> i32
+    mut p: P = P { x: 0 };
+    return f(&mut p, &p);
+end
+""", [(False, False), (False, True)]),
+    ("f(&mut k, &mut k)", r"""
+func f(a: &mut P, b: &mut P) -> i32
+    a.x = 1;
+    b.x = 2;
+    return a.x;
+end
+func main() -> i32
+    mut k: P = P { x: 0 };
+    return f(&mut k, &mut k);
+end
+""", [(False, False), (False, False)]),
+    ("f(&mut v, &mut w)", r"""
+func f(a: &mut P, b: &mut P) -> i32
+    a.x = 1;
+    b.x = 2;
+    return a.x;
+end
+func main() -> i32
+    mut v: P = P { x: 0 };
+    mut w: P = P { x: 0 };
+    return f(&mut v, &mut w);
+end
+""", [(True, False), (True, False)]),
+    ("f(&mut v, &w)", r"""
+func f(a: &mut P, b: &P) -> i32
+    a.x = 5;
+    return b.x;
+end
+func main() -> i32
+    mut v: P = P { x: 0 };
+    let w: P = P { x: 3 };
+    return f(&mut v, &w);
+end
+""", [(True, False), (False, True)]),
+]
+
+def param_attributes(code: str):
+    """(noalias, readonly) de cada parâmetro de f no IR gerado (-O0, antes dos passes)."""
+    generator = build_module(PRELUDE + code)
+    return [('noalias' in arg.attributes, 'readonly' in arg.attributes) for arg in generator.module.get_global("f").args]
+
+def main() -> int:
+    failures = 0
+    for label, code, expected in CASES:
+        attributes = param_attributes(code)
+        ok = attributes == expected
+        if not ok: failures += 1
+        print(f"  {'OK' if ok else 'FALHA':<5} {label:<20} (noalias, readonly) {attributes} (esperado {expected})")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,193 @@
+# run_suite.py - Suíte de programas Atom: tempo de compilação por fase, IR, binário e execução vs. baseline
+#
+# Uso: python benchmarks/run_suite.py [-O nível ...] [--only nome ...] [--runs N] [--compile-reps N]
+#                                     [--baseline arquivo.json] [--update-baseline] [--json saida.json]
+# Para cada programa em benchmarks/programs/*.atom e cada nível (padrão -O 0 e -O 2):
+#   compila --compile-reps vezes medindo parse, semantic, bounds, codegen, optimize, emit_object e link pelo
+#   profiler.py (melhor tempo de cada fase; 'compila ms' é a soma sem o link, que é o cc do sistema);
+#   conta as instruções do IR otimizado e os bounds checks gerados/eliminados (bounds_analysis); mede o
+#   tamanho do objeto e do executável (ligado com runtime.o)
+#   e executa o binário --runs vezes (melhor tempo), conferindo a saída. O mínimo é usado por ser a
+#   medida menos sensível a interferência de outros processos.
+# Compara com benchmarks/baseline.json e termina com status 1 se houver regressão:
+#   saída do programa diferente (miscompilação) ou código de saída != 0;
+#   instruções do IR ou tamanho do objeto/executável acima de SIZE_TOLERANCE;
+#   mais bounds checks gerados que na baseline (uma prova que deixou de valer);
+#   tempo de execução, de compilação ou de uma fase do compilador acima de TIME_TOLERANCE e de
+#   MIN_TIME_DELTA_MS (diferenças de poucos ms em fases curtas são ruído).
+# Antes das medidas roda os scripts de CHECK_SCRIPTS (regressões autoverificáveis do compilador);
+# um que termine com status != 0 também faz a suíte terminar com status 1.
+# Tempos só são comparáveis na mesma máquina: grave a baseline nela com --update-baseline (só os
+# níveis/programas medidos são substituídos).
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+from typing import Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import llvmlite.binding as llvm
+import profiler
+import ast_nodes as ast
+from parser_lark import parse_atom
+from semantic_analyzer import analyze_semantics
+from codegen_llvm import CodeGenVisitor, RUNTIME_OBJECT, link_executable, parse_opt_level
+
+PROGRAMS_DIR = os.path.join(BENCH_DIR, "programs")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+PHASES = ("parse", "semantic", "bounds", "codegen", "optimize", "emit_object", "link")
+COMPILER_PHASES = PHASES[:-1]
+
+SIZE_TOLERANCE = 1.05   # IR e binários: +5%
+TIME_TOLERANCE = 1.25   # Tempos: +25% (ruído de medição em máquinas compartilhadas)
+MIN_TIME_DELTA_MS = 10.0 # Diferenças absolutas menores que isso nunca contam como regressão
+CHECK_SCRIPTS = ("check_loop_condition_ir.py", "check_bounds_analysis.py", "check_noalias.py")
+
+def frontend(source: str) -> ast.Program:
+    """Parse + análise semântica de uma fonte Atom (sem imports); ValueError se houver erros."""
+    program = parse_atom(source)
+    errors = analyze_semantics(program)
+    if errors: raise ValueError(f"{len(errors)} erros semânticos: {errors[0]}")
+    return program
+
+def build_module(source: str, opt_level: int = 0, opt_preset: str = 'speed', codegen_class=CodeGenVisitor, **options) -> CodeGenVisitor:
+    """frontend + CodeGen (generate_code + check_errors) com a classe dada; o módulo fica em generator.module."""
+    generator = codegen_class(opt_level, opt_preset, **options)
+    generator.generate_code(frontend(source)); generator.check_errors()
+    return generator
+
+def count_instructions(llvm_module) -> int:
+    return sum(1 for f in llvm_module.functions for b in f.blocks for _ in b.instructions)
+
+def compile_program(source: str, level: str, exe_path: str, unchecked_indexing: bool = False, overflow_mode: str = 'wrap') -> Dict[str, object]:
+    """Uma compilação completa (fonte -> executável) com o profiler ligado, sem rastrear alocações."""
+    opt_level, opt_preset = parse_opt_level(level)
+    object_path = os.path.splitext(exe_path)[0] + ".o"
+    phase_profiler = profiler.enable(track_allocations=False)
+    try:
+        generator = build_module(source, opt_level, opt_preset, unchecked_indexing=unchecked_indexing, overflow_mode=overflow_mode)
+        llvm_module = generator.optimize_module()
+        ir_instructions = count_instructions(llvm_module)
+        generator.emit_object(object_path, llvm_module)
+        link_executable([object_path], exe_path, RUNTIME_OBJECT)
+    finally:
+        profiler.disable()
+    totals = phase_profiler.totals()
+    phases_ms = {name: totals[name]['wall_ms'] if name in totals else 0.0 for name in PHASES}
+    return {'phases_ms': phases_ms, 'ir_instructions': ir_instructions,
+            'bounds_checks': generator.bounds_checks_emitted, 'bounds_checks_elided': generator.bounds_checks_elided,
+            'bounds_checks_unchecked': generator.bounds_checks_unchecked,
+            'overflow_checks': generator.overflow_checks_emitted, 'no_wrap_ops': generator.no_wrap_ops,
+            'object_bytes': os.path.getsize(object_path), 'binary_bytes': os.path.getsize(exe_path)}
+
+def run_binary(exe_path: str, runs: int) -> Dict[str, object]:
+    samples, outputs, exit_codes = [], set(), set()
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        result = subprocess.run([exe_path], capture_output=True, text=True)
+        samples.append((time.perf_counter() - t0) * 1000)
+        outputs.add(result.stdout); exit_codes.add(result.returncode)
+    if len(outputs) != 1: raise RuntimeError(f"{exe_path}: saída muda entre execuções")
+    return {'run_ms': min(samples), 'output': outputs.pop(), 'exit_code': max(exit_codes)}
+
+def measure(name: str, level: str, work_dir: str, runs: int, compile_reps: int, unchecked_indexing: bool = False,
+            overflow_mode: str = 'wrap') -> Dict[str, object]:
+    with open(os.path.join(PROGRAMS_DIR, name + ".atom"), encoding="utf8") as f: source = f.read()
+    exe_path = os.path.join(work_dir, f"{name}_O{level}{'_unchecked' if unchecked_indexing else ''}_{overflow_mode}")
+    compiles = [compile_program(source, level, exe_path, unchecked_indexing, overflow_mode) for _ in range(compile_reps)]
+    phases_ms = {p: min(c['phases_ms'][p] for c in compiles) for p in PHASES}
+    result = {k: compiles[-1][k] for k in ('ir_instructions', 'bounds_checks', 'bounds_checks_elided', 'bounds_checks_unchecked', 'overflow_checks', 'no_wrap_ops', 'object_bytes', 'binary_bytes')}
+    result['phases_ms'] = {p: round(ms, 2) for p, ms in phases_ms.items()}
+    result['compile_ms'] = round(sum(phases_ms[p] for p in COMPILER_PHASES), 2)
+    result.update(run_binary(exe_path, runs))
+    result['run_ms'] = round(result['run_ms'], 2)
+    return result
+
+def compare(current: Dict[str, object], base: Dict[str, object], time_tolerance: float = TIME_TOLERANCE) -> List[str]:
+    problems = []
+    if current['exit_code'] != 0: problems.append(f"código de saída {current['exit_code']}")
+    if current['output'] != base['output']: problems.append(f"saída mudou: {base['output']!r} -> {current['output']!r}")
+    for key in ('ir_instructions', 'object_bytes', 'binary_bytes'):
+        if current[key] > base[key] * SIZE_TOLERANCE: problems.append(f"{key} {base[key]} -> {current[key]}")
+    if 'bounds_checks' in base and current['bounds_checks'] > base['bounds_checks']:
+        problems.append(f"bounds_checks {base['bounds_checks']} -> {current['bounds_checks']}")
+    timed = [('run_ms', current['run_ms'], base['run_ms']), ('compile_ms', current['compile_ms'], base['compile_ms'])]
+    timed += [(f"{p}_ms", current['phases_ms'][p], base['phases_ms'].get(p, 0.0)) for p in COMPILER_PHASES]
+    for key, now, before in timed:
+        if now > before * time_tolerance and now - before > MIN_TIME_DELTA_MS: problems.append(f"{key} {before:.1f} -> {now:.1f}")
+    return problems
+
+def delta(now: float, before: Optional[float]) -> str:
+    if not before: return "      "
+    return f"{(now / before - 1) * 100:+5.0f}%"
+
+def run_checks() -> List[str]:
+    """Roda cada script de CHECK_SCRIPTS em um processo próprio; devolve os que falharam."""
+    failed = []
+    for script in CHECK_SCRIPTS:
+        print(f"{script}:", flush=True)
+        if subprocess.run([sys.executable, os.path.join(BENCH_DIR, script)]).returncode != 0: failed.append(script)
+    return failed
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Suíte de benchmarks de programas Atom com baseline.")
+    arg_parser.add_argument("-O", dest="levels", action="append", help="Nível de otimização (repetível; padrão: 0 e 2)")
+    arg_parser.add_argument("--only", nargs="+", default=None, help="Só estes programas (nome sem .atom)")
+    arg_parser.add_argument("--runs", type=int, default=5, help="Execuções do binário por medida (melhor tempo)")
+    arg_parser.add_argument("--compile-reps", type=int, default=5, help="Compilações por medida (melhor tempo por fase)")
+    arg_parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE, help=f"Fator máximo para tempos (padrão {TIME_TOLERANCE})")
+    arg_parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    arg_parser.add_argument("--update-baseline", action="store_true", help="Grava os resultados como nova baseline")
+    arg_parser.add_argument("--json", default=None, help="Grava os resultados desta execução neste arquivo")
+    ns = arg_parser.parse_args()
+    levels = ns.levels or ["0", "2"]
+    names = ns.only or sorted(f[:-5] for f in os.listdir(PROGRAMS_DIR) if f.endswith(".atom"))
+
+    baseline = {'machine': {}, 'results': {}}
+    if os.path.exists(ns.baseline):
+        with open(ns.baseline, encoding="utf8") as f: baseline = json.load(f)
+    machine = {'platform': platform.platform(), 'python': platform.python_version(),
+               'llvm': ".".join(map(str, llvm.llvm_version_info)), 'cpu_count': os.cpu_count()}
+    if baseline['machine'] and baseline['machine'] != machine:
+        print(f"AVISO: baseline gravada em outra máquina/ambiente ({baseline['machine']}); tempos podem não ser comparáveis")
+
+    failed_checks = run_checks()
+    results: Dict[str, Dict[str, object]] = {}
+    regressions = 0
+    work_dir = tempfile.mkdtemp(prefix="atom_suite_")
+    try:
+        print(f"{'programa':<20} {'nível':>5} | {'compila ms':>10} {'':>6} | {'instrs IR':>9} {'':>6} | {'checks':>7} {'elim':>4} | {'exe bytes':>9} | {'exec ms':>8} {'':>6} | status")
+        for level in levels:
+            for name in names:
+                current = measure(name, level, work_dir, ns.runs, ns.compile_reps)
+                results[f"O{level}/{name}"] = current
+                base = baseline['results'].get(f"O{level}/{name}")
+                problems = compare(current, base, ns.time_tolerance) if base else []
+                status = "sem baseline" if base is None else ("ok" if not problems else "REGRESSÃO: " + "; ".join(problems))
+                regressions += bool(problems)
+                print(f"{name:<20} {'-O' + level:>5} | {current['compile_ms']:10.1f} {delta(current['compile_ms'], base and base['compile_ms'])} | "
+                      f"{current['ir_instructions']:9d} {delta(current['ir_instructions'], base and base['ir_instructions'])} | "
+                      f"{current['bounds_checks']:7d} {current['bounds_checks_elided']:4d} | {current['binary_bytes']:9d} | {current['run_ms']:8.1f} {delta(current['run_ms'], base and base['run_ms'])} | {status}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if ns.json:
+        with open(ns.json, "w", encoding="utf8") as f: json.dump({'machine': machine, 'results': results}, f, indent=1, sort_keys=True)
+    if ns.update_baseline:
+        baseline['machine'] = machine; baseline['results'].update(results)
+        with open(ns.baseline, "w", encoding="utf8") as f: json.dump(baseline, f, indent=1, sort_keys=True); f.write("\n")
+        print(f"baseline gravada em {ns.baseline}")
+    elif regressions:
+        print(f"{regressions} medidas com regressão em relação a {ns.baseline}")
+    if failed_checks: print(f"verificações com falha: {', '.join(failed_checks)}")
+    if failed_checks or (regressions and not ns.update_baseline): sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,456 @@
+# bounds_analysis.py - Eliminação de bounds checks por análise de intervalos e de variáveis de indução
+#
+# Roda entre a análise semântica e o CodeGen (analyze_semantics chama analyze_bounds quando não há
+# erros) e marca com bounds_proven = True os IndexAccess cujo índice está provadamente dentro do
+# array/slice; visit_lvalue_pointer não emite o check desses. As provas usam:
+#   - intervalos de expressões inteiras: literais, consts, casts que preservam o valor, enums
+#     (0..n-1), '%', '&', '>>', '/', '+', '-', '*' e o tipo (sem sinal => >= 0);
+#   - fatos de guarda: dentro de 'while i < s.len' / 'if i < N' / 'a && b' vale i < s.len / i < N até
+#     a próxima atribuição a i (ou a s); na entrada de um laço caem os fatos sobre variáveis
+#     atribuídas em qualquer ponto do corpo (a volta do laço);
+#   - indução para inteiros com sinal: um 'mut' que começa >= 0 e só recebe valores >= 0 e sem
+#     overflow (ex.: i = i + 1 sob i < 3000) nunca fica negativo. Como isso depende das outras
+#     variáveis, a análise parte de todas as candidatas e as descarta até um ponto fixo.
+# Variáveis com endereço tomado (&x, &mut x) não recebem fatos: podem mudar por ponteiro.
+# Os mesmos intervalos marcam com arith_no_wrap = True os '+', '-', '*' cujo resultado cabe no tipo
+# (e 'i + 1' sob 'i < s.len'); o CodeGen emite nuw/nsw neles mesmo onde a política de overflow não
+# garante (aritmética sem sinal, modo wrap) e dispensa o check no modo checked.
+#
+# Uso: python bounds_analysis.py arquivo.atom... [--unchecked]
+# Relatório de auditoria: lista as indexações que ficam sem bounds check sem prova, por
+# 'unchecked func', 'mem unchecked'/'e_mem unchecked' ou pelo modo --unchecked do build (que vale
+# para o módulo todo), e conta as provadas e as que mantêm o check.
+import sys
+import argparse
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+import ast_nodes as ast
+import profiler
+
+INT_BITS = {'i8': 8, 'u8': 8, 'i16': 16, 'u16': 16, 'i32': 32, 'u32': 32, 'i64': 64, 'u64': 64,
+            'int': 32, 'uint': 32, 'char': 8, 'usize': 32, 'isize': 32} # usize/isize: 32 bits (limite seguro para qualquer alvo)
+UNSIGNED = {'u8', 'u16', 'u32', 'u64', 'uint', 'char', 'usize'}
+
+Interval = Tuple[Optional[int], Optional[int]] # (mínimo, máximo); None = sem limite conhecido
+
+def type_name(type_node) -> Optional[str]:
+    if isinstance(type_node, ast.PrimitiveType): return type_node.name
+    if isinstance(type_node, ast.LiteralIntegerType): return type_node.default_type_name
+    return None
+
+def type_limits(name: Optional[str]) -> Optional[Tuple[int, int]]:
+    bits = INT_BITS.get(name)
+    if bits is None: return None
+    return (0, 2 ** bits - 1) if name in UNSIGNED else (-2 ** (bits - 1), 2 ** (bits - 1) - 1)
+
+def fits(interval: Optional[Interval], name: Optional[str]) -> bool:
+    limits = type_limits(name)
+    return interval is not None and limits is not None and interval[0] is not None and interval[1] is not None and \
+           limits[0] <= interval[0] and interval[1] <= limits[1]
+
+@dataclass
+class BoundsReport:
+    sites: int = 0   # Indexações de arrays/slices (ponteiros brutos não têm check)
+    proven: int = 0  # Dessas, quantas dispensam o check
+    per_function: Dict[str, Tuple[int, int]] = field(default_factory=dict) # função -> (sites, provados)
+    no_wrap: int = 0 # Operações '+', '-', '*' provadamente sem overflow
+
+class FlowState:
+    """Fatos válidos num ponto do corpo: limites superiores exclusivos por variável e apelidos de s.len."""
+    __slots__ = ('bounds', 'len_aliases')
+
+    def __init__(self, bounds=None, len_aliases=None):
+        self.bounds: Dict[int, Set[object]] = bounds if bounds is not None else {} # id(def) -> {int | ('len', id(def do slice))}
+        self.len_aliases: Dict[int, int] = len_aliases if len_aliases is not None else {} # id(let n = s.len) -> id(def de s)
+
+    def copy(self) -> 'FlowState':
+        return FlowState({k: set(v) for k, v in self.bounds.items()}, dict(self.len_aliases))
+
+    def kill(self, def_id: int):
+        # def_id mudou: seus limites e os fatos que dependem do tamanho dele deixam de valer
+        self.bounds.pop(def_id, None)
+        stale = ('len', def_id)
+        for var_bounds in self.bounds.values(): var_bounds.discard(stale)
+        for alias, target in list(self.len_aliases.items()):
+            if target == def_id: del self.len_aliases[alias]
+
+    def add(self, def_id: int, bound: object):
+        self.bounds.setdefault(def_id, set()).add(bound)
+
+class BoundsAnalyzer:
+    def __init__(self, program: ast.Program):
+        self.enum_ranges: Dict[str, Interval] = {}
+        for item in (getattr(program, 'imported_items', None) or []) + program.body:
+            if isinstance(item, ast.EnumDef) and item.variants:
+                values = [getattr(v, 'value', None) for v in item.variants]
+                if all(isinstance(v, int) for v in values): self.enum_ranges[item.name.name] = (min(values), max(values))
+        self.program = program
+        self.escaped: Set[int] = set()
+        self.nonneg: Set[int] = set()       # Candidatas a 'mut' com sinal sempre >= 0 (encolhe até o ponto fixo)
+        self.failed: Set[int] = set()       # Candidatas refutadas na passada atual
+        self.let_ranges: Dict[int, Interval] = {}
+        self.decisions: Dict[int, Tuple[ast.IndexAccess, bool]] = {}
+        self.no_wrap_decisions: Dict[int, Tuple[ast.BinaryOp, bool]] = {}
+        self.no_wrap_proven = 0
+
+    # --- Intervalos ---
+    def def_of(self, node) -> Optional[ast.Node]:
+        return getattr(node, 'definition_node', None) if isinstance(node, ast.Identifier) else None
+
+    def var_type(self, definition) -> Optional[str]:
+        if isinstance(definition, (ast.LetBinding, ast.MutBinding, ast.ForRangeStmt, ast.ForSliceStmt)): return type_name(getattr(definition, 'declared_type', None))
+        if isinstance(definition, ast.Parameter): return type_name(getattr(definition, 'resolved_type', None))
+        return None
+
+    def const_size(self, size_expr) -> Optional[int]:
+        interval = self.range_of(size_expr, FlowState())
+        return interval[0] if interval and interval[0] is not None and interval[0] == interval[1] else None
+
+    def range_of(self, expr, state: FlowState) -> Optional[Interval]:
+        result = self._range_of(expr, state)
+        if result is None:
+            # Sem estrutura conhecida: usa só o tipo (enum => valores das variantes; sem sinal => >= 0)
+            atom_type = getattr(expr, 'atom_type', None)
+            if isinstance(atom_type, ast.CustomType): return self.enum_ranges.get(atom_type.name.name)
+            limits = type_limits(type_name(atom_type))
+            if limits and limits[0] == 0: return (0, None)
+        return result
+
+    def _range_of(self, expr, state: FlowState) -> Optional[Interval]:
+        if isinstance(expr, ast.IntegerLiteral): return (expr.value, expr.value)
+        if isinstance(expr, ast.NamespaceAccess):
+            value = getattr(expr, 'resolved_variant_value', None)
+            return (value, value) if isinstance(value, int) else None
+        if isinstance(expr, ast.CastExpr): return self.cast_range(expr, state)
+        if isinstance(expr, ast.Identifier): return self.var_range(expr, state)
+        if isinstance(expr, ast.FieldAccess) and expr.field.name == 'len':
+            obj_type = getattr(expr.obj, 'atom_type', None)
+            if isinstance(obj_type, ast.ArrayType):
+                size = self.const_size(obj_type.size)
+                return (size, size) if size is not None else None
+            return (0, None) if isinstance(obj_type, ast.SliceType) else None
+        if isinstance(expr, ast.BinaryOp): return self.binary_range(expr, state)
+        return None
+
+    def var_range(self, expr: ast.Identifier, state: FlowState) -> Optional[Interval]:
+        definition = self.def_of(expr)
+        if definition is None: return None
+        if isinstance(definition, ast.ConstDef): return self.range_of(definition.value, FlowState())
+        if isinstance(definition, (ast.LetBinding, ast.ForRangeStmt)) and id(definition) in self.let_ranges:
+            low, high = self.let_ranges[id(definition)]
+        else:
+            name = self.var_type(definition)
+            if name is None: return None
+            nonneg = name in UNSIGNED or id(definition) in self.nonneg
+            low, high = (0 if nonneg else None), None
+        for bound in state.bounds.get(id(definition), ()):
+            if isinstance(bound, int): high = bound - 1 if high is None else min(high, bound - 1)
+        return (low, high) if low is not None or high is not None else None
+
+    def cast_range(self, expr: ast.CastExpr, state: FlowState) -> Optional[Interval]:
+        inner = self.range_of(expr.expr, state)
+        target = type_name(expr.target_type)
+        if inner is None or type_limits(target) is None or inner[0] is None: return None
+        if fits(inner, target): return inner
+        # Máximo desconhecido: vale se todo valor >= 0 do tipo de origem cabe no destino
+        source_limits = type_limits(type_name(getattr(expr.expr, 'atom_type', None)))
+        if source_limits and inner[1] is None and inner[0] >= 0 and source_limits[1] <= type_limits(target)[1]:
+            return inner
+        return None
+
+    def binary_range(self, expr: ast.BinaryOp, state: FlowState) -> Optional[Interval]:
+        left = self.range_of(expr.left, state); right = self.range_of(expr.right, state)
+        if left is None or right is None: return None
+        (l_lo, l_hi), (r_lo, r_hi) = left, right
+        op = expr.op; result: Optional[Interval] = None
+        if op == '%' and r_lo is not None and r_lo > 0 and l_lo is not None and l_lo >= 0:
+            result = (0, r_hi - 1 if r_hi is not None else None)
+            if l_hi is not None and (result[1] is None or l_hi < result[1]): result = (0, l_hi)
+        elif op == '&' and ((l_lo is not None and l_lo >= 0 and l_hi is not None) or (r_lo is not None and r_lo >= 0 and r_hi is not None)):
+            highs = [h for lo, h in (left, right) if lo is not None and lo >= 0 and h is not None]
+            result = (0, min(highs))
+        elif op == '>>' and l_lo is not None and l_lo >= 0 and r_lo is not None and r_lo == r_hi and 0 <= r_lo < 64:
+            result = (l_lo >> r_lo, l_hi >> r_lo if l_hi is not None else None)
+        elif op == '/' and l_lo is not None and l_lo >= 0 and r_lo is not None and r_lo > 0:
+            result = (l_lo // r_hi if r_hi is not None else 0, l_hi // r_lo if l_hi is not None else None)
+        elif None in (l_lo, l_hi, r_lo, r_hi): return None
+        elif op == '+': result = (l_lo + r_lo, l_hi + r_hi)
+        elif op == '-': result = (l_lo - r_hi, l_hi - r_lo)
+        elif op == '*':
+            products = [a * b for a in (l_lo, l_hi) for b in (r_lo, r_hi)]
+            result = (min(products), max(products))
+        if result is None: return None
+        # Operações que podem estourar o tipo da expressão não provam nada
+        expr_type = type_name(getattr(expr, 'atom_type', None))
+        if op in ('+', '-', '*') and not fits(result, expr_type): return None
+        return result
+
+    # --- Fatos das condições ---
+    def bound_of(self, expr, state: FlowState) -> Optional[object]:
+        # Limite superior exclusivo dado por 'var < expr'
+        if isinstance(expr, ast.FieldAccess) and expr.field.name == 'len':
+            base = self.def_of(expr.obj)
+            if isinstance(getattr(expr.obj, 'atom_type', None), ast.SliceType) and base is not None and id(base) not in self.escaped:
+                return ('len', id(base))
+        alias = self.def_of(expr)
+        if alias is not None and id(alias) in state.len_aliases: return ('len', state.len_aliases[id(alias)])
+        interval = self.range_of(expr, state)
+        return interval[1] if interval and interval[1] is not None else None
+
+    def assume(self, cond, state: FlowState):
+        """Acrescenta a 'state' o que vale quando 'cond' é verdadeira."""
+        if not isinstance(cond, ast.BinaryOp): return
+        if cond.op == '&&': self.assume(cond.left, state); self.assume(cond.right, state); return
+        ops = {'<': ('<', False), '<=': ('<=', False), '>': ('<', True), '>=': ('<=', True)}
+        if cond.op not in ops: return
+        op, swapped = ops[cond.op]
+        var_expr, limit_expr = (cond.right, cond.left) if swapped else (cond.left, cond.right)
+        definition = self.def_of(var_expr)
+        if definition is None or id(definition) in self.escaped or self.var_type(definition) is None: return
+        bound = self.bound_of(limit_expr, state)
+        if bound is None: return
+        if op == '<=':
+            if not isinstance(bound, int): return # i <= s.len não prova i < s.len
+            bound += 1
+        state.add(id(definition), bound)
+
+    # --- Percurso ---
+    def assigned_in(self, nodes) -> Set[int]:
+        # Variáveis (ids das definições) atribuídas ou (re)declaradas em qualquer ponto de 'nodes'
+        assigned: Set[int] = set(); stack = list(nodes) if isinstance(nodes, list) else [nodes]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list): stack.extend(node); continue
+            if isinstance(node, (ast.LetBinding, ast.MutBinding, ast.ForRangeStmt, ast.ForSliceStmt)): assigned.add(id(node))
+            elif isinstance(node, ast.Assignment):
+                root = self.assigned_root(node.target)
+                if root is not None: assigned.add(id(root))
+            if isinstance(node, ast.Statement):
+                stack.extend(getattr(node, name) for name in node.__dataclass_fields__ if not isinstance(getattr(node, name), ast.Expression))
+        return assigned
+
+    def assigned_root(self, target) -> Optional[ast.Node]:
+        # x = ..., x.campo = ... mudam a própria variável; x[i] = ... muda só um elemento
+        while isinstance(target, ast.FieldAccess): target = target.obj
+        return self.def_of(target)
+
+    def collect_escaped(self, node):
+        stack = [node]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, list): stack.extend(item); continue
+            if not isinstance(item, ast.Node) or isinstance(item, ast.Type): continue
+            if isinstance(item, ast.UnaryOp) and item.op in ('&', '&mut'):
+                root = item.operand
+                while isinstance(root, (ast.FieldAccess, ast.IndexAccess)): root = root.obj if isinstance(root, ast.FieldAccess) else root.array
+                definition = self.def_of(root)
+                if definition is not None: self.escaped.add(id(definition))
+            stack.extend(getattr(item, name) for name in item.__dataclass_fields__)
+
+    def walk_block(self, statements, state: FlowState):
+        for statement in statements: self.walk_statement(statement, state)
+
+    def walk_statement(self, node, state: FlowState):
+        if isinstance(node, (ast.LetBinding, ast.MutBinding)):
+            self.visit_expr(node.value, state)
+            state.kill(id(node)) # Redeclaração dentro de um laço: nova instância
+            interval = self.range_of(node.value, state)
+            if isinstance(node, ast.LetBinding):
+                if interval is not None: self.let_ranges[id(node)] = interval
+                bound = self.bound_of(node.value, state) if isinstance(node.value, ast.FieldAccess) else None
+                if isinstance(bound, tuple): state.len_aliases[id(node)] = bound[1]
+            elif id(node) in self.nonneg and not self.keeps_nonneg(interval, node): self.failed.add(id(node))
+        elif isinstance(node, ast.Assignment):
+            self.visit_expr(node.target, state); self.visit_expr(node.value, state)
+            root = self.assigned_root(node.target)
+            if root is None: return
+            if root is self.def_of(node.target) and id(root) in self.nonneg and \
+               not self.keeps_nonneg(self.range_of(node.value, state), root): self.failed.add(id(root))
+            state.kill(id(root))
+        elif isinstance(node, ast.ExpressionStatement): self.visit_expr(node.expression, state)
+        elif isinstance(node, ast.ReturnStmt):
+            if node.value is not None: self.visit_expr(node.value, state)
+        elif isinstance(node, ast.IfStmt):
+            self.visit_expr(node.condition, state)
+            then_state = state.copy(); self.assume(node.condition, then_state)
+            self.walk_block(node.then_block, then_state)
+            if isinstance(node.else_block, ast.IfStmt): self.walk_statement(node.else_block, state.copy())
+            elif node.else_block: self.walk_block(node.else_block, state.copy())
+            for def_id in self.assigned_in([node.then_block, node.else_block or []]): state.kill(def_id)
+        elif isinstance(node, (ast.WhileStmt, ast.LoopStmt)):
+            # Os fatos na entrada precisam valer também na volta do laço
+            for def_id in self.assigned_in(node.body): state.kill(def_id)
+            body_state = state.copy()
+            if isinstance(node, ast.WhileStmt):
+                self.visit_expr(node.condition, state); self.assume(node.condition, body_state)
+            self.walk_block(node.body, body_state)
+        elif isinstance(node, ast.ForRangeStmt):
+            # Início e fim são avaliados uma vez, antes do laço: start <= var < fim na entrada
+            self.visit_expr([node.start, node.end], state)
+            start = self.range_of(node.start, state); end = self.range_of(node.end, state)
+            bound = self.bound_of(node.end, state)
+            assigned = self.assigned_in(node.body)
+            for def_id in assigned: state.kill(def_id)
+            body_state = state.copy(); body_state.kill(id(node))
+            low = start[0] if start else None
+            high = end[1] - 1 if end and end[1] is not None else None
+            if low is not None or high is not None: self.let_ranges[id(node)] = (low, high)
+            # Um slice reatribuído no corpo deixa 'var < s.len' sem valor (o fim é o s.len da entrada)
+            if bound is not None and not (isinstance(bound, tuple) and bound[1] in assigned): body_state.add(id(node), bound)
+            self.walk_block(node.body, body_state)
+        elif isinstance(node, ast.ForSliceStmt):
+            self.visit_expr(node.iterable, state)
+            for def_id in self.assigned_in(node.body): state.kill(def_id)
+            self.walk_block(node.body, state.copy())
+        elif isinstance(node, (ast.MemBlock, ast.EMemBlock)): self.walk_block(node.body, state)
+
+    def keeps_nonneg(self, interval: Optional[Interval], definition) -> bool:
+        # Novo valor >= 0 e dentro do tipo (um limite superior conhecido exclui overflow)
+        return fits(interval, self.var_type(definition)) and interval[0] >= 0
+
+    def visit_expr(self, expr, state: FlowState):
+        if isinstance(expr, list):
+            for item in expr: self.visit_expr(item, state)
+            return
+        if not isinstance(expr, ast.Node) or isinstance(expr, ast.Type): return
+        if isinstance(expr, ast.BinaryOp) and expr.op == '&&':
+            # O lado direito só roda se o esquerdo for verdadeiro: 'i < s.len && s[i] == 0'
+            self.visit_expr(expr.left, state)
+            right_state = state.copy(); self.assume(expr.left, right_state)
+            self.visit_expr(expr.right, right_state)
+            return
+        if isinstance(expr, ast.IndexAccess): self.decide(expr, state)
+        elif isinstance(expr, ast.BinaryOp) and expr.op in ('+', '-', '*'): self.no_wrap_decisions[id(expr)] = (expr, self.proves_no_wrap(expr, state))
+        for name in expr.__dataclass_fields__: self.visit_expr(getattr(expr, name), state)
+
+    def decide(self, node: ast.IndexAccess, state: FlowState):
+        base_type = getattr(node.array, 'atom_type', None)
+        if not isinstance(base_type, (ast.ArrayType, ast.SliceType)): return
+        proven = False
+        index_range = self.range_of(node.index, state)
+        if index_range is not None and index_range[0] is not None and index_range[0] >= 0:
+            if isinstance(base_type, ast.ArrayType):
+                size = self.const_size(base_type.size)
+                proven = size is not None and index_range[1] is not None and index_range[1] < size
+            else:
+                base = self.def_of(node.array)
+                index_var = node.index
+                while isinstance(index_var, ast.CastExpr) and self.cast_range(index_var, state) is not None: index_var = index_var.expr
+                index_def = self.def_of(index_var)
+                proven = base is not None and index_def is not None and ('len', id(base)) in state.bounds.get(id(index_def), ())
+        self.decisions[id(node)] = (node, proven)
+
+    def proves_no_wrap(self, expr: ast.BinaryOp, state: FlowState) -> bool:
+        # binary_range só devolve o intervalo de '+', '-', '*' quando ele cabe no tipo da expressão
+        if self.binary_range(expr, state) is not None: return True
+        # i + 1 com i < s.len: i + 1 <= s.len, que é um usize
+        if expr.op != '+' or type_name(getattr(expr, 'atom_type', None)) != 'usize': return False
+        for var_side, other in ((expr.left, expr.right), (expr.right, expr.left)):
+            definition = self.def_of(var_side)
+            if definition is not None and self.range_of(other, state) == (1, 1) and \
+               any(isinstance(bound, tuple) for bound in state.bounds.get(id(definition), ())): return True
+        return False
+
+    def analyze_function(self, func: ast.FunctionDef) -> Tuple[int, int]:
+        self.escaped = set(); self.collect_escaped(func.body)
+        candidates = set()
+        for node in self.iter_statements(func.body):
+            if isinstance(node, ast.MutBinding) and id(node) not in self.escaped:
+                limits = type_limits(self.var_type(node))
+                if limits and limits[0] < 0: candidates.add(id(node))
+        self.nonneg = candidates
+        while True:
+            self.failed = set(); self.let_ranges = {}; self.decisions = {}; self.no_wrap_decisions = {}
+            self.walk_block(func.body, FlowState())
+            if not self.failed: break
+            self.nonneg -= self.failed
+        for node, proven in self.decisions.values(): node.bounds_proven = proven
+        for node, proven in self.no_wrap_decisions.values(): node.arith_no_wrap = proven
+        self.no_wrap_proven += sum(1 for _, proven in self.no_wrap_decisions.values() if proven)
+        return len(self.decisions), sum(1 for _, proven in self.decisions.values() if proven)
+
+    def iter_statements(self, statements):
+        stack = list(statements)
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list): stack.extend(node); continue
+            if not isinstance(node, ast.Statement): continue
+            yield node
+            for name in node.__dataclass_fields__:
+                value = getattr(node, name)
+                if isinstance(value, (list, ast.Statement)): stack.append(value)
+
+@profiler.profiled("bounds")
+def analyze_bounds(program: ast.Program) -> BoundsReport:
+    """Marca os IndexAccess com índice provadamente válido (bounds_proven) e devolve a contagem por função."""
+    analyzer = BoundsAnalyzer(program); report = BoundsReport()
+    for item in program.body:
+        if isinstance(item, ast.FunctionDef):
+            sites, proven = analyzer.analyze_function(item)
+            report.per_function[item.name.name] = (sites, proven)
+            report.sites += sites; report.proven += proven
+    report.no_wrap = analyzer.no_wrap_proven
+    return report
+
+@dataclass
+class UncheckedSite:
+    function: str
+    text: str   # A indexação reconstruída da AST (os nós não guardam linha/coluna)
+    reason: str # 'unchecked func f', 'mem unchecked', 'e_mem unchecked' ou 'modo --unchecked'
+
+def expr_text(expr) -> str:
+    if isinstance(expr, ast.Identifier): return expr.name
+    if isinstance(expr, ast.IntegerLiteral): return str(expr.value)
+    if isinstance(expr, ast.FieldAccess): return f"{expr_text(expr.obj)}.{expr.field.name}"
+    if isinstance(expr, ast.IndexAccess): return f"{expr_text(expr.array)}[{expr_text(expr.index)}]"
+    if isinstance(expr, ast.BinaryOp): return f"({expr_text(expr.left)} {expr.op} {expr_text(expr.right)})"
+    if isinstance(expr, ast.UnaryOp): return f"{expr.op}{' ' if expr.op == '&mut' else ''}{expr_text(expr.operand)}"
+    if isinstance(expr, ast.CastExpr): return f"{expr_text(expr.expr)} as {type_name(expr.target_type) or '?'}"
+    if isinstance(expr, ast.FunctionCall): return f"{expr_text(expr.callee)}({', '.join(expr_text(a) for a in expr.args)})"
+    if isinstance(expr, ast.NamespaceAccess): return f"{expr.namespace.name}::{expr.item.name}"
+    return "..."
+
+def unchecked_index_sites(program: ast.Program, unchecked_indexing: bool = False) -> Tuple[List[UncheckedSite], int, int]:
+    """
+    Indexações de arrays/slices que o CodeGen gera sem bounds check e sem prova (mesmo critério de
+    visit_lvalue_pointer), em ordem de fonte. Devolve (sites, provadas, com check). Requer a árvore
+    anotada por analyze_semantics.
+    """
+    sites: List[UncheckedSite] = []; proven = checked = 0
+    for func in program.body:
+        if not isinstance(func, ast.FunctionDef): continue
+        stack = [func.body]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list): stack.extend(reversed(node)); continue
+            if not isinstance(node, ast.Node) or isinstance(node, ast.Type): continue
+            if isinstance(node, ast.IndexAccess) and isinstance(getattr(node.array, 'atom_type', None), (ast.ArrayType, ast.SliceType)):
+                reason = getattr(node, 'bounds_unchecked', None) or ("modo --unchecked" if unchecked_indexing else None)
+                if getattr(node, 'bounds_proven', False): proven += 1
+                elif reason: sites.append(UncheckedSite(func.name.name, expr_text(node), reason))
+                else: checked += 1
+            stack.extend(reversed([getattr(node, name) for name in node.__dataclass_fields__]))
+    return sites, proven, checked
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Lista as indexações de arrays/slices compiladas sem bounds check.")
+    arg_parser.add_argument("sources", nargs="+")
+    arg_parser.add_argument("--unchecked", action="store_true", help="Considera o modo de build sem bounds checks")
+    ns = arg_parser.parse_args()
+    from diagnostics import configure_logging
+    from module_loader import ModuleLoader
+    from semantic_analyzer import analyze_semantics
+    configure_logging()
+    loader = ModuleLoader(); failed = False
+    for source_path in ns.sources:
+        program = loader.load_program(source_path)
+        errors = analyze_semantics(program)
+        if errors: print(f"{source_path}: {len(errors)} erros semânticos: {errors[0]}"); failed = True; continue
+        sites, proven, checked = unchecked_index_sites(program, ns.unchecked)
+        print(f"{source_path}: {proven + checked + len(sites)} indexações; {proven} provadas, {checked} com check, {len(sites)} sem check")
+        for site in sites: print(f"  {site.function}: {site.text}  ({site.reason})")
+    if failed: sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+# build_standalone_parser.py - Gera atom_parser_standalone.py a partir de atom_v02_grammar
+#
+# Uso: python build_standalone_parser.py [-o atom_parser_standalone.py] [--compress]
+#
+# O módulo gerado (via lark.tools.standalone) contém as tabelas LALR já calculadas e o
+# runtime mínimo do Lark. parser_lark.py o usa automaticamente quando presente e
+# quando o hash da gramática gravado nele bate com a gramática atual.
+import os
+import sys
+import argparse
+import py_compile
+
+os.environ["ATOM_NO_STANDALONE_PARSER"] = "1" # Garante que o parser_lark use o Lark de verdade
+from lark import Lark
+from lark.tools.standalone import gen_standalone
+
+import parser_lark
+
+def build_standalone_parser(out_path: str, compress: bool = False):
+    lark_inst = Lark(parser_lark.atom_v02_grammar, start='program', parser='lalr', propagate_positions=True)
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf8") as f:
+        gen_standalone(lark_inst, out=f, compress=compress)
+        f.write(f'\nATOM_GRAMMAR_SHA256 = "{parser_lark.ATOM_GRAMMAR_SHA256}"\n')
+    os.replace(tmp_path, out_path) # Nunca deixa um módulo pela metade no lugar
+    py_compile.compile(out_path, doraise=True) # Já deixa o .pyc pronto: compilar ~400 KB de tabelas custa mais que carregá-las
+    return out_path
+
+if __name__ == '__main__':
+    here = os.path.dirname(os.path.abspath(__file__))
+    arg_parser = argparse.ArgumentParser(description="Gera o parser standalone da gramática Atom v0.2.")
+    arg_parser.add_argument("-o", "--out", default=os.path.join(here, "atom_parser_standalone.py"))
+    arg_parser.add_argument("-c", "--compress", action="store_true", help="Comprime as tabelas (arquivo menor, carga um pouco mais lenta)")
+    ns = arg_parser.parse_args()
+    path = build_standalone_parser(ns.out, ns.compress)
+    print(f"Parser standalone salvo em {path}")
@@ -1,51 +1,140 @@
 # -*- coding: utf-8 -*-
 
+import os
+import sys
+import ctypes
+import subprocess
+from types import MappingProxyType
 import llvmlite.ir as ir
 import llvmlite.binding as llvm # llvm é o módulo binding
-from typing import Dict, List, Optional, Union, Tuple, Set
-import traceback # Para debug
+from typing import Callable, Dict, List, Optional, Union, Tuple, Set
 
 import ast_nodes as ast
-
-_global_string_counter = 0
-_global_byte_array_counter = 0
-
-def create_global_string_constant(module: ir.Module, value: str, name_prefix: str = ".str") -> ir.Value:
-    global _global_string_counter
-    unique_name = f"{name_prefix}.{_global_string_counter}"
-    _global_string_counter += 1
-    value_bytes = value.encode('utf8') + b'\x00'
-    const_data = ir.Constant(ir.ArrayType(ir.IntType(8), len(value_bytes)), bytearray(value_bytes))
-    global_var = ir.GlobalVariable(module, const_data.type, name=unique_name)
-    global_var.linkage = "private"
-    global_var.global_constant = True
-    global_var.initializer = const_data
-    global_var.unnamed_addr = True
-    zero = ir.Constant(ir.IntType(32), 0)
-    return global_var.gep([zero, zero])
-
-def create_global_byte_array_constant(module: ir.Module, value_bytes: bytes, name_prefix: str = ".bstr") -> ir.GlobalVariable:
-    global _global_byte_array_counter
-    unique_name = f"{name_prefix}.{_global_byte_array_counter}"
-    _global_byte_array_counter += 1
-    byte_array_type = ir.ArrayType(ir.IntType(8), len(value_bytes))
-    const_data = ir.Constant(byte_array_type, bytearray(value_bytes))
-    global_var = ir.GlobalVariable(module, const_data.type, name=unique_name)
-    global_var.linkage = "private"
-    global_var.global_constant = True
-    global_var.initializer = const_data
-    global_var.unnamed_addr = True
-    return global_var
+import profiler
+from diagnostics import DiagnosticEngine, Severity, get_logger
+
+RUNTIME_OBJECT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "runtime.o") # runtime.c pré-compilado
+_libc: Optional[ctypes.CDLL] = None # Símbolos do processo hospedeiro (fflush para o stdio do código JIT), carregados no primeiro run_jit
+JIT_RESULT_TYPES = {'void': None, 'i1': ctypes.c_bool, 'i8': ctypes.c_int8, 'i16': ctypes.c_int16, 'i32': ctypes.c_int32, 'i64': ctypes.c_int64}
+
+log = get_logger("codegen")
+
+class LiteralPool:
+    """
+    Pool de literais constantes de um módulo. Conteúdos iguais compartilham um único global privado,
+    e uma string C que é sufixo de outra (incluindo o \\0) vira um ponteiro para dentro da maior
+    (plan_strings precisa ver as strings antes do primeiro uso). Os contadores de nomes são do pool,
+    então compilar o mesmo programa duas vezes no mesmo processo gera o mesmo IR.
+    """
+    def __init__(self, module: ir.Module):
+        self.module = module
+        self.string_counter = 0; self.byte_array_counter = 0
+        self.string_globals: Dict[bytes, ir.GlobalVariable] = {} # conteúdo (com \0) -> global
+        self.byte_array_globals: Dict[bytes, ir.GlobalVariable] = {}
+        self.string_hosts: Dict[bytes, Tuple[bytes, int]] = {} # conteúdo -> (conteúdo do global que o contém, deslocamento)
+        self.requests = 0 # Literais pedidos (usos); cada global novo só é criado na primeira vez
+
+    def plan_strings(self, values: List[str]):
+        # Tail merging: ordenando os conteúdos invertidos, s é sufixo de alguma string sse é sufixo da seguinte
+        reversed_contents = sorted({(value.encode('utf8') + b'\x00')[::-1] for value in values})
+        host = None
+        for i in range(len(reversed_contents) - 1, -1, -1):
+            current = reversed_contents[i]
+            if host is None or not reversed_contents[i + 1].startswith(current): host = current
+            self.string_hosts[current[::-1]] = (host[::-1], len(host) - len(current))
+
+    def new_global(self, prefix: str, data: bytes) -> ir.GlobalVariable:
+        if prefix == ".str": name = f"{prefix}.{self.string_counter}"; self.string_counter += 1
+        else: name = f"{prefix}.{self.byte_array_counter}"; self.byte_array_counter += 1
+        const_data = ir.Constant(ir.ArrayType(ir.IntType(8), len(data)), bytearray(data))
+        global_var = ir.GlobalVariable(self.module, const_data.type, name=name)
+        global_var.linkage = "private"
+        global_var.global_constant = True
+        global_var.initializer = const_data
+        global_var.unnamed_addr = True
+        return global_var
+
+    def string_pointer(self, value: str) -> ir.Value:
+        """Ponteiro i8* constante para a string C 'value' (terminada em \\0)."""
+        self.requests += 1
+        data = value.encode('utf8') + b'\x00'
+        host, offset = self.string_hosts.get(data, (data, 0))
+        global_var = self.string_globals.get(host)
+        if global_var is None: global_var = self.string_globals[host] = self.new_global(".str", host)
+        return global_var.gep([ir.Constant(ir.IntType(32), 0), ir.Constant(ir.IntType(32), offset)])
+
+    def byte_array(self, value_bytes: bytes) -> ir.GlobalVariable:
+        """Global [N x i8] com os bytes exatos (sem \\0; o tamanho vai no slice)."""
+        self.requests += 1
+        global_var = self.byte_array_globals.get(value_bytes)
+        if global_var is None: global_var = self.byte_array_globals[value_bytes] = self.new_global(".bstr", value_bytes)
+        return global_var
+
+# Presets de otimização -> size_level do PassManagerBuilder (equivalem a -O<n>, -Os e -Oz)
+OPT_PRESETS: Dict[str, int] = {'speed': 0, 'size': 1, 'min-size': 2}
+
+# Política de overflow de inteiros ('+', '-', '*', '-x', e '/', '%' em MIN / -1):
+#   - tipos sem sinal (u8..u64, uint, usize) são aritmética módulo 2^N: o overflow é definido e nunca é erro;
+#   - em tipos com sinal (i8..i64, int, isize) o overflow é um erro do programa. O modo decide o que o build faz com ele:
+#     'wrap'    (padrão)  define o resultado como complemento de dois, sem flags;
+#     'checked' (debug)   aborta com atom_panic_integer_overflow;
+#     'assume'  (opt-in)  supõe que não acontece: add/sub/mul com nsw (o LLVM simplifica induções e endereços),
+#                         e um overflow vira comportamento indefinido.
+# Em qualquer modo, operações que o bounds_analysis prova sem overflow (arith_no_wrap) ganham nsw/nuw e não têm check.
+OVERFLOW_MODES = ('wrap', 'checked', 'assume')
+SIGNED_INTEGER_TYPES = {'i8', 'i16', 'i32', 'i64', 'int', 'isize'}
+UNSIGNED_INTEGER_TYPES = {'u8', 'u16', 'u32', 'u64', 'uint', 'usize', 'char'}
+
+def parse_opt_level(text: str) -> Tuple[int, str]:
+    # Aceita "0".."3", "s", "z" (com ou sem o prefixo "O"/"-O") -> (opt_level, opt_preset)
+    level = text.strip().lstrip('-').lstrip('O')
+    if level == 's': return 2, 'size'
+    if level == 'z': return 2, 'min-size'
+    if level in ('0', '1', '2', '3'): return int(level), 'speed'
+    raise ValueError(f"Nível de otimização inválido: '{text}' (use 0-3, s ou z)")
+
+# Atributos de parâmetro que o LLVM aceita desde a versão indicada mas que a lista do llvmlite pode não trazer
+# (a do 0.41 copia a LangRef 14 sem readonly, que lá também é atributo de parâmetro).
+EXTRA_PARAM_ATTRIBUTES: Dict[str, Tuple[int, ...]] = {'readonly': (3, 0)}
+
+class AtomArgumentAttributes(ir.values.ArgumentAttributes):
+    """ArgumentAttributes do llvmlite com os EXTRA_PARAM_ATTRIBUTES que o LLVM em uso aceita (emitidos só pelo nome)."""
+    _known = MappingProxyType({**{name: False for name, version in EXTRA_PARAM_ATTRIBUTES.items() if llvm.llvm_version_info >= version},
+                               **ir.values.ArgumentAttributes._known})
+
+def add_param_attribute(arg: ir.Argument, name: str):
+    """arg.add_attribute(name), trocando o conjunto de atributos por AtomArgumentAttributes quando o llvmlite não conhece o nome."""
+    if name not in arg.attributes._known and not isinstance(arg.attributes, AtomArgumentAttributes):
+        attributes = AtomArgumentAttributes(arg.attributes)
+        attributes.align = arg.attributes.align
+        attributes.dereferenceable = arg.attributes.dereferenceable
+        attributes.dereferenceable_or_null = arg.attributes.dereferenceable_or_null
+        arg.attributes = attributes
+    arg.add_attribute(name) # ValueError se nem o LLVM em uso aceitar
 
 class CodeGenVisitor:
-    def __init__(self):
+    def __init__(self, opt_level: int = 0, opt_preset: str = 'speed', unchecked_indexing: bool = False, overflow_mode: str = 'wrap',
+                 prove_bounds: bool = True):
+        # unchecked_indexing: nenhuma indexação de array/slice ganha bounds check (como 'unchecked func' em todo o módulo)
+        # overflow_mode: o que fazer com overflow de inteiros com sinal (veja OVERFLOW_MODES)
+        # prove_bounds: usa as provas do bounds_analysis (bounds_proven, arith_no_wrap); False ignora as anotações
+        if opt_level not in (0, 1, 2, 3): raise ValueError(f"opt_level inválido: {opt_level} (use 0-3)")
+        if opt_preset not in OPT_PRESETS: raise ValueError(f"opt_preset inválido: '{opt_preset}' (use {', '.join(OPT_PRESETS)})")
+        if overflow_mode not in OVERFLOW_MODES: raise ValueError(f"overflow_mode inválido: '{overflow_mode}' (use {', '.join(OVERFLOW_MODES)})")
+        self.size_level = OPT_PRESETS[opt_preset]
+        # Como no clang, -Os/-Oz partem do pipeline de -O2
+        self.opt_level = 2 if self.size_level and opt_level == 0 else opt_level
+        self.diagnostics = DiagnosticEngine({Severity.ERROR: "Erro CodeGen", Severity.WARNING: "Aviso CodeGen"}, log)
+
         llvm.initialize()
         llvm.initialize_all_targets()
         llvm.initialize_all_asmprinters()
 
         self.target = llvm.Target.from_default_triple()
         # Configurar a máquina de destino ANTES de tentar obter dados dela
-        self.target_machine = self.target.create_target_machine() 
+        # reloc='pic': objetos emitidos aqui ligam como PIE (equivalente ao antigo clang -fPIE).
+        # codemodel='default' é o do llc/clang para código AOT (o padrão do llvmlite, 'jitdefault', é pensado para JIT).
+        self.target_machine = self.target.create_target_machine(opt=self.opt_level, reloc='pic', codemodel='default')
         
         # Obter data_layout e triple da máquina de destino
         try:
@@ -54,11 +143,11 @@ class CodeGenVisitor:
             data_layout_string = str(target_data_obj) # Converte para string para o módulo IR
             # print(f"DEBUG CodeGen Init: Data layout string obtido: {data_layout_string}")
         except Exception as e_tm_td:
-             print(f"ERROR CodeGen Init: Falha ao obter TargetData da TargetMachine: {e_tm_td}")
-             print("                     Usando fallback para data layout vazio.")
+             log.error("Falha ao obter TargetData da TargetMachine: %s. Usando fallback para data layout vazio.", e_tm_td)
              target_data_obj = None # Marcar que não temos o objeto
              data_layout_string = "" # Fallback para string vazia
 
+        self.target_data = target_data_obj # Usado para tamanhos ABI (memset de arrays)
         self.module = ir.Module(name="atom_module")
         self.module.data_layout = data_layout_string
         self.module.triple = self.target.triple
@@ -75,7 +164,7 @@ class CodeGenVisitor:
                 # print(f"DEBUG CodeGen Init: Pointer size (TargetMachine.target_data.get_pointer_size_in_bits()): {ptr_bit_width} bits.")
             except AttributeError:
                 # Se get_pointer_size_in_bits não existir, tenta get_pointer_size() (sem arg)
-                print(f"WARN CodeGen Init: Falha com get_pointer_size_in_bits(). Tentando get_pointer_size()...")
+                log.warning("Falha com get_pointer_size_in_bits(). Tentando get_pointer_size()...")
                 try:
                     ptr_byte_size = target_data_obj.get_pointer_size() # Tenta sem argumento
                     ptr_bit_width = ptr_byte_size * 8
@@ -83,18 +172,18 @@ class CodeGenVisitor:
                     # print(f"DEBUG CodeGen Init: Pointer size (TargetMachine.target_data.get_pointer_size()): {ptr_byte_size} bytes ({ptr_bit_width} bits).")
                 except Exception as e_get_ptr_size:
                     # Se ambos falharem, usa o fallback hardcoded
-                    print(f"WARN CodeGen Init: Falha ao usar get_pointer_size() (erro: {e_get_ptr_size}). Usando fallback hardcoded para {ptr_bit_width} bits.")
+                    log.warning("Falha ao usar get_pointer_size() (erro: %s). Usando fallback hardcoded para %d bits.", e_get_ptr_size, ptr_bit_width)
                     determined_int_ptr_type = ir.IntType(ptr_bit_width) # Garante que está definido com o fallback
             except Exception as e_other_td:
                  # Outro erro inesperado com o objeto TargetData
-                 print(f"WARN CodeGen Init: Erro inesperado ao usar TargetData ({type(target_data_obj).__name__}): {e_other_td}. Usando fallback hardcoded para {ptr_bit_width} bits.")
+                 log.warning("Erro inesperado ao usar TargetData (%s): %s. Usando fallback hardcoded para %d bits.", type(target_data_obj).__name__, e_other_td, ptr_bit_width)
                  determined_int_ptr_type = ir.IntType(ptr_bit_width) # Garante que está definido com o fallback
 
         else: # Se não conseguimos o target_data_obj da TargetMachine
-            print(f"ERROR CodeGen Init: Não foi possível obter TargetData da TargetMachine. Usando fallback hardcoded para {ptr_bit_width} bits para ponteiro.")
+            log.error("Não foi possível obter TargetData da TargetMachine. Usando fallback hardcoded para %d bits para ponteiro.", ptr_bit_width)
             determined_int_ptr_type = ir.IntType(ptr_bit_width) # Garante que está definido com o fallback
         
-        print(f"INFO CodeGen Init: Tipo de ponteiro inteiro determinado como: {determined_int_ptr_type}")
+        log.info("Tipo de ponteiro inteiro determinado como: %s", determined_int_ptr_type)
 
         # Define self.llvm_types usando o tipo determinado
         self.llvm_types = {
@@ -119,15 +208,19 @@ class CodeGenVisitor:
             try:
                 # Declaração usando o usize_type determinado
                 panic_func_ty = ir.FunctionType(ir.VoidType(), [usize_type, usize_type], var_arg=False)
-                ir.Function(self.module, panic_func_ty, name="atom_panic_bounds_check")
+                panic_func = ir.Function(self.module, panic_func_ty, name="atom_panic_bounds_check")
+                panic_func.attributes.add('noreturn'); panic_func.attributes.add('cold'); panic_func.attributes.add('nounwind')
 
                 check_func_ty = ir.FunctionType(ir.VoidType(), [usize_type, usize_type], var_arg=False)
                 ir.Function(self.module, check_func_ty, name="atom_do_bounds_check")
+                if overflow_mode == 'checked': # Só declarada quando usada: os outros modos não dependem do runtime novo
+                    overflow_func = ir.Function(self.module, ir.FunctionType(ir.VoidType(), [ir.IntType(32)]), name="atom_panic_integer_overflow")
+                    overflow_func.attributes.add('noreturn'); overflow_func.attributes.add('cold'); overflow_func.attributes.add('nounwind')
                 # print("DEBUG CodeGen Init: Funções de runtime pré-declaradas.")
             except Exception as e_predecl:
-                print(f"WARN CodeGen Init: Falha ao pré-declarar funções de runtime: {e_predecl}")
+                log.warning("Falha ao pré-declarar funções de runtime: %s", e_predecl)
         else:
-             print(f"WARN CodeGen Init: Tipo usize não determinado ou inválido ({usize_type}), não foi possível pré-declarar funções de runtime.")
+             log.warning("Tipo usize não determinado ou inválido (%s), não foi possível pré-declarar funções de runtime.", usize_type)
         # --- Fim Pré-declaração ---
 
         # --- Inicializações dos outros membros ---
@@ -139,6 +232,23 @@ class CodeGenVisitor:
         self.atom_enum_defs: Dict[str, ast.EnumDef] = {}     # Cache das definições AST
         self.llvm_global_constants: Dict[str, Tuple[ir.GlobalVariable, ast.Expression]] = {} # Mapeia nome -> (GlobalVar, Nó AST do valor)
         self.loop_context_stack: List[Tuple[ir.Block, ir.Block]] = [] # Pilha para break/continue (cond/header, end)
+        self.function_signatures: List[Tuple[ir.Function, Union[ast.FunctionDef, ast.FunctionDecl]]] = [] # Declaradas na Passagem 1 (atributos na 2)
+        self.value_symbols: Set[int] = set() # id() dos valores SSA ligados direto a um nome (variáveis de 'for'), sem alloca
+        self._visit_dispatch: Dict[type, Tuple[Callable, bool, str]] = {} # Classe do nó -> (visitor, aceita expected_llvm_type, nome)
+        self.last_entry_alloca: Optional[ir.AllocaInstr] = None # Último alloca do bloco de entrada da função atual
+        self.bounds_panic: Optional[Tuple[ir.Block, ir.PhiInstr, ir.PhiInstr]] = None # Bloco de pânico compartilhado da função atual (bloco, phi índice, phi tamanho)
+        self.bounds_checks_emitted = 0 # Indexações com check gerado
+        self.bounds_checks_elided = 0  # Indexações sem check: provadas pelo bounds_analysis ou índice constante
+        self.unchecked_indexing = unchecked_indexing
+        self.bounds_checks_unchecked = 0 # Indexações sem check por opção (unchecked_indexing, 'unchecked func', 'mem unchecked')
+        self.overflow_mode = overflow_mode
+        self.prove_bounds = prove_bounds
+        self.overflow_panic: Optional[Tuple[ir.Block, ir.PhiInstr]] = None # Bloco de pânico de overflow da função atual (bloco, phi operador)
+        self.overflow_checks_emitted = 0 # Operações com sinal checadas (modo 'checked')
+        self.no_wrap_ops = 0 # add/sub/mul emitidos com nsw ou nuw
+        self.llvm_type_cache: Dict[int, Tuple[ast.Type, ir.Type]] = {} # id(nó de tipo Atom) -> (nó, tipo LLVM)
+        self.llvm_type_table: Dict[tuple, ir.Type] = {} # Tipos LLVM internados (intern_llvm_type)
+        self.literal_pool = LiteralPool(self.module) # Globais de strings/byte strings, deduplicados
         # --- Fim das inicializações ---
 
     def type_to_string(self, type_node: Optional[Union[ast.Type, ir.Type]]) -> str:
@@ -163,22 +273,55 @@ class CodeGenVisitor:
              return llvm_type in known_signed_llvm_types
         return False
 
+    def is_signed_atom_type(self, atom_type: Optional[ast.Type]) -> Optional[bool]:
+        # Sinal pelo tipo Atom (i32 e u32 são o mesmo i32 no LLVM); None para literais e tipos não inteiros
+        if isinstance(atom_type, ast.PrimitiveType):
+            if atom_type.name in SIGNED_INTEGER_TYPES: return True
+            if atom_type.name in UNSIGNED_INTEGER_TYPES: return False
+        elif isinstance(atom_type, ast.CustomType) and atom_type.name.name in self.atom_enum_defs: return True # Enum: i32
+        return None
+
+    def binary_op_is_signed(self, node: ast.BinaryOp) -> bool:
+        # Um literal assume o tipo do outro operando ('0 > x', '10 / x'); dois literais usam o tipo padrão do literal
+        for operand in (node.left, node.right):
+            is_signed = self.is_signed_atom_type(getattr(operand, 'atom_type', None))
+            if is_signed is not None: return is_signed
+        literal_type = getattr(node.left, 'atom_type', None)
+        if isinstance(literal_type, ast.LiteralIntegerType): return literal_type.default_type_name in SIGNED_INTEGER_TYPES
+        return self.is_signed_type_heuristic(literal_type, None)
+
     def get_llvm_type(self, atom_type: Optional[ast.Type]) -> Optional[ir.Type]:
         if atom_type is None: return None
         if isinstance(atom_type, ast.PrimitiveType):
             llvm_t = self.llvm_types.get(atom_type.name)
             if llvm_t is None: self.add_error(f"Tipo LLVM desconhecido para primitivo Atom '{atom_type.name}'.", atom_type)
             return llvm_t
+        # Memoizado por nó de tipo (a entrada guarda o nó, então o id() não é reutilizado); falhas não entram no cache.
+        # Nós de tipo equivalentes compartilham a entrada do tipo internado pelo SemanticAnalyzer (canonical_type).
+        atom_type = getattr(atom_type, 'canonical_type', atom_type)
+        entry = self.llvm_type_cache.get(id(atom_type))
+        if entry is not None: return entry[1]
+        llvm_type = self.lower_llvm_type(atom_type)
+        if llvm_type is not None: self.llvm_type_cache[id(atom_type)] = (atom_type, llvm_type)
+        return llvm_type
+
+    def intern_llvm_type(self, key: tuple, make: Callable[[], ir.Type]) -> ir.Type:
+        # Cada tipo LLVM distinto é construído uma vez por módulo (chave usa id() dos tipos filhos já internados)
+        llvm_type = self.llvm_type_table.get(key)
+        if llvm_type is None: llvm_type = self.llvm_type_table[key] = make()
+        return llvm_type
+
+    def lower_llvm_type(self, atom_type: ast.Type) -> Optional[ir.Type]:
         if isinstance(atom_type, ast.UnitType):
             return self.llvm_types['unit']
         if isinstance(atom_type, ast.PointerType):
             pointee_llvm_type = self.get_llvm_type(atom_type.pointee_type)
             if pointee_llvm_type is None: self.add_error(f"Falha obter tipo pointee para {atom_type!r}", atom_type.pointee_type); return None
-            return ir.PointerType(pointee_llvm_type)
+            return self.intern_llvm_type(('ptr', id(pointee_llvm_type)), lambda: ir.PointerType(pointee_llvm_type))
         if isinstance(atom_type, ast.ReferenceType):
             referenced_llvm_type = self.get_llvm_type(atom_type.referenced_type)
             if referenced_llvm_type is None: self.add_error(f"Falha obter tipo referenced para {atom_type!r}", atom_type.referenced_type); return None
-            return ir.PointerType(referenced_llvm_type)
+            return self.intern_llvm_type(('ptr', id(referenced_llvm_type)), lambda: ir.PointerType(referenced_llvm_type))
         if isinstance(atom_type, ast.ArrayType):
             element_llvm_type = self.get_llvm_type(atom_type.element_type)
             if element_llvm_type is None: self.add_error(f"Falha obter tipo elemento array {atom_type!r}", atom_type.element_type); return None
@@ -193,26 +336,12 @@ class CodeGenVisitor:
                      self.add_error(f"Tamanho de array não constante/avaliável: {atom_type.size!r}", atom_type.size)
                      return None
             if array_size is not None and array_size >= 0:
-                return ir.ArrayType(element_llvm_type, array_size)
+                return self.intern_llvm_type(('array', id(element_llvm_type), array_size), lambda: ir.ArrayType(element_llvm_type, array_size))
             else: self.add_error(f"Tamanho inválido para array {atom_type!r}", atom_type.size); return None
         if isinstance(atom_type, ast.SliceType):
             element_llvm_type = self.get_llvm_type(atom_type.element_type)
             if element_llvm_type is None: self.add_error(f"Falha obter tipo elemento slice {atom_type!r}", atom_type.element_type); return None
-            ptr_type = ir.PointerType(element_llvm_type)
-            len_type = self.llvm_types['usize']
-            element_type_str_for_name = str(element_llvm_type)
-            for char_to_replace in ['%', '*', '[', ']', ';', ',']: element_type_str_for_name = element_type_str_for_name.replace(char_to_replace, "")
-            element_type_str_for_name = element_type_str_for_name.replace(" ", "_")
-            slice_struct_name = f"Slice.{element_type_str_for_name}"
-            if slice_struct_name in self.module.context.identified_types:
-                 slice_llvm_type = self.module.context.identified_types[slice_struct_name]
-                 if slice_llvm_type.is_opaque: slice_llvm_type.set_body(ptr_type, len_type)
-                 elif tuple(slice_llvm_type.elements) != (ptr_type, len_type): return ir.LiteralStructType([ptr_type, len_type])
-                 return slice_llvm_type
-            else:
-                 slice_llvm_type = self.module.context.get_identified_type(slice_struct_name)
-                 slice_llvm_type.set_body(ptr_type, len_type)
-                 return slice_llvm_type
+            return self.intern_llvm_type(('slice', id(element_llvm_type)), lambda: self.make_slice_llvm_type(element_llvm_type))
         if isinstance(atom_type, ast.CustomType):
             type_name = atom_type.name.name
             if type_name in self.llvm_defined_structs: return self.llvm_defined_structs[type_name]
@@ -229,11 +358,29 @@ class CodeGenVisitor:
                 llvm_p_type = self.get_llvm_type(p_type)
                 if llvm_p_type is None: self.add_error(f"Falha obter tipo LLVM param {i} para FunctionType.", p_type); return None
                 llvm_param_types.append(llvm_p_type)
-            llvm_func_type = ir.FunctionType(llvm_ret_type, llvm_param_types, var_arg=atom_type.is_var_arg)
-            return ir.PointerType(llvm_func_type)
+            key = ('func', id(llvm_ret_type), tuple(id(t) for t in llvm_param_types), atom_type.is_var_arg)
+            return self.intern_llvm_type(key, lambda: ir.PointerType(ir.FunctionType(llvm_ret_type, llvm_param_types, var_arg=atom_type.is_var_arg)))
         self.add_error(f"Tipo Atom não suportado em get_llvm_type: {type(atom_type)}", atom_type)
         return None
 
+    def make_slice_llvm_type(self, element_llvm_type: ir.Type) -> ir.Type:
+        # Struct nomeado Slice.<elemento> { T*, usize }; o nome só é montado uma vez por tipo de elemento
+        ptr_type = ir.PointerType(element_llvm_type)
+        len_type = self.llvm_types['usize']
+        element_type_str_for_name = str(element_llvm_type)
+        for char_to_replace in ['%', '*', '[', ']', ';', ',']: element_type_str_for_name = element_type_str_for_name.replace(char_to_replace, "")
+        element_type_str_for_name = element_type_str_for_name.replace(" ", "_")
+        slice_struct_name = f"Slice.{element_type_str_for_name}"
+        if slice_struct_name in self.module.context.identified_types:
+             slice_llvm_type = self.module.context.identified_types[slice_struct_name]
+             if slice_llvm_type.is_opaque: slice_llvm_type.set_body(ptr_type, len_type)
+             elif tuple(slice_llvm_type.elements) != (ptr_type, len_type): return ir.LiteralStructType([ptr_type, len_type])
+             return slice_llvm_type
+        else:
+             slice_llvm_type = self.module.context.get_identified_type(slice_struct_name)
+             slice_llvm_type.set_body(ptr_type, len_type)
+             return slice_llvm_type
+
     def get_concrete_type(self, type_node: Optional[Union[ast.Type, ir.Type]]) -> Optional[ir.Type]:
         if isinstance(type_node, ast.LiteralIntegerType):
             llvm_prim_type = self.llvm_types.get(type_node.default_type_name)
@@ -246,11 +393,11 @@ class CodeGenVisitor:
     def enter_scope(self): self.llvm_symbol_table.append({})
     def exit_scope(self):
         if len(self.llvm_symbol_table) > 1: self.llvm_symbol_table.pop()
-        else: print("WARN Scope: Attempt to exit global scope!")
+        else: log.warning("Scope: tentativa de sair do escopo global!")
 
     def declare_var(self, name: str, llvm_value: ir.Value):
         if not isinstance(llvm_value.type, ir.PointerType):
-             print(f"WARN Scope: Tentando declarar valor não-ponteiro '{name}' (tipo: {llvm_value.type}) na tabela LLVM.")
+             log.warning("Scope: tentando declarar valor não-ponteiro '%s' (tipo: %s) na tabela LLVM.", name, llvm_value.type)
         self.llvm_symbol_table[-1][name] = llvm_value
 
     def lookup_var(self, name: str) -> Optional[ir.Value]:
@@ -258,11 +405,18 @@ class CodeGenVisitor:
             if name in scope: return scope[name]
         return None
 
+    @property
+    def errors(self) -> List[str]:
+        return self.diagnostics.messages(Severity.ERROR)
+
     def add_error(self, message: str, node: Optional[ast.Node] = None):
-        pos_info = "";detail = ""
-        if node and hasattr(node, 'meta') and hasattr(node.meta, 'line'):
-             pos_info = f" (linha {node.meta.line}, col {getattr(node.meta, 'column', '?')})"
-        print(f"CODEGEN ERROR:{pos_info} {message}{detail}")
+        self.diagnostics.error(message, node=node) # Em self.diagnostics; no console só com ATOM_LOG ligado
+
+    def check_errors(self):
+        # Chamado pelos drivers após generate_code: IR com erros de CodeGen não vira objeto nem entra no cache
+        if self.diagnostics.has_errors():
+            errors = self.errors
+            raise ValueError(f"{len(errors)} erros de CodeGen: {errors[0]}")
 
     # Helper para inferir sinal de constantes (similar ao de runtime)
     def is_signed_constant_heuristic(self, const_val: ir.Constant, 
@@ -331,7 +485,7 @@ class CodeGenVisitor:
             
             elif isinstance(node, ast.StringLiteral): 
                 # Ponteiro para string global é constante
-                result = create_global_string_constant(self.module, node.value)
+                result = self.literal_pool.string_pointer(node.value)
                 # Se o tipo esperado for diferente (e.g., outro tipo de ponteiro), faz bitcast constante
                 if expected_llvm_type and result.type != expected_llvm_type:
                      if isinstance(expected_llvm_type, ir.PointerType):
@@ -360,7 +514,7 @@ class CodeGenVisitor:
                 if not isinstance(actual_bytes, bytes): 
                     self.add_error("Valor de ByteStringLiteral não é bytes.", node); return None
                 
-                global_byte_array_var = create_global_byte_array_constant(self.module, actual_bytes)
+                global_byte_array_var = self.literal_pool.byte_array(actual_bytes)
                 zero_i32 = ir.Constant(ir.IntType(32), 0)
                 # GEP constante para obter o ponteiro para o primeiro byte
                 ptr_to_first_byte_const = global_byte_array_var.gep([zero_i32, zero_i32]) 
@@ -727,6 +881,10 @@ class CodeGenVisitor:
                       if casted_repeat_val: const_val_to_repeat = casted_repeat_val
                       else: self.add_error(f"Tipo do valor a repetir ({const_val_to_repeat.type}) incompatível com tipo esperado do elemento ({expected_elem_type}).", node.value); return None
 
+                 # Valor zero vira zeroinitializer (tamanho do IR independe de N)
+                 if self.is_zero_constant(const_val_to_repeat):
+                      result = ir.Constant(expected_llvm_type, None)
+                      return result
                  # Cria a lista de elementos repetidos
                  elements = [const_val_to_repeat] * const_size
                  try: result = ir.Constant(expected_llvm_type, elements)
@@ -743,22 +901,42 @@ class CodeGenVisitor:
 
 
     # --- Passagens de Geração de Código ---
+    def collect_string_literals(self, program_node: ast.Program) -> List[str]:
+        # Strings dos corpos de funções e das constantes (a ABI de extern e o caminho de import não viram globais)
+        values: List[str] = []
+        stack: List[object] = [item for item in program_node.body if isinstance(item, (ast.FunctionDef, ast.ConstDef))]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, list): stack.extend(item)
+            elif isinstance(item, ast.StringLiteral): values.append(item.value)
+            elif isinstance(item, ast.Node): stack.extend(getattr(item, name) for name in item.__dataclass_fields__)
+        return values
+
+    @profiler.profiled("codegen")
     def generate_code(self, node: ast.Program) -> str:
-        print("--- CodeGen Pass 1: Declarations ---")
-        for item in node.body:
+        profiler.step("codegen.literals")
+        self.literal_pool.plan_strings(self.collect_string_literals(node))
+        log.debug("--- CodeGen Pass 1: Declarations ---")
+        profiler.step("codegen.pass1.declarations")
+        # Itens importados só são declarados aqui: os corpos das funções ficam no objeto do módulo de origem
+        for item in getattr(node, 'imported_items', []) + node.body:
             if isinstance(item, ast.StructDef): self.declare_struct_type(item)
             elif isinstance(item, ast.EnumDef): self.declare_enum_type(item)
             elif isinstance(item, ast.FunctionDef): self.declare_function_signature(item)
             elif isinstance(item, ast.ExternBlock): self.visit_ExternBlock(item)
             elif isinstance(item, ast.ConstDef): self.declare_const_global(item)
-            elif isinstance(item, ast.ImportDecl): print(f"WARN CodeGen: ImportDecl não implementado.")
+            elif isinstance(item, ast.ImportDecl): pass # Já expandido em imported_items
             else: self.add_error(f"Item top-level inesperado na Passagem 1: {type(item)}", item)
 
-        print("--- CodeGen Pass 2: Struct Bodies ---")
+        log.debug("--- CodeGen Pass 2: Struct Bodies ---")
+        profiler.step("codegen.pass2.struct_bodies")
         for struct_def_node in self.atom_struct_defs.values():
             self.define_struct_body(struct_def_node)
+        for llvm_func, signature_node in self.function_signatures:
+            self.add_function_attributes(llvm_func, signature_node)
 
-        print("--- CodeGen Pass 3: Constant Initializers ---")
+        log.debug("--- CodeGen Pass 3: Constant Initializers ---")
+        profiler.step("codegen.pass3.constants")
         processed_constants = set()
         # ... (lógica de inicialização de constantes como antes) ...
         for _ in range(len(self.llvm_global_constants) + 1):
@@ -791,21 +969,131 @@ class CodeGenVisitor:
             if gvar.initializer is None: self.add_error(...); gvar.initializer = ir.Constant(gvar.type.pointee, None)
 
 
-        print("--- CodeGen Pass 4: Function Bodies ---")
+        log.debug("--- CodeGen Pass 4: Function Bodies ---")
+        profiler.step("codegen.pass4.function_bodies")
         for item in node.body:
             if isinstance(item, ast.FunctionDef):
                 # <<< IMPORTANTE: Atualiza current_function_name aqui >>>
                 self.current_function_name = item.name.name
                 self.define_function_body(item)
                 self.current_function_name = None # Limpa após gerar o corpo
-        print("--- CodeGen Finished ---")
+        log.debug("--- CodeGen Finished ---")
+        profiler.step("codegen.serialize")
         try:
             return str(self.module)
         except Exception as e_str:
              self.add_error(f"Falha ao converter módulo LLVM para string: {e_str}")
-             traceback.print_exc()
+             log.debug("Traceback:", exc_info=True)
              return f"; ERRO NA GERAÇÃO FINAL DO IR: {e_str}"
 
+    def get_inlining_threshold(self) -> Optional[int]:
+        # Mesmos limiares do LLVM para -O2/-O3/-Os/-Oz; -O1 fica sem inliner (só alwaysinline)
+        if self.size_level == 2: return 5
+        if self.size_level == 1: return 50
+        if self.opt_level == 3: return 250
+        if self.opt_level == 2: return 225
+        return None
+
+    def create_pass_manager_builder(self) -> llvm.PassManagerBuilder:
+        pmb = llvm.create_pass_manager_builder()
+        pmb.opt_level = self.opt_level
+        pmb.size_level = self.size_level
+        threshold = self.get_inlining_threshold()
+        if threshold is not None: pmb.inlining_threshold = threshold
+        pmb.loop_vectorize = self.opt_level >= 2 and self.size_level < 2
+        pmb.slp_vectorize = self.opt_level >= 2 and self.size_level < 2
+        return pmb
+
+    @profiler.profiled("optimize")
+    def optimize_module(self, llvm_module: Optional[llvm.ModuleRef] = None) -> llvm.ModuleRef:
+        # Pipeline em processo (mem2reg, instcombine, GVN, LICM, vetorização, inlining...) do nível configurado.
+        # Sem módulo explícito, faz parse do self.module gerado por generate_code.
+        profiler.step("optimize.parse_ir")
+        if llvm_module is None: llvm_module = llvm.parse_assembly(str(self.module))
+        llvm_module.verify()
+        if self.opt_level == 0: return llvm_module
+        profiler.step("optimize.passes")
+        pmb = self.create_pass_manager_builder()
+        fpm = llvm.create_function_pass_manager(llvm_module)
+        mpm = llvm.create_module_pass_manager()
+        # Informação do alvo (TTI) para os modelos de custo do vetorizador e do inliner
+        self.target_machine.add_analysis_passes(fpm)
+        self.target_machine.add_analysis_passes(mpm)
+        pmb.populate(fpm)
+        pmb.populate(mpm)
+        fpm.initialize()
+        for llvm_func in llvm_module.functions:
+            if not llvm_func.is_declaration: fpm.run(llvm_func)
+        fpm.finalize()
+        mpm.run(llvm_module)
+        return llvm_module
+
+    def module_for(self, program: Union[ast.Program, str, llvm.ModuleRef]) -> llvm.ModuleRef:
+        # AST: gera e otimiza no nível configurado. IR já gerado (texto ou módulo, p.ex. o de generate_llvm_ir,
+        # já otimizado): só parse e verificação, sem gerar nem otimizar de novo.
+        if isinstance(program, ast.Program):
+            self.generate_code(program); self.check_errors()
+            return self.optimize_module()
+        llvm_module = llvm.parse_assembly(program) if isinstance(program, str) else program
+        llvm_module.verify()
+        return llvm_module
+
+    @profiler.profiled("emit_object")
+    def emit_object(self, path: Optional[str] = None, llvm_module: Optional[llvm.ModuleRef] = None) -> bytes:
+        # Módulo em memória -> objeto nativo pela própria target_machine (sem .ll em disco nem clang).
+        if llvm_module is None: llvm_module = self.optimize_module()
+        profiler.step("emit_object.machine_code")
+        object_code = self.target_machine.emit_object(llvm_module)
+        if path:
+            with open(path, "wb") as f: f.write(object_code)
+        return object_code
+
+    def emit_assembly(self, path: Optional[str] = None, llvm_module: Optional[llvm.ModuleRef] = None) -> str:
+        if llvm_module is None: llvm_module = self.optimize_module()
+        assembly = self.target_machine.emit_assembly(llvm_module)
+        if path:
+            with open(path, "w") as f: f.write(assembly)
+        return assembly
+
+    @profiler.profiled("jit_compile")
+    def create_jit_engine(self, llvm_module: Optional[llvm.ModuleRef] = None,
+                          runtime_object: Optional[str] = RUNTIME_OBJECT) -> llvm.ExecutionEngine:
+        # MCJIT sobre o módulo otimizado no nível configurado. O runtime.o entra como objeto no próprio JIT
+        # (atom_panic_bounds_check, atom_do_bounds_check); printf/puts e o resto da libc são resolvidos
+        # no processo hospedeiro, que já tem a libc carregada.
+        llvm.initialize_native_target()
+        llvm.initialize_native_asmprinter()
+        if llvm_module is None: llvm_module = self.optimize_module()
+        jit_target_machine = self.target.create_target_machine(opt=self.opt_level)
+        engine = llvm.create_mcjit_compiler(llvm_module, jit_target_machine)
+        if runtime_object: engine.add_object_file(runtime_object)
+        engine.finalize_object()
+        engine.run_static_constructors()
+        return engine
+
+    def call_jit_entry(self, engine: llvm.ExecutionEngine, llvm_module: llvm.ModuleRef, entry: str = "main") -> int:
+        # Chama a função de entrada (sem parâmetros, retorno inteiro ou unit) e devolve o retorno (0 para unit).
+        # A assinatura vem do módulo compilado pelo JIT, que pode ter sido gerado por outro CodeGenVisitor.
+        global _libc
+        try: entry_func = llvm_module.get_function(entry)
+        except NameError: entry_func = None
+        if entry_func is None or entry_func.is_declaration:
+            raise RuntimeError(f"Função de entrada '{entry}' não definida no módulo")
+        if list(entry_func.arguments):
+            raise RuntimeError(f"Função de entrada '{entry}' não pode ter parâmetros no modo JIT")
+        return_type = str(entry_func.type.element_type).split(" (")[0] # 'i32 ()' -> 'i32'
+        if return_type not in JIT_RESULT_TYPES: raise RuntimeError(f"Tipo de retorno de '{entry}' não suportado no modo JIT: {return_type}")
+        restype = JIT_RESULT_TYPES[return_type]
+        entry_address = engine.get_function_address(entry)
+        if not entry_address: raise RuntimeError(f"Endereço de '{entry}' não encontrado no JIT")
+        # Só o modo JIT precisa dos símbolos do processo hospedeiro: carregados na primeira chamada
+        if _libc is None: _libc = ctypes.CDLL(None)
+        # Saída do Python antes, buffers do stdio do C depois: mantém a ordem das linhas como no executável
+        sys.stdout.flush()
+        result = ctypes.CFUNCTYPE(restype)(entry_address)()
+        _libc.fflush(None)
+        return int(result) if result is not None else 0
+
     def declare_struct_type(self, node: ast.StructDef):
         # ... (código como antes) ...
         struct_name = node.name.name
@@ -840,6 +1128,28 @@ class CodeGenVisitor:
               if i < len(node.params): arg_llvm.name = node.params[i].name.name
               else: arg_llvm.name = f"arg{i}"
          self.llvm_symbol_table[0][func_name] = llvm_func
+         self.function_signatures.append((llvm_func, node))
+
+    def add_function_attributes(self, llvm_func: ir.Function, node: Union[ast.FunctionDef, ast.FunctionDecl]):
+        # Atributos que a semântica de referências do Atom garante (depois da Passagem 2: dereferenceable usa o tamanho dos structs).
+        # Parâmetro &T / &mut T: nonnull + dereferenceable(tamanho de T), pois só nasce de '&lugar'. Para funções Atom
+        # (corpo verificado pelo SemanticAnalyzer, mesmo quando importadas de outro módulo) também:
+        #   &T     -> readonly (não há escrita por '&');
+        #   &mut T -> noalias só quando o SemanticAnalyzer provou que toda chamada passa um empréstimo exclusivo (Parameter.noalias);
+        #   nounwind na função (Atom não tem exceções; funções extern "C" não desenrolam a pilha).
+        # Slices (&[T], &mut [T]) são passados como { T*, usize } por valor e não aceitam atributos de parâmetro.
+        is_atom_body = not getattr(node, 'is_extern', False)
+        if is_atom_body: llvm_func.attributes.add('nounwind')
+        for arg_llvm, param_ast in zip(llvm_func.args, node.params):
+            if not isinstance(param_ast.type, ast.ReferenceType) or not isinstance(arg_llvm.type, ir.PointerType): continue
+            arg_llvm.add_attribute('nonnull')
+            pointee_type = arg_llvm.type.pointee
+            sized = not isinstance(pointee_type, (ir.VoidType, ir.FunctionType)) and not getattr(pointee_type, 'is_opaque', False)
+            if sized and self.target_data is not None: arg_llvm.attributes.dereferenceable = pointee_type.get_abi_size(self.target_data)
+            if not is_atom_body: continue
+            if param_ast.type.is_mutable:
+                if getattr(param_ast, 'noalias', False): arg_llvm.add_attribute('noalias')
+            else: add_param_attribute(arg_llvm, 'readonly')
 
     def visit_ExternBlock(self, node: ast.ExternBlock):
         # ... (código como antes) ...
@@ -885,7 +1195,7 @@ class CodeGenVisitor:
 
     def visit_StringLiteral(self, node: ast.StringLiteral, expected_llvm_type: Optional[ir.Type] = None) -> Optional[ir.Value]:
         # ... (código como antes) ...
-        llvm_ptr_val = create_global_string_constant(self.module, node.value)
+        llvm_ptr_val = self.literal_pool.string_pointer(node.value)
         if isinstance(expected_llvm_type, ir.PointerType) and llvm_ptr_val.type != expected_llvm_type:
              if not self.builder: self.add_error(...); return llvm_ptr_val
              return self.builder.bitcast(llvm_ptr_val, expected_llvm_type)
@@ -920,6 +1230,10 @@ class CodeGenVisitor:
             if llvm_ptr_or_func is not None:
                 if isinstance(llvm_ptr_or_func, ir.Function):
                     self.add_error(f"'{var_name}' é uma função e não pode ser usada como L-Value.", node); return None
+                if id(llvm_ptr_or_func) in self.value_symbols: # Variável de 'for' em registrador: '&i' precisa de um slot
+                    spill_ptr = self.create_entry_alloca(llvm_ptr_or_func.type, name=var_name + ".spill")
+                    self.builder.store(llvm_ptr_or_func, spill_ptr)
+                    return spill_ptr
                 if not isinstance(llvm_ptr_or_func.type, ir.PointerType):
                     self.add_error(f"Erro Interno: Símbolo '{var_name}' não é ponteiro.", node); return None
                 return llvm_ptr_or_func # Retorna o ponteiro (alloca)
@@ -1019,6 +1333,8 @@ class CodeGenVisitor:
 
             # --- DEFINIÇÃO DAS VARIÁVEIS (GARANTIR QUE ESTEJAM AQUI) ---
             llvm_length: Optional[ir.Value] = None
+            bounds_proven = self.prove_bounds and getattr(node, 'bounds_proven', False) # Anotado por bounds_analysis.analyze_bounds
+            bounds_unchecked = not bounds_proven and (self.unchecked_indexing or bool(getattr(node, 'bounds_unchecked', None)))
             is_raw_pointer = False
             collection_is_indexable_with_bounds = False
             # --- FIM DEFINIÇÃO ---
@@ -1032,8 +1348,9 @@ class CodeGenVisitor:
                  isinstance(collection_storage_type.elements[0], ir.PointerType) and \
                  collection_storage_type.elements[1] == usize_type: # Slice
                 if not builder or not builder.block or builder.block.is_terminated: self.add_error(...); return None
-                len_ptr = builder.gep(llvm_base_collection_ptr, [zero_const_32, ir.Constant(ir.IntType(32), 1)], name="slice.len.ptr.bc")
-                llvm_length = builder.load(len_ptr, name="slice.len.bc")
+                if not (bounds_proven or bounds_unchecked): # Sem check: nem carrega o tamanho
+                    len_ptr = builder.gep(llvm_base_collection_ptr, [zero_const_32, ir.Constant(ir.IntType(32), 1)], name="slice.len.ptr.bc")
+                    llvm_length = builder.load(len_ptr, name="slice.len.bc")
                 collection_is_indexable_with_bounds = True
             elif isinstance(collection_storage_type, ir.PointerType):
                  is_raw_pointer = True
@@ -1044,13 +1361,14 @@ class CodeGenVisitor:
 
             # --- Lógica de Bounds Check e GEP ---
             # Agora as variáveis collection_is_indexable_with_bounds e llvm_length existem
-            if collection_is_indexable_with_bounds and llvm_length is not None:
-                # --- INSERE CHAMADA PARA HELPER ---
+            if collection_is_indexable_with_bounds and (llvm_length is not None or bounds_proven or bounds_unchecked):
+                # --- BOUNDS CHECK INLINE ---
                 if not builder or not builder.block or builder.block.is_terminated: self.add_error(...); return None
-                check_func = self.module.globals.get("atom_do_bounds_check")
-                if not check_func or not isinstance(check_func, ir.Function): self.add_error(...); return None
-                builder.call(check_func, [llvm_index_val, llvm_length])
-                # --- FIM CHAMADA HELPER ---
+                if bounds_proven: self.bounds_checks_elided += 1
+                elif bounds_unchecked: self.bounds_checks_unchecked += 1 # Listado por bounds_analysis.unchecked_index_sites
+                elif not self.emit_bounds_check(llvm_index_val, llvm_length): self.add_error("Falha ao gerar bounds check", node); return None
+                builder = self.builder
+                # --- FIM BOUNDS CHECK ---
 
                 if not builder or not builder.block or builder.block.is_terminated: self.add_error(...); return None
                 # Gera o GEP DEPOIS da chamada
@@ -1087,6 +1405,60 @@ class CodeGenVisitor:
             self.add_error(f"Expressão do tipo '{type(node).__name__}' não é um L-Value suportado.", node)
             return None
 
+    def create_entry_alloca(self, llvm_type: ir.Type, name: str = "") -> ir.AllocaInstr:
+        # Todo slot local vai para o topo do bloco de entrada da função atual, em ordem de criação:
+        # um alloca dentro de while/loop não cresce a pilha a cada iteração e o mem2reg consegue promovê-lo.
+        # Usa o próprio builder (um segundo builder no mesmo bloco deixaria a posição deste desatualizada);
+        # o codegen sempre emite no fim do bloco corrente, então basta voltar para o fim dele.
+        current_block = self.builder.block
+        if self.last_entry_alloca is not None: self.builder.position_after(self.last_entry_alloca)
+        else: self.builder.position_at_start(self.builder.function.entry_basic_block)
+        alloca_inst = self.builder.alloca(llvm_type, name=name)
+        self.builder.position_at_end(current_block)
+        self.last_entry_alloca = alloca_inst
+        return alloca_inst
+
+    def get_bounds_panic_block(self) -> Optional[Tuple[ir.Block, ir.PhiInstr, ir.PhiInstr]]:
+        # Um único bloco de pânico por função, criado na primeira indexação checada.
+        # Cada ponto de check entra nele com (índice, tamanho) pelos phis, então o caminho quente
+        # fica só com icmp + br e o código frio não é duplicado por acesso.
+        if self.bounds_panic is not None: return self.bounds_panic
+        panic_func = self.module.globals.get("atom_panic_bounds_check")
+        usize_type = self.llvm_types.get('usize')
+        if not isinstance(panic_func, ir.Function) or not isinstance(usize_type, ir.IntType): return None
+        current_block = self.builder.block
+        panic_block = self.builder.function.append_basic_block(name="bounds.panic")
+        self.builder.position_at_end(panic_block)
+        index_phi = self.builder.phi(usize_type, name="bounds.idx")
+        length_phi = self.builder.phi(usize_type, name="bounds.len")
+        self.builder.call(panic_func, [index_phi, length_phi])
+        self.builder.unreachable()
+        self.builder.position_at_end(current_block)
+        self.bounds_panic = (panic_block, index_phi, length_phi)
+        return self.bounds_panic
+
+    def emit_bounds_check(self, llvm_index_val: ir.Value, llvm_length: ir.Value) -> bool:
+        # idx >= len (sem sinal) desvia para o bloco de pânico; os pesos marcam a falha como improvável.
+        # Índice e tamanho constantes e dentro do limite não geram check nenhum.
+        if isinstance(llvm_index_val, ir.Constant) and isinstance(llvm_length, ir.Constant) and \
+           isinstance(llvm_index_val.constant, int) and isinstance(llvm_length.constant, int) and \
+           0 <= llvm_index_val.constant < llvm_length.constant:
+            self.bounds_checks_elided += 1
+            return True
+        bounds_panic = self.get_bounds_panic_block()
+        if bounds_panic is None: return False
+        panic_block, index_phi, length_phi = bounds_panic
+        check_block = self.builder.block
+        out_of_bounds = self.builder.icmp_unsigned('>=', llvm_index_val, llvm_length, name="bounds.oob")
+        ok_block = self.builder.function.append_basic_block(name="bounds.ok")
+        branch = self.builder.cbranch(out_of_bounds, panic_block, ok_block)
+        branch.set_weights([1, 1048575])
+        index_phi.add_incoming(llvm_index_val, check_block)
+        length_phi.add_incoming(llvm_length, check_block)
+        self.builder.position_at_end(ok_block)
+        self.bounds_checks_emitted += 1
+        return True
+
     def define_function_body(self, node: ast.FunctionDef):
         func_name = node.name.name
         llvm_func_val = self.module.globals.get(func_name)
@@ -1102,6 +1474,12 @@ class CodeGenVisitor:
 
         old_func_name = self.current_function_name
         self.current_function_name = func_name
+        old_last_entry_alloca = self.last_entry_alloca
+        self.last_entry_alloca = None
+        old_bounds_panic = self.bounds_panic
+        self.bounds_panic = None
+        old_overflow_panic = self.overflow_panic
+        self.overflow_panic = None
 
         self.enter_scope()
         # Processa parâmetros
@@ -1109,7 +1487,7 @@ class CodeGenVisitor:
             param_node_ast = node.params[i]
             ast_param_name = param_node_ast.name.name
             llvm_arg_val.name = ast_param_name
-            alloca_inst = self.builder.alloca(llvm_arg_val.type, name=ast_param_name + ".addr")
+            alloca_inst = self.create_entry_alloca(llvm_arg_val.type, name=ast_param_name + ".addr")
             self.builder.store(llvm_arg_val, alloca_inst)
             self.declare_var(ast_param_name, alloca_inst)
 
@@ -1148,24 +1526,33 @@ class CodeGenVisitor:
 
         self.builder = old_builder
         self.current_function_name = old_func_name
+        self.last_entry_alloca = old_last_entry_alloca
+        self.bounds_panic = old_bounds_panic
+        self.overflow_panic = old_overflow_panic
+
+    def _lookup_visitor(self, node_class: type) -> Tuple[Callable, bool, str]:
+        # Resolve (método ligado, aceita expected_llvm_type?, nome) uma única vez por classe de nó.
+        method_name = f'visit_{node_class.__name__}'
+        visitor_method = getattr(self, method_name, self.generic_visit)
+        code = visitor_method.__func__.__code__
+        param_names = code.co_varnames[:code.co_argcount + code.co_kwonlyargcount]
+        entry = (visitor_method, 'expected_llvm_type' in param_names, method_name)
+        self._visit_dispatch[node_class] = entry
+        return entry
 
     def visit(self, node: Optional[ast.Node], expected_llvm_type: Optional[ir.Type] = None):
         if node is None: return None
-        method_name = f'visit_{node.__class__.__name__}'
-        visitor_method = getattr(self, method_name, self.generic_visit)
-        import inspect
-        sig = inspect.signature(visitor_method)
+        entry = self._visit_dispatch.get(node.__class__)
+        if entry is None: entry = self._lookup_visitor(node.__class__)
+        visitor_method, accepts_expected_type, method_name = entry
         try:
-            if 'expected_llvm_type' in sig.parameters:
+            if accepts_expected_type:
                  return visitor_method(node, expected_llvm_type=expected_llvm_type)
             else:
-                 # Avisa se estamos passando expected_type para um método que não o aceita
-                 # if expected_llvm_type is not None and method_name != 'generic_visit':
-                 #    print(f"WARN: Passando expected_llvm_type para {method_name} que não o aceita.")
                  return visitor_method(node)
         except Exception as e:
             self.add_error(f"Erro interno ao visitar nó {type(node).__name__} com método {method_name}: {e}", node)
-            traceback.print_exc() # Imprime traceback para debug
+            log.debug("Traceback do erro interno em %s:", method_name, exc_info=True)
             return None # Retorna None para indicar falha na geração
 
     def generic_visit(self, node: ast.Node):
@@ -1187,6 +1574,11 @@ class CodeGenVisitor:
         elif expected_llvm_type is None: # Falha ao obter tipo anotado
              self.add_error(f"Falha tipo anotado LLVM 'let {var_name}'.", node.type_annot); return
 
+        if isinstance(node.value, ast.ArrayRepeatExpr):
+            llvm_ptr = self.bind_array_repeat(node.value, var_name, expected_llvm_type)
+            if llvm_ptr is None: self.add_error(f"Falha valor RHS 'let {var_name}'.", node.value); return
+            self.declare_var(var_name, llvm_ptr); return
+
         llvm_rhs_value = self.visit(node.value, expected_llvm_type=expected_llvm_type)
         if llvm_rhs_value is None: self.add_error(f"Falha valor RHS 'let {var_name}'.", node.value); return
         llvm_var_type: Optional[ir.Type] = expected_llvm_type or llvm_rhs_value.type
@@ -1224,7 +1616,7 @@ class CodeGenVisitor:
                 #print(f"  DEBUG Let/Mut/Assign '{var_name}': Coerção de &array para slice: {llvm_value_to_store}")
             else: self.add_error(f"Tipo RHS incompatível 'let {var_name}'.", node); return
 
-        llvm_ptr = self.builder.alloca(llvm_var_type, name=var_name + ".addr")
+        llvm_ptr = self.create_entry_alloca(llvm_var_type, name=var_name + ".addr")
         try: self.builder.store(llvm_value_to_store, llvm_ptr)
         except Exception as e: self.add_error(f"Store falhou 'let {var_name}': {e}", node); return
         self.declare_var(var_name, llvm_ptr)
@@ -1242,6 +1634,11 @@ class CodeGenVisitor:
         if expected_llvm_type is None and not node.type_annot: pass
         elif expected_llvm_type is None: self.add_error(f"Falha tipo anotado LLVM 'mut {var_name}'.", node.type_annot); return
 
+        if isinstance(node.value, ast.ArrayRepeatExpr):
+            llvm_ptr = self.bind_array_repeat(node.value, var_name, expected_llvm_type)
+            if llvm_ptr is None: self.add_error(f"Falha valor RHS 'mut {var_name}'.", node.value); return
+            self.declare_var(var_name, llvm_ptr); return
+
         llvm_rhs_value = self.visit(node.value, expected_llvm_type=expected_llvm_type)
         if llvm_rhs_value is None: self.add_error(f"Falha valor RHS 'mut {var_name}'.", node.value); return
         llvm_var_type: Optional[ir.Type] = expected_llvm_type or llvm_rhs_value.type
@@ -1279,7 +1676,7 @@ class CodeGenVisitor:
                 #print(f"  DEBUG Let/Mut/Assign '{var_name}': Coerção de &array para slice: {llvm_value_to_store}")
             else: self.add_error(f"Tipo RHS incompatível 'mut {var_name}'.", node); return
 
-        llvm_ptr = self.builder.alloca(llvm_var_type, name=var_name + ".addr")
+        llvm_ptr = self.create_entry_alloca(llvm_var_type, name=var_name + ".addr")
         try: self.builder.store(llvm_value_to_store, llvm_ptr)
         except Exception as e: self.add_error(f"Store falhou 'mut {var_name}': {e}", node); return
         self.declare_var(var_name, llvm_ptr)
@@ -1293,6 +1690,10 @@ class CodeGenVisitor:
         if not isinstance(llvm_target_ptr.type, ir.PointerType): self.add_error(f"L-Value não é ponteiro.", node.target); return
 
         expected_value_type = llvm_target_ptr.type.pointee
+        if isinstance(node.value, ast.ArrayRepeatExpr) and isinstance(expected_value_type, ir.ArrayType):
+            prepared = self.prepare_array_repeat(node.value, expected_value_type)
+            if prepared is None: self.add_error(f"Falha valor RHS Assignment.", node.value); return
+            self.fill_array_repeat(llvm_target_ptr, prepared[1]); return
         llvm_value = self.visit(node.value, expected_llvm_type=expected_value_type)
         if llvm_value is None: self.add_error(f"Falha valor RHS Assignment.", node.value); return
 
@@ -1553,6 +1954,116 @@ class CodeGenVisitor:
         # mas é necessário como destino do break.
         self.builder.position_at_end(loop_end_block)
 
+    def declare_value_symbol(self, name: str, llvm_value: ir.Value):
+        # Nome ligado a um valor SSA (não a um alloca): lido direto por visit_Identifier
+        self.llvm_symbol_table[-1][name] = llvm_value
+        self.value_symbols.add(id(llvm_value))
+
+    def emit_for_loop(self, node: Union[ast.ForRangeStmt, ast.ForSliceStmt], start: ir.Value, end: ir.Value, is_signed: bool,
+                      step_flags: Tuple[str, ...], bind_var: Callable[[ir.Value], None]):
+        # Laço canônico: preheader -> header (phi do índice, compara, cbr) -> corpo -> latch (índice + 1) -> header.
+        # O latch é o único bloco que volta ao header ('continue' também vai para ele) e o fim é avaliado
+        # uma vez só no preheader, então o LoopSimplify/IndVars/vetorizador do LLVM reconhecem o laço direto.
+        current_function = self.builder.function
+        preheader_block = self.builder.block
+        header_block = current_function.append_basic_block(name="for.header")
+        body_block = current_function.append_basic_block(name="for.body")
+        latch_block = current_function.append_basic_block(name="for.latch")
+        end_block = current_function.append_basic_block(name="for.end")
+        self.builder.branch(header_block)
+
+        self.builder.position_at_end(header_block)
+        index_phi = self.builder.phi(start.type, name="for.idx")
+        index_phi.add_incoming(start, preheader_block)
+        in_range = self.builder.icmp_signed('<', index_phi, end, name="for.cond") if is_signed else self.builder.icmp_unsigned('<', index_phi, end, name="for.cond")
+        self.builder.cbranch(in_range, body_block, end_block)
+
+        self.builder.position_at_end(body_block)
+        self.enter_scope()
+        bind_var(index_phi)
+        self.loop_context_stack.append((latch_block, end_block)) # 'continue' vai para o latch
+        for stmt in node.body:
+            self.visit(stmt)
+            if not self.builder or not self.builder.block or self.builder.block.is_terminated: break
+        self.loop_context_stack.pop()
+        self.exit_scope()
+        if self.builder and self.builder.block and not self.builder.block.is_terminated:
+            self.builder.branch(latch_block)
+
+        # Índice < fim <= máximo do tipo: o incremento nunca estoura (nsw para tipos com sinal, nuw sem sinal)
+        self.builder.position_at_end(latch_block)
+        next_index = self.builder.add(index_phi, ir.Constant(start.type, 1), name="for.next", flags=step_flags)
+        index_phi.add_incoming(next_index, latch_block)
+        self.builder.branch(header_block)
+        self.builder.position_at_end(end_block)
+
+    def coerce_for_bound(self, llvm_value: ir.Value, llvm_type: ir.IntType, is_signed: bool) -> ir.Value:
+        if llvm_value.type == llvm_type: return llvm_value
+        if llvm_value.type.width < llvm_type.width: return self.builder.sext(llvm_value, llvm_type) if is_signed else self.builder.zext(llvm_value, llvm_type)
+        return self.builder.trunc(llvm_value, llvm_type)
+
+    def visit_ForRangeStmt(self, node: ast.ForRangeStmt):
+        if not self.builder or not self.builder.block or self.builder.block.is_terminated: return
+        var_type = getattr(node, 'declared_type', None)
+        llvm_var_type = self.get_llvm_type(var_type)
+        if not isinstance(llvm_var_type, ir.IntType): self.add_error(f"Tipo inválido para variável de 'for': {self.type_to_string(var_type)}", node); return
+        is_signed = bool(self.is_signed_atom_type(var_type))
+        llvm_start = self.visit(node.start, expected_llvm_type=llvm_var_type)
+        llvm_end = self.visit(node.end, expected_llvm_type=llvm_var_type)
+        if llvm_start is None or llvm_end is None: self.add_error("Falha ao gerar limites do 'for'.", node); return
+        llvm_start = self.coerce_for_bound(llvm_start, llvm_var_type, is_signed)
+        llvm_end = self.coerce_for_bound(llvm_end, llvm_var_type, is_signed)
+        var_name = node.var.name
+        self.emit_for_loop(node, llvm_start, llvm_end, is_signed, ('nsw',) if is_signed else ('nuw',),
+                           lambda index: self.declare_value_symbol(var_name, index))
+
+    def for_slice_parts(self, iterable: ast.Expression) -> Optional[Tuple[ir.Value, ir.Value]]:
+        # (ponteiro para o primeiro elemento, tamanho usize) de um array, &array ou slice, sem copiar o array
+        usize_type = self.llvm_types['usize']
+        zero_i32 = ir.Constant(ir.IntType(32), 0)
+        if isinstance(iterable, (ast.Identifier, ast.FieldAccess, ast.IndexAccess)) or (isinstance(iterable, ast.UnaryOp) and iterable.op == '*'):
+            storage_ptr = self.visit_lvalue_pointer(iterable, allow_immutable_ref=True)
+            if storage_ptr is None: return None
+            storage_type = storage_ptr.type.pointee
+            if isinstance(storage_type, ir.PointerType) and isinstance(storage_type.pointee, ir.ArrayType): # Variável &[T; N]
+                storage_ptr = self.builder.load(storage_ptr, name="for.arr.ptr"); storage_type = storage_type.pointee
+            if isinstance(storage_type, ir.ArrayType):
+                return self.builder.gep(storage_ptr, [zero_i32, zero_i32], name="for.data", inbounds=True), ir.Constant(usize_type, storage_type.count)
+            collection_value = self.builder.load(storage_ptr, name="for.slice")
+        else:
+            collection_value = self.visit(iterable)
+            if collection_value is None: return None
+            if isinstance(collection_value.type, ir.ArrayType): # Array temporário: precisa de um slot
+                array_slot = self.create_entry_alloca(collection_value.type, name="for.arr.tmp")
+                self.builder.store(collection_value, array_slot); collection_value = array_slot
+            if isinstance(collection_value.type, ir.PointerType) and isinstance(collection_value.type.pointee, ir.ArrayType):
+                return self.builder.gep(collection_value, [zero_i32, zero_i32], name="for.data", inbounds=True), ir.Constant(usize_type, collection_value.type.pointee.count)
+        collection_type = collection_value.type
+        if isinstance(collection_type, (ir.LiteralStructType, ir.IdentifiedStructType)) and len(collection_type.elements) == 2 and \
+           isinstance(collection_type.elements[0], ir.PointerType) and collection_type.elements[1] == usize_type: # Slice
+            return self.builder.extract_value(collection_value, 0, name="for.data"), self.builder.extract_value(collection_value, 1, name="for.len")
+        self.add_error(f"'for ... in' sobre tipo não suportado: {collection_type}", iterable); return None
+
+    def visit_ForSliceStmt(self, node: ast.ForSliceStmt):
+        if not self.builder or not self.builder.block or self.builder.block.is_terminated: return
+        parts = self.for_slice_parts(node.iterable)
+        if parts is None: self.add_error("Falha ao gerar a coleção do 'for'.", node.iterable); return
+        data_ptr, length = parts
+        var_name = node.var.name
+        element_type = data_ptr.type.pointee
+        # Escalares ficam em registrador; structs/arrays são copiados para um slot (campos e índices usam o ponteiro)
+        element_slot = None if isinstance(element_type, (ir.IntType, ir.PointerType)) else self.create_entry_alloca(element_type, name=var_name + ".addr")
+
+        def bind_element(index: ir.Value):
+            # Índice < tamanho: sem bounds check
+            element_ptr = self.builder.gep(data_ptr, [index], name="for.elem.ptr", inbounds=True)
+            element_value = self.builder.load(element_ptr, name=var_name)
+            if element_slot is None: self.declare_value_symbol(var_name, element_value); return
+            self.builder.store(element_value, element_slot); self.declare_var(var_name, element_slot)
+
+        # Um slice nunca passa de isize::MAX elementos: índice + 1 não estoura nem com nem sem sinal
+        self.emit_for_loop(node, ir.Constant(length.type, 0), length, False, ('nuw', 'nsw'), bind_element)
+
     def visit_BreakStmt(self, node: ast.BreakStmt):
         # ... (código como antes) ...
         if not self.builder or (self.builder.block and self.builder.block.is_terminated): return
@@ -1613,15 +2124,16 @@ class CodeGenVisitor:
                  # if var_name == 'printf': print(f"DEBUG visit_Identifier: Found '{var_name}' as Function via lookup_var.")
                  return llvm_symbol
 
-            # Se não é função, DEVE ser um ponteiro (alloca)
-            if isinstance(llvm_symbol.type, ir.PointerType):
+            # Se não é função, DEVE ser um ponteiro (alloca) ou um valor SSA de 'for'
+            is_value_symbol = id(llvm_symbol) in self.value_symbols
+            if is_value_symbol or isinstance(llvm_symbol.type, ir.PointerType):
                 if not self.builder:
                     self.add_error(f"Builder inativo ao carregar var local/param '{var_name}'", node)
                     return None
                 # --- DEBUG ---
                 # if var_name == 'printf': print(f"  DEBUG visit_Identifier: '{var_name}' ENCONTRADO COMO PONTEIRO LOCAL?? Type: {llvm_symbol.type}. Loading...") # Erro!
                 # --- FIM DEBUG ---
-                loaded_val = self.builder.load(llvm_symbol, name=var_name)
+                loaded_val = llvm_symbol if is_value_symbol else self.builder.load(llvm_symbol, name=var_name)
                 # ... (Cast opcional do valor carregado) ...
                 if expected_llvm_type and loaded_val.type != expected_llvm_type:
                     if isinstance(loaded_val.type, ir.IntType) and isinstance(expected_llvm_type, ir.IntType):
@@ -1688,7 +2200,11 @@ class CodeGenVisitor:
         if not self.builder: self.add_error(...); return None
         llvm_operand_type = llvm_operand_value.type
         if op == '-':
-             if isinstance(llvm_operand_type, ir.IntType): return self.builder.neg(llvm_operand_value)
+             if isinstance(llvm_operand_type, ir.IntType):
+                 is_signed = self.is_signed_atom_type(getattr(node.operand, 'atom_type', None)) is not False # Literal: -5 é com sinal
+                 min_value = -(1 << (llvm_operand_type.width - 1))
+                 is_safe_constant = isinstance(llvm_operand_value, ir.Constant) and isinstance(llvm_operand_value.constant, int) and llvm_operand_value.constant != min_value
+                 return self.emit_integer_arith('-', ir.Constant(llvm_operand_type, 0), llvm_operand_value, is_signed, is_safe_constant)
              #elif isinstance(llvm_operand_type, (ir.FloatType, ir.DoubleType)): return self.builder.fneg(llvm_operand_value) # REMOVIDO FLOAT
              else: self.add_error(...); return None
         elif op == '!':
@@ -1742,23 +2258,15 @@ class CodeGenVisitor:
         if op in ('+', '-', '*', '/', '%'):
              # ... (lógica aritmética, DEVE usar llvm_left, llvm_right ajustados) ...
              if isinstance(final_op_type, ir.IntType): # Usa final_op_type ajustado
-                if op == '+': return self.builder.add(llvm_left, llvm_right, name="addtmp")
-                if op == '-': return self.builder.sub(llvm_left, llvm_right, name="subtmp")
-                if op == '*': return self.builder.mul(llvm_left, llvm_right, name="multmp")
-                is_signed = self.is_signed_type_heuristic(getattr(node.left, 'atom_type', None), final_op_type)
+                is_signed = self.binary_op_is_signed(node)
+                if op in ('+', '-', '*'): return self.emit_integer_arith(op, llvm_left, llvm_right, is_signed, self.prove_bounds and bool(getattr(node, 'arith_no_wrap', None)))
+                if is_signed and self.overflow_mode == 'checked': self.emit_division_overflow_check(op, llvm_left, llvm_right)
                 if op == '/': return self.builder.sdiv(llvm_left, llvm_right) if is_signed else self.builder.udiv(llvm_left, llvm_right)
                 else: return self.builder.srem(llvm_left, llvm_right) if is_signed else self.builder.urem(llvm_left, llvm_right)
              else: self.add_error(...); return None
         elif op in ('==', '!=', '<', '>', '<=', '>='):
-             # --- CORREÇÃO: Usa llvm_left e llvm_right ORIGINAIS para icmp ---
-             # LLVM icmp pode comparar inteiros de larguras diferentes (geralmente promovendo)
-             # ou ponteiros. A promoção/ajuste que fizemos acima pode não ser ideal aqui.
-             # Vamos comparar os valores como foram gerados originalmente.
-             original_left_val = self.visit(node.left) # Visita de novo? Não, usa os já visitados.
-             original_right_val = self.visit(node.right)
-             # Precisamos re-visitar ou guardar os valores originais? Vamos usar os que temos (llvm_left, llvm_right)
-             # mas garantir que a comparação use os tipos corretos.
-
+             # Usa llvm_left/llvm_right já gerados (cada operando é avaliado uma única vez:
+             # revisitá-los duplicaria loads, GEPs, bounds checks e chamadas na condição).
              # Usa os tipos originais detectados para determinar signed/unsigned/ptr
              left_concrete_orig = self.get_concrete_type(getattr(node.left, 'atom_type', left_llvm_type))
              right_concrete_orig = self.get_concrete_type(getattr(node.right, 'atom_type', right_llvm_type))
@@ -1766,8 +2274,8 @@ class CodeGenVisitor:
              if isinstance(left_concrete_orig, ir.PointerType) and isinstance(right_concrete_orig, ir.PointerType):
                   return self.builder.icmp_unsigned(op, llvm_left, llvm_right, name="ptrcmp")
              elif self.is_integer_type(left_concrete_orig) and self.is_integer_type(right_concrete_orig):
-                  # Usa a heurística baseada no tipo Atom do operando esquerdo para signed/unsigned
-                  is_signed = self.is_signed_type_heuristic(getattr(node.left, 'atom_type', None), left_concrete_orig)
+                  # Sinal pelo tipo Atom dos operandos (um literal à esquerda segue o da direita)
+                  is_signed = self.binary_op_is_signed(node)
                   if is_signed:
                        return self.builder.icmp_signed(op, llvm_left, llvm_right, name="scmp")
                   else:
@@ -1784,11 +2292,52 @@ class CodeGenVisitor:
                 if op == '^': return self.builder.xor(llvm_left, llvm_right)
                 if op == '<<': return self.builder.shl(llvm_left, llvm_right)
                 else: # >>
-                    is_signed = self.is_signed_type_heuristic(getattr(node.left, 'atom_type', None), final_op_type)
+                    is_signed = self.binary_op_is_signed(node)
                     return self.builder.ashr(llvm_left, llvm_right) if is_signed else self.builder.lshr(llvm_left, llvm_right)
              else: self.add_error(...); return None
         else: self.add_error(...); return None
 
+    def emit_integer_arith(self, op: str, llvm_left: ir.Value, llvm_right: ir.Value, is_signed: bool, proven_no_wrap: bool) -> ir.Value:
+        # add/sub/mul conforme a política de overflow (OVERFLOW_MODES)
+        if is_signed and self.overflow_mode == 'checked' and not proven_no_wrap:
+            intrinsic = {'+': self.builder.sadd_with_overflow, '-': self.builder.ssub_with_overflow, '*': self.builder.smul_with_overflow}[op]
+            result_pair = intrinsic(llvm_left, llvm_right, name="ovf")
+            self.branch_to_overflow_panic(self.builder.extract_value(result_pair, 1, name="ovf.flag"), op)
+            return self.builder.extract_value(result_pair, 0, name="ovf.value")
+        flags: Tuple[str, ...] = ()
+        if proven_no_wrap or (is_signed and self.overflow_mode == 'assume'): flags = ('nsw',) if is_signed else ('nuw',)
+        if flags: self.no_wrap_ops += 1
+        if op == '+': return self.builder.add(llvm_left, llvm_right, name="addtmp", flags=flags)
+        if op == '-': return self.builder.sub(llvm_left, llvm_right, name="subtmp", flags=flags)
+        return self.builder.mul(llvm_left, llvm_right, name="multmp", flags=flags)
+
+    def emit_division_overflow_check(self, op: str, llvm_left: ir.Value, llvm_right: ir.Value):
+        # MIN / -1 (e MIN % -1) estoura em tipos com sinal; com divisor constante != -1 não há o que checar
+        if isinstance(llvm_right, ir.Constant) and isinstance(llvm_right.constant, int) and llvm_right.constant != -1: return
+        int_type = llvm_left.type
+        is_min = self.builder.icmp_signed('==', llvm_left, ir.Constant(int_type, -(1 << (int_type.width - 1))), name="ovf.min")
+        is_minus_one = self.builder.icmp_signed('==', llvm_right, ir.Constant(int_type, -1), name="ovf.m1")
+        self.branch_to_overflow_panic(self.builder.and_(is_min, is_minus_one, name="ovf.flag"), op)
+
+    def branch_to_overflow_panic(self, overflowed: ir.Value, op: str):
+        # Como nos bounds checks: um bloco de pânico por função, o operador entra pelo phi
+        if self.overflow_panic is None:
+            current_block = self.builder.block
+            panic_block = self.builder.function.append_basic_block(name="overflow.panic")
+            self.builder.position_at_end(panic_block)
+            op_phi = self.builder.phi(ir.IntType(32), name="overflow.op")
+            self.builder.call(self.module.globals["atom_panic_integer_overflow"], [op_phi])
+            self.builder.unreachable()
+            self.builder.position_at_end(current_block)
+            self.overflow_panic = (panic_block, op_phi)
+        panic_block, op_phi = self.overflow_panic
+        check_block = self.builder.block
+        ok_block = self.builder.function.append_basic_block(name="overflow.ok")
+        self.builder.cbranch(overflowed, panic_block, ok_block).set_weights([1, 1048575])
+        op_phi.add_incoming(ir.Constant(ir.IntType(32), ord(op)), check_block)
+        self.builder.position_at_end(ok_block)
+        self.overflow_checks_emitted += 1
+
     def _generate_logical_binary_op(self, node: ast.BinaryOp) -> Optional[ir.Value]:
         # ... (código como antes) ...
         op = node.op
@@ -1906,7 +2455,7 @@ class CodeGenVisitor:
                  elif isinstance(llvm_arg_val.type, ir.PointerType) and isinstance(expected_arg_llvm_type, ir.PointerType):
                     casted_arg_val = self.builder.bitcast(llvm_arg_val, expected_arg_llvm_type)
                  elif isinstance(llvm_arg_val.type, ir.ArrayType) and isinstance(expected_arg_llvm_type, ir.PointerType): # Array decay
-                    temp_alloca = self.builder.alloca(llvm_arg_val.type); self.builder.store(llvm_arg_val, temp_alloca)
+                    temp_alloca = self.create_entry_alloca(llvm_arg_val.type, name="arraydecay.tmp"); self.builder.store(llvm_arg_val, temp_alloca)
                     zero_idx = ir.Constant(ir.IntType(32),0)
                     decayed_ptr = self.builder.gep(temp_alloca, [zero_idx, zero_idx])
                     if decayed_ptr.type != expected_arg_llvm_type: casted_arg_val = self.builder.bitcast(decayed_ptr, expected_arg_llvm_type)
@@ -1933,14 +2482,14 @@ class CodeGenVisitor:
             call_result = self.builder.call(the_callable_llvm_val, llvm_args, name=call_name)
             return None if isinstance(actual_func_type_llvm.return_type, ir.VoidType) else call_result
         except Exception as e:
-             self.add_error(f"Falha ao gerar CALL: {e}", node); traceback.print_exc(); return None
+             self.add_error(f"Falha ao gerar CALL: {e}", node); log.debug("Traceback:", exc_info=True); return None
 
 
     def visit_ByteStringLiteral(self, node: ast.ByteStringLiteral, expected_llvm_type: Optional[ir.Type] = None) -> Optional[ir.Value]:
         # ... (código como antes) ...
         if not self.builder: self.add_error(...); return None
         actual_bytes = node.value; # ... (check bytes type) ...
-        global_byte_array_var = create_global_byte_array_constant(self.module, actual_bytes)
+        global_byte_array_var = self.literal_pool.byte_array(actual_bytes)
         zero_i32 = ir.Constant(ir.IntType(32), 0)
         ptr_to_first_byte_const = global_byte_array_var.gep([zero_i32, zero_i32])
         usize_type = self.llvm_types.get('usize'); # ... (check usize_type) ...
@@ -2006,35 +2555,108 @@ class CodeGenVisitor:
         return current_agg_val
 
 
+    # Até este número de elementos, [c; N] constante não-zero ainda vira um inicializador constante.
+    ARRAY_REPEAT_CONSTANT_LIMIT = 64
+
+    def is_zero_constant(self, value: Optional[ir.Value]) -> bool:
+        if not isinstance(value, ir.Constant) or value.constant is ir.Undefined: return False
+        return value.constant is None or (isinstance(value.constant, int) and value.constant == 0)
+
+    def is_literal_constant_node(self, node: ast.Expression) -> bool:
+        # Literais (e casts/negações deles): avaliáveis sem gerar código nem erros.
+        if isinstance(node, (ast.IntegerLiteral, ast.BooleanLiteral, ast.CharLiteral, ast.NamespaceAccess)): return True
+        if isinstance(node, ast.CastExpr): return self.is_literal_constant_node(node.expr)
+        if isinstance(node, ast.UnaryOp) and node.op in ('-', '~', '!'): return self.is_literal_constant_node(node.operand)
+        return False
+
+    def prepare_array_repeat(self, node: ast.ArrayRepeatExpr, expected_llvm_type: Optional[ir.Type] = None) -> Optional[Tuple[ir.ArrayType, ir.Value]]:
+        """Avalia N e o valor de [v; N] uma única vez. Retorna (tipo do array, valor do elemento)."""
+        const_size_val = self.evaluate_constant_expression(node.size, self.llvm_types.get('usize'))
+        if not (isinstance(const_size_val, ir.Constant) and isinstance(const_size_val.type, ir.IntType)): self.add_error("Tamanho de array repeat não constante.", node.size); return None
+        array_size = const_size_val.constant
+        expected_element_type_from_context: Optional[ir.Type] = None
+        if isinstance(expected_llvm_type, ir.ArrayType):
+            expected_element_type_from_context = expected_llvm_type.element
+            if expected_llvm_type.count != array_size: self.add_error(f"Tamanho de array repeat ({array_size}) difere do esperado ({expected_llvm_type.count}).", node.size); return None
+        if self.is_literal_constant_node(node.value):
+            llvm_val_to_repeat = self.evaluate_constant_expression(node.value, expected_element_type_from_context)
+        else:
+            llvm_val_to_repeat = self.visit(node.value, expected_llvm_type=expected_element_type_from_context)
+        if llvm_val_to_repeat is None: self.add_error("Falha ao gerar valor de array repeat.", node.value); return None
+        element_llvm_type_final = llvm_val_to_repeat.type
+        if expected_element_type_from_context and element_llvm_type_final != expected_element_type_from_context:
+            casted_val = None # ... (lógica de cast) ...
+            if isinstance(element_llvm_type_final, ir.IntType) and isinstance(expected_element_type_from_context, ir.IntType):
+               is_signed = self.is_signed_type_heuristic(getattr(node.value,'atom_type',None), element_llvm_type_final)
+               if expected_element_type_from_context.width > element_llvm_type_final.width: casted_val = self.builder.sext(llvm_val_to_repeat, expected_element_type_from_context) if is_signed else self.builder.zext(llvm_val_to_repeat, expected_element_type_from_context)
+               elif expected_element_type_from_context.width < element_llvm_type_final.width: casted_val = self.builder.trunc(llvm_val_to_repeat, expected_element_type_from_context)
+               else: casted_val = self.builder.bitcast(llvm_val_to_repeat, expected_element_type_from_context)
+            if casted_val: llvm_val_to_repeat = casted_val; element_llvm_type_final = casted_val.type
+            else: self.add_error(f"Tipo do valor repetido ({element_llvm_type_final}) incompatível com {expected_element_type_from_context}.", node.value); return None
+        return ir.ArrayType(element_llvm_type_final, array_size), llvm_val_to_repeat
+
+    def fill_array_repeat(self, dest_ptr: ir.Value, value: ir.Value):
+        """Preenche o array apontado por dest_ptr com value: memset ou laço, tamanho do IR constante em N."""
+        array_type: ir.ArrayType = dest_ptr.type.pointee
+        count = array_type.count
+        if count == 0: return
+        usize_type = self.llvm_types['usize']
+        element_type = array_type.element
+        is_zero = self.is_zero_constant(value)
+        if (is_zero or (isinstance(element_type, ir.IntType) and element_type.width == 8)) and self.target_data is not None:
+            # Zero (qualquer tipo) ou elementos de 1 byte: um único llvm.memset
+            i8_ptr_type = ir.PointerType(ir.IntType(8))
+            memset_func = self.module.declare_intrinsic('llvm.memset', [i8_ptr_type, usize_type])
+            byte_value = ir.Constant(ir.IntType(8), 0) if is_zero else value
+            dest_i8 = self.builder.bitcast(dest_ptr, i8_ptr_type, name="repeat.dest")
+            byte_size = ir.Constant(usize_type, array_type.get_abi_size(self.target_data))
+            self.builder.call(memset_func, [dest_i8, byte_value, byte_size, ir.Constant(ir.IntType(1), 0)])
+            return
+        zero_const_32 = ir.Constant(ir.IntType(32), 0)
+        if count <= 4: # Poucos elementos: stores diretos
+            for i in range(count):
+                elem_ptr = self.builder.gep(dest_ptr, [zero_const_32, ir.Constant(ir.IntType(32), i)], name=f"repeat.elem{i}.ptr", inbounds=True)
+                self.builder.store(value, elem_ptr)
+            return
+        # Laço de preenchimento: índice canônico 0..N com um único latch
+        current_function = self.builder.function
+        preheader_block = self.builder.block
+        fill_block = current_function.append_basic_block(name="repeat.fill")
+        end_block = current_function.append_basic_block(name="repeat.end")
+        self.builder.branch(fill_block)
+        self.builder.position_at_end(fill_block)
+        index = self.builder.phi(usize_type, name="repeat.idx")
+        index.add_incoming(ir.Constant(usize_type, 0), preheader_block)
+        elem_ptr = self.builder.gep(dest_ptr, [zero_const_32, index], name="repeat.elem.ptr", inbounds=True)
+        self.builder.store(value, elem_ptr)
+        next_index = self.builder.add(index, ir.Constant(usize_type, 1), name="repeat.next", flags=['nuw'])
+        index.add_incoming(next_index, fill_block)
+        done = self.builder.icmp_unsigned('>=', next_index, ir.Constant(usize_type, count), name="repeat.done")
+        self.builder.cbranch(done, end_block, fill_block)
+        self.builder.position_at_end(end_block)
+
+    def bind_array_repeat(self, value_node: ast.ArrayRepeatExpr, var_name: str, expected_llvm_type: Optional[ir.Type]) -> Optional[ir.Value]:
+        # let/mut x = [v; N]: preenche direto o slot da variável (sem agregado SSA de N elementos)
+        prepared = self.prepare_array_repeat(value_node, expected_llvm_type)
+        if prepared is None: return None
+        array_type, value = prepared
+        llvm_ptr = self.create_entry_alloca(array_type, name=var_name + ".addr")
+        self.fill_array_repeat(llvm_ptr, value)
+        return llvm_ptr
+
     def visit_ArrayRepeatExpr(self, node: ast.ArrayRepeatExpr, expected_llvm_type: Optional[ir.Type] = None) -> Optional[ir.Value]:
-         # ... (código como antes) ...
-         if not self.builder: self.add_error(...); return None
-         const_size_val = self.evaluate_constant_expression(node.size, self.llvm_types.get('usize'))
-         if not (isinstance(const_size_val, ir.Constant) and isinstance(const_size_val.type, ir.IntType)): self.add_error(...); return None
-         array_size = const_size_val.constant
-         expected_element_type_from_context: Optional[ir.Type] = None
-         if isinstance(expected_llvm_type, ir.ArrayType):
-             expected_element_type_from_context = expected_llvm_type.element
-             if expected_llvm_type.count != array_size: self.add_error(...); return None
-         llvm_val_to_repeat = self.visit(node.value, expected_llvm_type=expected_element_type_from_context)
-         if llvm_val_to_repeat is None: self.add_error(...); return None
-         element_llvm_type_final = llvm_val_to_repeat.type
-         if expected_element_type_from_context and element_llvm_type_final != expected_element_type_from_context:
-             casted_val = None # ... (lógica de cast) ...
-             if isinstance(element_llvm_type_final, ir.IntType) and isinstance(expected_element_type_from_context, ir.IntType):
-                is_signed = self.is_signed_type_heuristic(getattr(node.value,'atom_type',None), element_llvm_type_final)
-                if expected_element_type_from_context.width > element_llvm_type_final.width: casted_val = self.builder.sext(llvm_val_to_repeat, expected_element_type_from_context) if is_signed else self.builder.zext(llvm_val_to_repeat, expected_element_type_from_context)
-                elif expected_element_type_from_context.width < element_llvm_type_final.width: casted_val = self.builder.trunc(llvm_val_to_repeat, expected_element_type_from_context)
-                else: casted_val = self.builder.bitcast(llvm_val_to_repeat, expected_element_type_from_context)
-             if casted_val: llvm_val_to_repeat = casted_val; element_llvm_type_final = casted_val.type
-             else: self.add_error(...); return None
-         final_array_llvm_type = ir.ArrayType(element_llvm_type_final, array_size)
-         if expected_llvm_type and final_array_llvm_type != expected_llvm_type : self.add_error(...); return None
-         undef_array_val = ir.Constant(final_array_llvm_type, None)
-         current_agg_val = undef_array_val
-         for i in range(array_size):
-             current_agg_val = self.builder.insert_value(current_agg_val, llvm_val_to_repeat, i, name=f"repeat.elem{i}")
-         return current_agg_val
+         if not self.builder: self.add_error("Builder inativo para ArrayRepeatExpr.", node); return None
+         prepared = self.prepare_array_repeat(node, expected_llvm_type)
+         if prepared is None: return None
+         final_array_llvm_type, llvm_val_to_repeat = prepared
+         if isinstance(llvm_val_to_repeat, ir.Constant):
+             if self.is_zero_constant(llvm_val_to_repeat): return ir.Constant(final_array_llvm_type, None) # zeroinitializer
+             if final_array_llvm_type.count <= self.ARRAY_REPEAT_CONSTANT_LIMIT:
+                 return ir.Constant(final_array_llvm_type, [llvm_val_to_repeat] * final_array_llvm_type.count)
+         # Contexto de valor (campo, argumento...): preenche um temporário e carrega o agregado
+         temp_ptr = self.create_entry_alloca(final_array_llvm_type, name="repeat.tmp")
+         self.fill_array_repeat(temp_ptr, llvm_val_to_repeat)
+         return self.builder.load(temp_ptr, name="repeat.val")
 
 
     def visit_StructLiteral(self, node: ast.StructLiteral, expected_llvm_type: Optional[ir.Type] = None) -> Optional[ir.Value]:
@@ -2104,7 +2726,42 @@ class CodeGenVisitor:
         return const_val
 
 # --- Função Principal para Geração ---
-def generate_llvm_ir(program_node: ast.Program) -> str:
-    generator = CodeGenVisitor()
-    llvm_ir_string = generator.generate_code(program_node)
+@profiler.profiled("link")
+def link_executable(object_paths: List[str], output_path: str, runtime_object: Optional[str] = None, linker: str = "cc") -> str:
+    # Liga os objetos (e opcionalmente um runtime.o pré-compilado) com o driver C do sistema.
+    command = [linker, *object_paths]
+    if runtime_object: command.append(runtime_object)
+    command += ["-o", output_path]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Falha ao ligar '{output_path}' ({' '.join(command)}):\n{result.stderr.strip()}")
+    return output_path
+
+def build_executable(program: Union[ast.Program, str, llvm.ModuleRef], output_path: str, runtime_object: Optional[str] = None,
+                     opt_level: int = 0, opt_preset: str = 'speed', unchecked_indexing: bool = False, overflow_mode: str = 'wrap',
+                     prove_bounds: bool = True) -> str:
+    # AST (ou IR já gerado, veja module_for) -> objeto (em processo) -> executável; o .o fica ao lado do executável.
+    generator = CodeGenVisitor(opt_level, opt_preset, unchecked_indexing, overflow_mode, prove_bounds)
+    llvm_module = generator.module_for(program)
+    object_path = os.path.splitext(output_path)[0] + ".o"
+    generator.emit_object(object_path, llvm_module)
+    return link_executable([object_path], output_path, runtime_object)
+
+def run_jit(program: Union[ast.Program, str, llvm.ModuleRef], opt_level: int = 0, opt_preset: str = 'speed',
+            entry: str = "main", runtime_object: Optional[str] = RUNTIME_OBJECT, unchecked_indexing: bool = False,
+            overflow_mode: str = 'wrap', prove_bounds: bool = True) -> int:
+    # AST (ou IR já gerado, veja module_for) -> módulo -> MCJIT -> chama 'entry' no próprio processo (sem clang, ligação ou exec).
+    # Um pânico de bounds check (ou de overflow no modo checked) chama abort() e encerra o processo hospedeiro, como no executável.
+    # O MCJIT passa a ser dono do módulo: um llvm.ModuleRef recebido aqui não deve ser usado depois.
+    generator = CodeGenVisitor(opt_level, opt_preset, unchecked_indexing, overflow_mode, prove_bounds)
+    llvm_module = generator.module_for(program)
+    engine = generator.create_jit_engine(llvm_module, runtime_object=runtime_object)
+    return generator.call_jit_entry(engine, llvm_module, entry)
+
+def generate_llvm_ir(program_node: ast.Program, opt_level: int = 0, opt_preset: str = 'speed',
+                     unchecked_indexing: bool = False, overflow_mode: str = 'wrap', prove_bounds: bool = True) -> str:
+    generator = CodeGenVisitor(opt_level, opt_preset, unchecked_indexing, overflow_mode, prove_bounds)
+    llvm_ir_string = generator.generate_code(program_node); generator.check_errors()
+    if generator.opt_level > 0:
+        llvm_ir_string = str(generator.optimize_module())
     return llvm_ir_string
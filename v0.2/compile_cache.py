@@ -0,0 +1,220 @@
+# compile_cache.py - Cache em disco, endereçado por conteúdo, do resultado final da compilação
+#
+# Uso: python compile_cache.py arquivo.atom... [-o dir_saida] [--obj] [-O nível] [--unchecked] [--overflow modo] [--no-bounds-analysis] [--stats] [--clear]
+#
+# A chave é sha256(fonte) + versão do compilador + triple do alvo + nível de otimização (e os modos
+# sem bounds checks, --unchecked, de overflow, --overflow, e sem o bounds_analysis, --no-bounds-analysis) + tipo do artefato (IR textual ou objeto). Um acerto devolve o artefato gravado sem importar o parser,
+# sem análise semântica e sem CodeGen. O diretório tem tamanho máximo; ao passar dele, as
+# entradas menos usadas recentemente (mtime, atualizado a cada acerto) são removidas.
+# O diretório é do usuário ($XDG_CACHE_HOME/atom ou ~/.cache/atom), criado com modo 0o700: os objetos do
+# cache são ligados direto no executável, então um diretório de outro usuário (ou que outros possam
+# escrever) é recusado e a compilação segue sem cache.
+import os
+import stat
+import hashlib
+import argparse
+from typing import Dict, Optional, Tuple
+
+import llvmlite
+import llvmlite.binding as llvm
+from diagnostics import get_logger
+
+log = get_logger("cache")
+
+def user_cache_dir(name: str) -> str:
+    # Por usuário, nunca um caminho fixo no /tmp: lá qualquer um pode criar o diretório antes e plantar entradas
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "atom", name)
+
+def ensure_private_dir(path: str):
+    """Cria o diretório (modo 0o700) se preciso; PermissionError se não for do usuário atual ou se outros puderem escrever nele."""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    st = os.stat(path)
+    if hasattr(os, "getuid") and st.st_uid != os.getuid():
+        raise PermissionError(f"'{path}' pertence a outro usuário (uid {st.st_uid})")
+    if st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise PermissionError(f"'{path}' pode ser escrito por outros usuários (modo {stat.S_IMODE(st.st_mode):o})")
+
+ATOM_COMPILE_CACHE_DIR = os.environ.get("ATOM_COMPILE_CACHE_DIR") or user_cache_dir("compile")
+ATOM_COMPILE_CACHE_MAX_BYTES = int(os.environ.get("ATOM_COMPILE_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+ARTIFACT_SUFFIXES = {'ir': '.ll', 'obj': '.o', 'iface': '.atomi'} # 'iface': interface de módulo (module_loader.py)
+# Arquivos cujo conteúdo define o compilador: qualquer mudança neles invalida o cache inteiro
+COMPILER_SOURCES = ("ast_nodes.py", "parser_lark.py", "semantic_analyzer.py", "bounds_analysis.py", "codegen_llvm.py", "module_loader.py")
+
+_compiler_version: Optional[str] = None
+
+def compiler_version() -> str:
+    # "Versão" = hash das fontes do compilador + versões do llvmlite/LLVM (mudam o IR e o objeto gerados).
+    global _compiler_version
+    if _compiler_version is None:
+        h = hashlib.sha256()
+        here = os.path.dirname(os.path.abspath(__file__))
+        for name in COMPILER_SOURCES:
+            with open(os.path.join(here, name), "rb") as f: h.update(name.encode('utf8') + b"\0" + f.read() + b"\0")
+        h.update(f"llvmlite {llvmlite.__version__} llvm {llvm.llvm_version_info}".encode('utf8'))
+        _compiler_version = h.hexdigest()
+    return _compiler_version
+
+class CompileCache:
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = cache_dir or ATOM_COMPILE_CACHE_DIR
+        self.max_bytes = ATOM_COMPILE_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.hits = 0; self.misses = 0; self.stores = 0; self.evictions = 0
+        self._index: Optional[Dict[str, Tuple[int, float]]] = None # caminho -> (bytes, último uso)
+        self._total_bytes = 0
+        self._usable: Optional[bool] = None # O diretório passou por ensure_private_dir (conferido uma vez)
+
+    def usable(self) -> bool:
+        if self._usable is None:
+            try: ensure_private_dir(self.cache_dir); self._usable = True
+            except OSError as e:
+                log.warning("cache de compilação desativado: %s", e)
+                self._usable = False
+        return self._usable
+
+    def key(self, source: str, kind: str = 'ir', opt_level: int = 0, opt_preset: str = 'speed',
+            triple: Optional[str] = None, deps: str = "", unchecked_indexing: bool = False, overflow_mode: str = 'wrap',
+            prove_bounds: bool = True) -> str:
+        # deps: identifica as interfaces importadas pela fonte (o resultado também depende delas)
+        if kind not in ARTIFACT_SUFFIXES: raise ValueError(f"Tipo de artefato inválido: '{kind}' (use {', '.join(ARTIFACT_SUFFIXES)})")
+        h = hashlib.sha256()
+        for part in (hashlib.sha256(source.encode('utf8')).hexdigest(), compiler_version(),
+                     triple or llvm.get_default_triple(), f"O{opt_level}/{opt_preset}" + ("/unchecked" if unchecked_indexing else "") + (f"/overflow-{overflow_mode}" if overflow_mode != 'wrap' else "")
+                     + ("" if prove_bounds else "/no-bounds-analysis"), kind, deps):
+            h.update(part.encode('utf8') + b"\0")
+        return h.hexdigest()
+
+    def _path(self, key: str, kind: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + ARTIFACT_SUFFIXES[kind])
+
+    def _load_index(self) -> Dict[str, Tuple[int, float]]:
+        # Varre o diretório uma vez por instância; depois o índice é mantido em memória.
+        if self._index is None:
+            self._index = {}; self._total_bytes = 0
+            if self.usable() and os.path.isdir(self.cache_dir):
+                for root, _, files in os.walk(self.cache_dir):
+                    for name in files:
+                        if not name.endswith(tuple(ARTIFACT_SUFFIXES.values())): continue
+                        path = os.path.join(root, name)
+                        try: st = os.stat(path)
+                        except OSError: continue
+                        self._index[path] = (st.st_size, st.st_mtime)
+                        self._total_bytes += st.st_size
+        return self._index
+
+    def get(self, key: str, kind: str = 'ir') -> Optional[bytes]:
+        path = self._path(key, kind)
+        if not self.usable(): self.misses += 1; return None
+        try:
+            with open(path, "rb") as f: data = f.read()
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        try: os.utime(path) # Marca como usado agora (ordem do LRU)
+        except OSError: pass
+        if self._index is not None and path in self._index: self._index[path] = (len(data), os.path.getmtime(path))
+        return data
+
+    def put(self, key: str, kind: str, data: bytes):
+        if not self.usable(): return
+        path = self._path(key, kind)
+        index = self._load_index()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f: f.write(data)
+            os.replace(tmp_path, path) # Leitores concorrentes nunca veem uma entrada pela metade
+        except OSError as e:
+            log.warning("não foi possível gravar no cache de compilação (%s)", e)
+            return
+        self.stores += 1
+        old_size = index.get(path, (0, 0.0))[0]
+        index[path] = (len(data), os.path.getmtime(path))
+        self._total_bytes += len(data) - old_size
+        self.evict()
+
+    def evict(self):
+        # Remove as entradas menos usadas recentemente até caber em max_bytes.
+        index = self._load_index()
+        if self._total_bytes <= self.max_bytes: return
+        for path, (size, _) in sorted(index.items(), key=lambda item: item[1][1]):
+            if self._total_bytes <= self.max_bytes: break
+            try: os.remove(path)
+            except OSError: pass
+            del index[path]
+            self._total_bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        index = self._load_index()
+        for path in list(index):
+            try: os.remove(path)
+            except OSError: pass
+        index.clear(); self._total_bytes = 0
+
+    def stats(self) -> Dict[str, object]:
+        lookups = self.hits + self.misses
+        self._load_index()
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hits / lookups if lookups else 0.0,
+                'stores': self.stores, 'evictions': self.evictions,
+                'entries': len(self._index), 'bytes': self._total_bytes, 'max_bytes': self.max_bytes}
+
+_default_cache: Optional[CompileCache] = None
+
+def get_default_cache() -> CompileCache:
+    global _default_cache
+    if _default_cache is None: _default_cache = CompileCache()
+    return _default_cache
+
+def compile_source(source: str, kind: str = 'ir', opt_level: int = 0, opt_preset: str = 'speed',
+                   cache: Optional[CompileCache] = None, unchecked_indexing: bool = False, overflow_mode: str = 'wrap',
+                   prove_bounds: bool = True) -> bytes:
+    """Compila uma fonte Atom (sem imports) para IR textual ('ir') ou objeto ('obj'), passando pelo cache."""
+    if kind not in ('ir', 'obj'): raise ValueError(f"compile_source gera 'ir' ou 'obj', não '{kind}'")
+    cache = cache or get_default_cache()
+    key = cache.key(source, kind, opt_level, opt_preset, unchecked_indexing=unchecked_indexing, overflow_mode=overflow_mode, prove_bounds=prove_bounds)
+    cached = cache.get(key, kind)
+    if cached is not None: return cached
+
+    # Falta no cache: só aqui o front-end e o CodeGen são importados
+    from parser_lark import parse_atom
+    from semantic_analyzer import analyze_semantics
+    from codegen_llvm import CodeGenVisitor
+    program = parse_atom(source)
+    semantic_errors = analyze_semantics(program, prove_bounds)
+    if semantic_errors: raise ValueError(f"{len(semantic_errors)} erros semânticos: {semantic_errors[0]}")
+    generator = CodeGenVisitor(opt_level, opt_preset, unchecked_indexing, overflow_mode, prove_bounds)
+    llvm_ir = generator.generate_code(program); generator.check_errors()
+    if kind == 'obj': data = generator.emit_object()
+    else: data = (str(generator.optimize_module()) if generator.opt_level > 0 else llvm_ir).encode('utf8')
+    cache.put(key, kind, data) # Só resultados sem erro entram no cache
+    return data
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description="Compila fontes Atom usando o cache de compilação.")
+    arg_parser.add_argument("sources", nargs="*")
+    arg_parser.add_argument("-o", "--out-dir", default=".")
+    arg_parser.add_argument("--obj", action="store_true", help="Gera objetos (.o) em vez de IR (.ll)")
+    arg_parser.add_argument("-O", dest="opt", default="0", help="Nível de otimização: 0-3, s ou z")
+    arg_parser.add_argument("--unchecked", action="store_true", help="Indexação de arrays/slices sem bounds check")
+    arg_parser.add_argument("--overflow", default="wrap", choices=("wrap", "checked", "assume"), help="Overflow de inteiros com sinal: wrap (padrão), checked (aborta) ou assume (nsw)")
+    arg_parser.add_argument("--no-bounds-analysis", action="store_true", help="Não usa o bounds_analysis: mantém todo bounds check (para comparar builds)")
+    arg_parser.add_argument("--stats", action="store_true", help="Mostra as estatísticas do cache ao final")
+    arg_parser.add_argument("--clear", action="store_true", help="Esvazia o cache antes de compilar")
+    ns = arg_parser.parse_args()
+    from diagnostics import configure_logging
+    from codegen_llvm import parse_opt_level
+    configure_logging()
+    opt_level, opt_preset = parse_opt_level(ns.opt)
+    kind = 'obj' if ns.obj else 'ir'
+    cache = get_default_cache()
+    if ns.clear: cache.clear()
+    for source_path in ns.sources:
+        with open(source_path, encoding="utf8") as f: source = f.read()
+        data = compile_source(source, kind, opt_level, opt_preset, cache, ns.unchecked, ns.overflow, not ns.no_bounds_analysis)
+        out_path = os.path.join(ns.out_dir, os.path.splitext(os.path.basename(source_path))[0] + ARTIFACT_SUFFIXES[kind])
+        with open(out_path, "wb") as f: f.write(data)
+    if ns.stats:
+        for name, value in cache.stats().items(): print(f"{name}: {value}")
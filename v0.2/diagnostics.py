@@ -0,0 +1,126 @@
+# diagnostics.py - Diagnósticos do compilador (erros/avisos com dedupe) e o logger 'atom'
+#
+# Uso: ATOM_LOG=debug python parser_lark.py   (níveis: debug, note, warning, error; padrão: desligado)
+#
+# DiagnosticEngine guarda os diagnósticos de uma fase (análise semântica, CodeGen) em ordem de chegada.
+# Repetições (mesma severidade, mensagem e posição) são descartadas por um set, em O(1). A mensagem
+# pode vir como formato + argumentos ('%s'), formatados só quando o texto é pedido (messages(), str()).
+# O logger 'atom' (e os filhos 'atom.parse', 'atom.semantic', 'atom.codegen') fica desligado até
+# configure_logging: sem ATOM_LOG, log.debug(...) e os ecos de diagnósticos custam só o teste de
+# nível, sem montar a mensagem e sem I/O no console. Ligado, escreve em stderr.
+import os
+import sys
+import logging
+from enum import IntEnum
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+class Severity(IntEnum): # Valores iguais aos níveis do logging (NOTE = INFO)
+    DEBUG = logging.DEBUG
+    NOTE = logging.INFO
+    WARNING = logging.WARNING
+    ERROR = logging.ERROR
+
+SEVERITY_NAMES: Dict[str, Severity] = {'debug': Severity.DEBUG, 'note': Severity.NOTE, 'info': Severity.NOTE,
+                                       'warning': Severity.WARNING, 'warn': Severity.WARNING, 'error': Severity.ERROR}
+
+LOG_OFF = logging.CRITICAL + 1 # Acima de qualquer nível usado: isEnabledFor sempre falso
+
+log = logging.getLogger("atom")
+log.addHandler(logging.NullHandler())
+log.propagate = False # Nunca cai no handler 'last resort' do logging (que imprimiria avisos em stderr)
+log.setLevel(LOG_OFF)
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger filho de 'atom' (ex.: get_logger('codegen') -> 'atom.codegen'), herda o nível configurado."""
+    return log.getChild(name)
+
+def configure_logging(level: Optional[str] = None, stream=None) -> bool:
+    """Liga o logger 'atom' no nível dado (ou em ATOM_LOG); sem nível, deixa-o desligado. Devolve se ficou ligado."""
+    if level is None: level = os.environ.get("ATOM_LOG", "")
+    for handler in [h for h in log.handlers if not isinstance(h, logging.NullHandler)]: log.removeHandler(handler)
+    severity = SEVERITY_NAMES.get(level.strip().lower())
+    if severity is None: log.setLevel(LOG_OFF); return False
+    handler = logging.StreamHandler(stream if stream is not None else sys.stderr)
+    handler.setFormatter(logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+    log.addHandler(handler); log.setLevel(int(severity))
+    return True
+
+class lazy:
+    """Argumento de log calculado só se a mensagem for formatada: log.debug("tipo %s", lazy(f, t))."""
+    __slots__ = ('func', 'args')
+    def __init__(self, func: Callable[..., object], *args):
+        self.func = func; self.args = args
+    def __str__(self) -> str: return str(self.func(*self.args))
+
+class Diagnostic:
+    __slots__ = ('severity', 'message', 'args', 'line', 'column', 'title', '_text')
+
+    def __init__(self, severity: Severity, message: object, args: tuple, line: Optional[int], column: object, title: str):
+        self.severity = severity; self.message = message; self.args = args
+        self.line = line; self.column = column; self.title = title
+        self._text: Optional[str] = None
+
+    @property
+    def position(self) -> str:
+        return f" (linha {self.line}, col {self.column})" if self.line is not None else ""
+
+    @property
+    def text(self) -> str:
+        # Formatado na primeira leitura e guardado
+        if self._text is None:
+            message = self.message % self.args if self.args else str(self.message)
+            self._text = f"{self.title}{self.position}: {message}"
+        return self._text
+
+    def __str__(self) -> str: return self.text
+
+    def __repr__(self) -> str: return f"Diagnostic({self.severity.name}, {self.text!r})"
+
+def node_position(node) -> Tuple[Optional[int], object]:
+    meta = getattr(node, 'meta', None) if node is not None else None
+    if meta is None or not hasattr(meta, 'line'): return None, None
+    return meta.line, getattr(meta, 'column', '?')
+
+class DiagnosticEngine:
+    """
+    Diagnósticos de uma fase. 'titles' dá o prefixo do texto por severidade (ex.: 'Erro Semântico');
+    os diagnósticos aceitos também são repassados ao 'logger' (formatados só se ele estiver ligado).
+    """
+    def __init__(self, titles: Dict[Severity, str], logger: logging.Logger = log):
+        self.titles = titles
+        self.logger = logger
+        self.diagnostics: List[Diagnostic] = []
+        self.seen: Set[tuple] = set()
+        self.counts: Dict[Severity, int] = {severity: 0 for severity in Severity}
+
+    def clear(self):
+        self.diagnostics = []; self.seen = set()
+        self.counts = {severity: 0 for severity in Severity}
+
+    def report(self, severity: Severity, message: object, *args, node=None) -> bool:
+        """Registra um diagnóstico; devolve False se um igual (severidade, mensagem, posição) já existia."""
+        line, column = node_position(node)
+        key = (severity, message, args, line, column)
+        try:
+            if key in self.seen: return False
+            self.seen.add(key)
+        except TypeError: # Argumento não-hashable: compara pelo texto formatado
+            text_key = (severity, str(Diagnostic(severity, message, args, line, column, "")), line, column)
+            if text_key in self.seen: return False
+            self.seen.add(text_key)
+        diagnostic = Diagnostic(severity, message, args, line, column, self.titles.get(severity, severity.name.capitalize()))
+        self.diagnostics.append(diagnostic); self.counts[severity] += 1
+        if self.logger.isEnabledFor(severity): self.logger.log(severity, "%s", diagnostic)
+        return True
+
+    def error(self, message: object, *args, node=None) -> bool: return self.report(Severity.ERROR, message, *args, node=node)
+    def warning(self, message: object, *args, node=None) -> bool: return self.report(Severity.WARNING, message, *args, node=node)
+    def note(self, message: object, *args, node=None) -> bool: return self.report(Severity.NOTE, message, *args, node=node)
+
+    def has_errors(self) -> bool: return self.counts[Severity.ERROR] > 0
+
+    def messages(self, severity: Severity = Severity.ERROR) -> List[str]:
+        """Textos (formatados agora, se ainda não foram) dos diagnósticos com exatamente essa severidade."""
+        return [d.text for d in self.diagnostics if d.severity == severity]
+
+    def __len__(self) -> int: return len(self.diagnostics)
@@ -0,0 +1,285 @@
+# module_loader.py - Imports entre arquivos Atom e cache de interfaces por módulo
+#
+# Uso: python module_loader.py main.atom [-o programa] [-O nível] [-j processos] [--out-dir dir] [--unchecked] [--overflow modo] [--no-bounds-analysis] [--stats]
+#
+# `import "caminho.atom";` (relativo ao arquivo que importa) torna visíveis os structs, enums,
+# consts e assinaturas de função definidos no módulo importado (e, transitivamente, nos que ele
+# importa). Cada módulo vira:
+#   - uma interface (ModuleInterface): só as declarações exportadas, sem corpos de função.
+#     Depende só da fonte do módulo, é gerada com um parse (sem análise semântica) e fica no
+#     CompileCache ('iface'), então quem importa carrega a interface em vez de reprocessar o corpo.
+#     Fica gravada em JSON (só dados: carregar uma entrada do cache nunca executa código);
+#   - um objeto: o módulo analisado e compilado sozinho, com as interfaces importadas. A chave do
+#     cache inclui a impressão digital dessas interfaces: mudar o corpo de uma função recompila só
+#     aquele módulo; mudar uma assinatura recompila também quem o importa.
+# No final, os objetos são ligados com o runtime.o. Com -j N (N > 1) as interfaces e depois os
+# objetos são gerados em N processos (ProcessPoolExecutor): como cada módulo só depende das
+# interfaces dos outros, todos os objetos podem ser compilados ao mesmo tempo.
+import os
+import json
+import hashlib
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, fields
+from typing import Dict, List, Optional, Tuple, Any
+
+import ast_nodes as ast
+from compile_cache import CompileCache, get_default_cache
+from diagnostics import get_logger
+
+log = get_logger("modules")
+
+@dataclass
+class ModuleInterface:
+    """Declarações exportadas por um módulo Atom (o que quem o importa precisa ver)."""
+    path: str              # Caminho absoluto da fonte
+    imports: List[str]     # Caminhos absolutos dos módulos importados diretamente
+    items: List[ast.Node]  # StructDef, EnumDef, ConstDef e um ExternBlock com as assinaturas das funções
+    fingerprint: str       # Hash das declarações: só muda quando a API exportada muda
+
+def resolve_import_path(import_path: str, importer_path: str) -> str:
+    return os.path.abspath(os.path.join(os.path.dirname(importer_path), import_path))
+
+def extract_interface(program: ast.Program, path: str) -> ModuleInterface:
+    items: List[ast.Node] = []
+    signatures: List[ast.FunctionDecl] = []
+    imports: List[str] = []
+    for item in program.body:
+        if isinstance(item, (ast.StructDef, ast.EnumDef, ast.ConstDef)): items.append(item)
+        elif isinstance(item, ast.FunctionDef):
+            signatures.append(ast.FunctionDecl(name=item.name, params=item.params, return_type=item.return_type))
+        elif isinstance(item, ast.ImportDecl): imports.append(resolve_import_path(item.path.value, path))
+        # Blocos extern do módulo não são exportados: quem importa declara os seus
+    if signatures: items.append(ast.ExternBlock(abi=ast.StringLiteral("Atom"), declarations=signatures))
+    fingerprint = hashlib.sha256(repr(items).encode('utf8')).hexdigest()
+    return ModuleInterface(path=path, imports=imports, items=items, fingerprint=fingerprint)
+
+def encode_ast(value: Any) -> Any:
+    # Nó da AST -> JSON: só os campos do dataclass (anotações das fases seguintes não entram)
+    if isinstance(value, ast.Node): return {"node": type(value).__name__, "fields": {f.name: encode_ast(getattr(value, f.name)) for f in fields(value)}}
+    if isinstance(value, list): return [encode_ast(item) for item in value]
+    if isinstance(value, bytes): return {"bytes": value.hex()}
+    if value is None or isinstance(value, (bool, int, float, str)): return value
+    raise TypeError(f"Valor sem representação na interface: {type(value).__name__}")
+
+def decode_ast(data: Any) -> Any:
+    # Inverso de encode_ast; só constrói classes de ast_nodes
+    if isinstance(data, list): return [decode_ast(item) for item in data]
+    if isinstance(data, dict):
+        if "bytes" in data: return bytes.fromhex(data["bytes"])
+        node_class = getattr(ast, data["node"], None)
+        if not (isinstance(node_class, type) and issubclass(node_class, ast.Node)): raise ValueError(f"Nó desconhecido na interface: {data['node']!r}")
+        return node_class(**{name: decode_ast(value) for name, value in data["fields"].items()})
+    return data
+
+def dump_interface(interface: ModuleInterface) -> bytes:
+    return json.dumps({"path": interface.path, "imports": interface.imports, "items": encode_ast(interface.items),
+                       "fingerprint": interface.fingerprint}).encode('utf8')
+
+def load_interface_data(data: bytes) -> ModuleInterface:
+    fields_data = json.loads(data.decode('utf8'))
+    return ModuleInterface(path=fields_data["path"], imports=list(fields_data["imports"]),
+                           items=decode_ast(fields_data["items"]), fingerprint=fields_data["fingerprint"])
+
+class ModuleLoader:
+    def __init__(self, cache: Optional[CompileCache] = None):
+        self.cache = cache or get_default_cache()
+        self.interfaces: Dict[str, ModuleInterface] = {} # Caminho -> interface (uma carga por processo)
+        self.sources: Dict[str, str] = {}
+        self.programs: Dict[str, ast.Program] = {}       # ASTs já parseadas nesta sessão
+        self.parse_count = 0
+
+    def read_source(self, path: str) -> str:
+        if path not in self.sources:
+            with open(path, encoding="utf8") as f: self.sources[path] = f.read()
+        return self.sources[path]
+
+    def parse_module(self, path: str) -> ast.Program:
+        if path not in self.programs:
+            from parser_lark import parse_atom # Só quando há algo a parsear: acertos no cache não importam o parser
+            self.programs[path] = parse_atom(self.read_source(path))
+            self.parse_count += 1
+        return self.programs[path]
+
+    def read_interface(self, path: str) -> ModuleInterface:
+        # Interface de um único módulo (cache ou parse), sem carregar as dependências.
+        if not os.path.isfile(path): raise FileNotFoundError(f"Módulo importado não encontrado: {path}")
+        key = self.cache.key(self.read_source(path), 'iface')
+        data = self.cache.get(key, 'iface')
+        interface = None
+        if data is not None:
+            try: interface = load_interface_data(data)
+            except (ValueError, KeyError, TypeError) as e: log.warning("interface em cache ilegível para %s (%s); refazendo", path, e)
+        if interface is None or interface.path != path:
+            interface = extract_interface(self.parse_module(path), path)
+            self.cache.put(key, 'iface', dump_interface(interface))
+        return interface
+
+    def load_interface(self, path: str) -> ModuleInterface:
+        path = os.path.abspath(path)
+        if path in self.interfaces: return self.interfaces[path]
+        interface = self.read_interface(path)
+        self.interfaces[path] = interface # Registrado antes das dependências: ciclos de import terminam aqui
+        for dep_path in interface.imports: self.load_interface(dep_path)
+        return interface
+
+    def dependencies(self, path: str) -> List[str]:
+        # Módulos importados por 'path', direta ou transitivamente, dependências antes de quem as usa.
+        path = os.path.abspath(path)
+        ordered: List[str] = []; seen = {path}
+        def walk(current: str):
+            for dep_path in self.load_interface(current).imports:
+                if dep_path in seen: continue
+                seen.add(dep_path); walk(dep_path); ordered.append(dep_path)
+        walk(path)
+        return ordered
+
+    def load_program(self, path: str) -> ast.Program:
+        # AST do módulo com os imports resolvidos: cada ImportDecl recebe sua interface e o programa
+        # recebe imported_items (itens de todas as interfaces alcançáveis, sem repetição).
+        path = os.path.abspath(path)
+        program = self.parse_module(path)
+        for item in program.body:
+            if isinstance(item, ast.ImportDecl):
+                setattr(item, 'interface', self.load_interface(resolve_import_path(item.path.value, path)))
+        imported_items: List[ast.Node] = []
+        for dep_path in self.dependencies(path): imported_items.extend(self.interfaces[dep_path].items)
+        setattr(program, 'imported_items', imported_items)
+        setattr(program, 'exports_functions', True) # Quem importa o módulo chama as funções dele
+        return program
+
+    def compile_module(self, path: str, kind: str = 'obj', opt_level: int = 0, opt_preset: str = 'speed',
+                       unchecked_indexing: bool = False, overflow_mode: str = 'wrap', prove_bounds: bool = True) -> bytes:
+        path = os.path.abspath(path)
+        deps = ";".join(f"{dep_path}={self.load_interface(dep_path).fingerprint}" for dep_path in self.dependencies(path))
+        key = self.cache.key(self.read_source(path), kind, opt_level, opt_preset, deps=deps, unchecked_indexing=unchecked_indexing, overflow_mode=overflow_mode, prove_bounds=prove_bounds)
+        cached = self.cache.get(key, kind)
+        if cached is not None: return cached
+        from semantic_analyzer import analyze_semantics
+        from codegen_llvm import CodeGenVisitor
+        program = self.load_program(path)
+        semantic_errors = analyze_semantics(program, prove_bounds)
+        if semantic_errors: raise ValueError(f"{os.path.basename(path)}: {len(semantic_errors)} erros semânticos: {semantic_errors[0]}")
+        generator = CodeGenVisitor(opt_level, opt_preset, unchecked_indexing, overflow_mode, prove_bounds)
+        llvm_ir = generator.generate_code(program)
+        try: generator.check_errors()
+        except ValueError as e: raise ValueError(f"{os.path.basename(path)}: {e}") from None
+        if kind == 'obj': data = generator.emit_object()
+        else: data = (str(generator.optimize_module()) if generator.opt_level > 0 else llvm_ir).encode('utf8')
+        self.cache.put(key, kind, data)
+        return data
+
+    def build(self, entry_path: str, output_path: str, out_dir: Optional[str] = None,
+              opt_level: int = 0, opt_preset: str = 'speed', runtime_object: Optional[str] = None,
+              jobs: int = 1, unchecked_indexing: bool = False, overflow_mode: str = 'wrap', prove_bounds: bool = True) -> str:
+        # Compila o módulo de entrada e tudo o que ele importa (um objeto por módulo) e liga.
+        from codegen_llvm import link_executable, RUNTIME_OBJECT
+        entry_path = os.path.abspath(entry_path)
+        out_dir = out_dir or tempfile.mkdtemp(prefix="atom_build_")
+        os.makedirs(out_dir, exist_ok=True)
+        if jobs <= 0: jobs = os.cpu_count() or 1 # 0: um processo por núcleo
+        if jobs > 1:
+            object_paths = self.build_objects_parallel(entry_path, out_dir, opt_level, opt_preset, jobs, unchecked_indexing, overflow_mode, prove_bounds)
+        else:
+            object_paths = []
+            for module_path in self.dependencies(entry_path) + [entry_path]:
+                object_path = os.path.join(out_dir, object_file_name(module_path))
+                with open(object_path, "wb") as f: f.write(self.compile_module(module_path, 'obj', opt_level, opt_preset, unchecked_indexing, overflow_mode, prove_bounds))
+                object_paths.append(object_path)
+        return link_executable(object_paths, output_path, runtime_object or RUNTIME_OBJECT)
+
+    def build_objects_parallel(self, entry_path: str, out_dir: str, opt_level: int, opt_preset: str, jobs: int,
+                               unchecked_indexing: bool = False, overflow_mode: str = 'wrap', prove_bounds: bool = True) -> List[str]:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(self.cache.cache_dir, self.cache.max_bytes)) as executor:
+            # Fase 1: interfaces, em ondas pelo grafo de imports (cada uma revela os próximos módulos)
+            # Quem parseou um módulo devolve também a AST, repassada à fase 2 (cada módulo é parseado uma vez só)
+            pending = {executor.submit(_worker_read_interface, entry_path): entry_path}
+            submitted = {entry_path}
+            parsed_programs: Dict[str, ast.Program] = {}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = pending.pop(future)
+                    interface, program, counters = future.result()
+                    self._merge_worker_counters(counters)
+                    self.interfaces[path] = interface
+                    if program is not None: parsed_programs[path] = program
+                    for dep_path in interface.imports:
+                        if dep_path not in submitted and dep_path not in self.interfaces:
+                            submitted.add(dep_path)
+                            pending[executor.submit(_worker_read_interface, dep_path)] = dep_path
+            # Fase 2: objetos; os módulos são independentes entre si (só leem interfaces do cache)
+            module_paths = self.dependencies(entry_path) + [entry_path]
+            futures = [executor.submit(_worker_compile_module, path, os.path.join(out_dir, object_file_name(path)),
+                                       opt_level, opt_preset, parsed_programs.pop(path, None), unchecked_indexing, overflow_mode, prove_bounds)
+                       for path in module_paths]
+            object_paths = []
+            for future in futures:
+                object_path, counters = future.result()
+                self._merge_worker_counters(counters)
+                object_paths.append(object_path)
+        return object_paths
+
+    def _merge_worker_counters(self, counters: Tuple[int, int, int, int, int]):
+        parses, hits, misses, stores, evictions = counters
+        self.parse_count += parses
+        self.cache.hits += hits; self.cache.misses += misses; self.cache.stores += stores; self.cache.evictions += evictions
+
+# --- Processos do build paralelo: um ModuleLoader por processo, reaproveitado entre tarefas ---
+_worker_loader: Optional[ModuleLoader] = None
+
+def _init_worker(cache_dir: str, max_bytes: int):
+    global _worker_loader
+    from diagnostics import configure_logging
+    configure_logging() # ATOM_LOG vale também nos processos do build paralelo
+    _worker_loader = ModuleLoader(CompileCache(cache_dir, max_bytes))
+
+def _take_worker_counters() -> Tuple[int, int, int, int, int]:
+    # Contadores desde a última tarefa (o pai soma nas próprias estatísticas)
+    loader = _worker_loader; cache = loader.cache
+    counters = (loader.parse_count, cache.hits, cache.misses, cache.stores, cache.evictions)
+    loader.parse_count = 0; cache.hits = 0; cache.misses = 0; cache.stores = 0; cache.evictions = 0
+    return counters
+
+def _worker_read_interface(path: str) -> Tuple[ModuleInterface, Optional[ast.Program], Tuple[int, int, int, int, int]]:
+    interface = _worker_loader.read_interface(path)
+    program = _worker_loader.programs.pop(path, None) # Só existe se a interface precisou de parse
+    return interface, program, _take_worker_counters()
+
+def _worker_compile_module(path: str, object_path: str, opt_level: int, opt_preset: str,
+                           program: Optional[ast.Program] = None, unchecked_indexing: bool = False,
+                           overflow_mode: str = 'wrap', prove_bounds: bool = True) -> Tuple[str, Tuple[int, int, int, int, int]]:
+    if program is not None: _worker_loader.programs[path] = program
+    data = _worker_loader.compile_module(path, 'obj', opt_level, opt_preset, unchecked_indexing, overflow_mode, prove_bounds)
+    _worker_loader.programs.pop(path, None)
+    with open(object_path, "wb") as f: f.write(data)
+    return object_path, _take_worker_counters()
+
+def object_file_name(module_path: str) -> str:
+    # Nome único por caminho: dois 'util.atom' em diretórios diferentes não colidem
+    stem = os.path.splitext(os.path.basename(module_path))[0]
+    return f"{stem}-{hashlib.sha256(module_path.encode('utf8')).hexdigest()[:8]}.o"
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description="Compila um programa Atom com imports (um objeto por módulo) e liga.")
+    arg_parser.add_argument("entry")
+    arg_parser.add_argument("-o", "--output", default="program_atom")
+    arg_parser.add_argument("-O", dest="opt", default="0", help="Nível de otimização: 0-3, s ou z")
+    arg_parser.add_argument("-j", "--jobs", type=int, default=1, help="Processos para compilar módulos em paralelo (padrão 1; 0 = um por núcleo)")
+    arg_parser.add_argument("--out-dir", default=None, help="Diretório dos objetos (padrão: temporário)")
+    arg_parser.add_argument("--unchecked", action="store_true", help="Indexação de arrays/slices sem bounds check (veja bounds_analysis.py --report)")
+    arg_parser.add_argument("--overflow", default="wrap", choices=("wrap", "checked", "assume"), help="Overflow de inteiros com sinal: wrap (padrão), checked (aborta) ou assume (nsw)")
+    arg_parser.add_argument("--no-bounds-analysis", action="store_true", help="Não usa o bounds_analysis: mantém todo bounds check (para comparar builds)")
+    arg_parser.add_argument("--stats", action="store_true", help="Mostra as estatísticas do cache ao final")
+    ns = arg_parser.parse_args()
+    from diagnostics import configure_logging
+    from codegen_llvm import parse_opt_level
+    configure_logging()
+    opt_level, opt_preset = parse_opt_level(ns.opt)
+    loader = ModuleLoader()
+    loader.build(ns.entry, ns.output, ns.out_dir, opt_level, opt_preset, jobs=ns.jobs, unchecked_indexing=ns.unchecked, overflow_mode=ns.overflow, prove_bounds=not ns.no_bounds_analysis)
+    print(f"Executável gerado em {ns.output} ({loader.parse_count} módulos parseados)")
+    if ns.stats:
+        for name, value in loader.cache.stats().items(): print(f"{name}: {value}")
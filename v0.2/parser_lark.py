@@ -1,10 +1,16 @@
 # parser_lark.py (Corrigido erro de sintaxe na gramática)
 import ast_nodes as ast
+import profiler
 import traceback
-from lark import Lark, Transformer, Tree, v_args, Token, exceptions
-from typing import List, Union, Optional, Tuple
+import hashlib
+import os
+from typing import Dict, List, Union, Optional, Tuple
+from diagnostics import get_logger, configure_logging
+from compile_cache import user_cache_dir, ensure_private_dir
 from semantic_analyzer import analyze_semantics
-from codegen_llvm import generate_llvm_ir
+from codegen_llvm import generate_llvm_ir, build_executable, parse_opt_level, run_jit
+
+log = get_logger("parse")
 
 # --- Gramática (v0.2 - Sem Precedência, Else Simplificado, Comentários //) ---
 atom_v02_grammar = r"""
@@ -27,7 +33,7 @@ atom_v02_grammar = r"""
     param_list_for_decl: [type (COMMA type)* [COMMA VARARGS]] -> process_decl_params // 0 ou mais tipos, opcionalmente com ...
                       | VARARGS -> handle_varargs_only       // Apenas ...
                       | -> empty_param_list // Caso sem parâmetros e sem VARARGS
-    func_def: KW_FUNC identifier LPAREN [def_param_list] RPAREN ARROW type statement* KW_END -> mk_func_def // Func body can be empty
+    func_def: KW_UNCHECKED? KW_FUNC identifier LPAREN [def_param_list] RPAREN ARROW type statement* KW_END -> mk_func_def // Func body can be empty; 'unchecked': indexação sem bounds check
     ?def_param_list: parameter (COMMA parameter)*
     parameter: identifier ":" type -> mk_parameter
 
@@ -38,6 +44,7 @@ atom_v02_grammar = r"""
               | if_stmt
               | while_stmt
               | loop_stmt
+              | for_stmt
               | mem_block
               | e_mem_block
               | return_stmt
@@ -54,12 +61,13 @@ atom_v02_grammar = r"""
     break_stmt: KW_BREAK ";" -> mk_break_stmt
     continue_stmt: KW_CONTINUE ";" -> mk_continue_stmt
     if_stmt: KW_IF expression statement* [else_clause] KW_END -> mk_if_stmt
-    ?else_clause: KW_ELSE if_stmt          // else if ...
-                | KW_ELSE statement*       // else ... (sem end proprio)
+    ?else_clause: KW_ELSE statement*       // else ... / else if ... (sem end proprio)
     while_stmt: KW_WHILE expression statement* KW_END -> mk_while_stmt
     loop_stmt: KW_LOOP statement* KW_END -> mk_loop_stmt
-    mem_block: KW_MEM statement* KW_END -> mk_mem_block
-    e_mem_block: KW_E_MEM statement* KW_END -> mk_e_mem_block
+    for_stmt: KW_FOR identifier KW_IN expression DOTDOT expression statement* KW_END -> mk_for_range_stmt // fim exclusivo
+            | KW_FOR identifier KW_IN expression statement* KW_END -> mk_for_slice_stmt // elementos de slice/array
+    mem_block: KW_MEM KW_UNCHECKED? statement* KW_END -> mk_mem_block
+    e_mem_block: KW_E_MEM KW_UNCHECKED? statement* KW_END -> mk_e_mem_block
 
     // ----- Tipos -----
     ?type: complex_type | simple_type | function_type_syntax // Adiciona tipo função
@@ -135,7 +143,7 @@ atom_v02_grammar = r"""
     %import common.CPP_COMMENT       -> _CPP_COMMENT      // Define //
     %import common.SH_COMMENT        -> _SH_COMMENT       // Define #
     %import common.NEWLINE           -> _NEWLINE
-    BYTE_STRING_LITERAL: /b"(\\.|[^\\"])*"/
+    BYTE_STRING_LITERAL.2: /b"(\\.|[^\\"])*"/ // Prioridade: no lexer LALR venceria CNAME ('b') + STRING_LITERAL
     CHAR_LITERAL: /'(\\.|[^\\'])'/
     MULTILINE_COMMENT: /"{3}[^"]*("+"?[^"]+)*"{3}"/ // Define ""'...'""
     %ignore _WS_INLINE
@@ -160,8 +168,11 @@ atom_v02_grammar = r"""
     KW_IF: "if"
     KW_WHILE: "while"
     KW_LOOP: "loop"
+    KW_FOR: "for"
+    KW_IN: "in"
     KW_MEM: "mem"
     KW_E_MEM: "e_mem"
+    KW_UNCHECKED: "unchecked"
     KW_ELSE: "else"
     KW_AS: "as"
     TRUE: "true"
@@ -179,6 +190,7 @@ atom_v02_grammar = r"""
     LBRACKET: "["
     RBRACKET: "]"
     ARROW: "->"
+    DOTDOT: ".."
     DOT: "."
     COLONCOLON: "::"
     COMMA: ","
@@ -210,6 +222,27 @@ atom_v02_grammar = r"""
     // --- REMOVIDO: Precedência/Associatividade ---
 """
 
+# --- Backend do Parser ---
+# Se existir o parser standalone pré-gerado para ESTA gramática (ver
+# build_standalone_parser.py), usa-o: a inicialização não importa o Lark nem roda o
+# compilador de gramática. ATOM_NO_STANDALONE_PARSER=1 força o uso do Lark.
+ATOM_GRAMMAR_SHA256 = hashlib.sha256(atom_v02_grammar.encode('utf8')).hexdigest()
+_standalone = None
+_standalone_outdated = False # Avisado (log 'atom.parse') quando o parser é criado: no import o log ainda não foi configurado
+if not os.environ.get("ATOM_NO_STANDALONE_PARSER"):
+    try:
+        import atom_parser_standalone as _standalone
+        if getattr(_standalone, 'ATOM_GRAMMAR_SHA256', None) != ATOM_GRAMMAR_SHA256:
+            _standalone_outdated = True
+            _standalone = None
+    except ImportError:
+        _standalone = None
+if _standalone is not None:
+    from atom_parser_standalone import Transformer, Tree, v_args, Token, __version__ as lark_version
+    exceptions = _standalone # LarkError, UnexpectedInput, VisitError, ... vivem no módulo gerado
+else:
+    from lark import Transformer, Tree, v_args, Token, exceptions, __version__ as lark_version
+
 
 # --- Transformer (Ajustado para tokens normais) ---
 class AtomTransformer(Transformer):
@@ -262,10 +295,10 @@ class AtomTransformer(Transformer):
                            target_item = transform_method(item.children)
                            # print(f"  DEBUG type_list: Tree '{item.data}' transformada em {type(target_item).__name__}") # DEBUG
                       except Exception as e:
-                           print(f"  WARN type_list: Falha ao transformar Tree '{item.data}': {e}")
+                           log.warning("type_list: Falha ao transformar Tree '%s': %s", item.data, e)
                            target_item = None
                  else:
-                      print(f"  WARN type_list: Tree '{item.data}' sem transformer, ignorando.")
+                      log.warning("type_list: Tree '%s' sem transformer, ignorando.", item.data)
                       target_item = None
 
             # Adiciona se for um nó Type válido
@@ -274,7 +307,7 @@ class AtomTransformer(Transformer):
             elif isinstance(item, Token) and item.type == 'COMMA':
                  pass # Ignora vírgula
             elif target_item is not None:
-                 print(f"  WARN type_list: Ignorando item inesperado: {type(target_item).__name__} ({target_item!r})")
+                 log.warning("type_list: Ignorando item inesperado: %s (%r)", type(target_item).__name__, target_item)
         # print(f"DEBUG Parser: type_list - retornando {len(types)} tipos.") # DEBUG
         return types
         
@@ -303,6 +336,9 @@ class AtomTransformer(Transformer):
             elif isinstance(item, ast.Type):
                 param_types.append(item)
                 idx += 1
+            elif isinstance(item, list) and all(isinstance(t, ast.Type) for t in item): # type_list (2+ parâmetros)
+                param_types.extend(item)
+                idx += 1
             elif isinstance(item, Token) and item.type == 'COMMA':
                 idx += 1 # Ignora vírgula
             elif isinstance(item, Tree) and item.data == 'type':
@@ -584,6 +620,9 @@ class AtomTransformer(Transformer):
             # else: raise TypeError(f"_collect_statements: Unexpected item type {type(target_item)}: {target_item!r}") # Be less strict maybe?
         return collected
 
+    def _has_token(self, items: List, token_type: str) -> bool:
+        return any(isinstance(item, Token) and item.type == token_type for item in items)
+
     def _collect_until_end(self, items: List, expected_type: type) -> List[ast.Node]:
         collected = []
         for item in items:
@@ -645,7 +684,7 @@ class AtomTransformer(Transformer):
             # codecs.escape_decode retorna uma tupla (decoded_bytes, length_consumed)
             processed_string = codecs.escape_decode(bytes(raw_string_content, 'utf-8'))[0].decode('utf-8')
         except Exception as e:
-            print(f"WARN: Falha ao processar escapes na string literal: '{raw_string_content}'. Erro: {e}. Usando string como está.")
+            log.warning("Falha ao processar escapes na string literal: '%s'. Erro: %s. Usando string como está.", raw_string_content, e)
             processed_string = raw_string_content # Fallback
             
         return ast.StringLiteral(processed_string)
@@ -660,12 +699,12 @@ class AtomTransformer(Transformer):
             processed_char = codecs.escape_decode(bytes(raw_char_content, 'utf-8'))[0].decode('utf-8')
             if len(processed_char) != 1:
                 # Isso pode acontecer para escapes inválidos ou múltiplos caracteres que não foram pegos pelo lexer
-                print(f"WARN: Char literal '{raw_char_content}' resultou em string de comprimento != 1 após processar escapes: '{processed_char}'. Usando o primeiro caractere.")
+                log.warning("Char literal '%s' resultou em string de comprimento != 1 após processar escapes: '%s'. Usando o primeiro caractere.", raw_char_content, processed_char)
                 if not processed_char: # Se string vazia após decode
                     raise ValueError("Char literal resultou em string vazia.")
                 processed_char = processed_char[0]
         except Exception as e:
-            print(f"WARN: Falha ao processar escapes no char literal: '{raw_char_content}'. Erro: {e}. Usando como está (pode falhar).")
+            log.warning("Falha ao processar escapes no char literal: '%s'. Erro: %s. Usando como está (pode falhar).", raw_char_content, e)
             processed_char = raw_char_content # Fallback
             if len(processed_char) != 1:
                 raise ValueError(f"Char literal inválido: '{raw_char_content}'")
@@ -741,11 +780,11 @@ class AtomTransformer(Transformer):
                 if isinstance(unwrapped, ast.Expression):
                     args.append(unwrapped)
                 elif unwrapped is not None:
-                     print(f"WARN: arg_list ignorou item inesperado (após unwrap): {type(unwrapped)}")
+                     log.warning("arg_list ignorou item inesperado (após unwrap): %s", type(unwrapped))
             except TypeError as e:
-                 print(f"WARN: arg_list encontrou erro ao desembrulhar: {e}. Item original: {item!r}")
+                 log.warning("arg_list encontrou erro ao desembrulhar: %s. Item original: %r", e, item)
             except Exception as e_unwrap:
-                 print(f"WARN: arg_list encontrou erro inesperado ao desembrulhar: {e_unwrap}. Item original: {item!r}")
+                 log.warning("arg_list encontrou erro inesperado ao desembrulhar: %s. Item original: %r", e_unwrap, item)
 
         return args
     def VARARGS(self, token: Token) -> Token: return token
@@ -761,7 +800,7 @@ class AtomTransformer(Transformer):
                 transform_method = getattr(self, rule_name, None)
                 if transform_method:
                     try: target_item = transform_method(item.children)
-                    except Exception as e: print(f"  WARN mk_program: Falha ao transformar {rule_name}: {e}"); target_item=None
+                    except Exception as e: log.warning("mk_program: Falha ao transformar %s: %s", rule_name, e); target_item=None
                 else: target_item = None # Ignora Tree sem transformer
 
             # Verifica se o item final é um nó AST esperado no top-level
@@ -770,15 +809,16 @@ class AtomTransformer(Transformer):
                  # print(f"  DEBUG mk_program: Item {i} (Tipo: {type(target_item).__name__}) adicionado.") # DEBUG
             elif target_item is not None:
                  ignored_items.append(target_item)
-                 print(f"  WARN mk_program: Item {i} (Tipo: {type(target_item).__name__}) IGNORADO.") # DEBUG
+                 log.warning("mk_program: Item %s (Tipo: %s) IGNORADO.", i, type(target_item).__name__)
             # Ignora None silenciosamente
 
         if ignored_items:
-             print(f"WARN: mk_program ignorou {len(ignored_items)} itens não reconhecidos no top-level.")
+             log.warning("mk_program ignorou %s itens não reconhecidos no top-level.", len(ignored_items))
         # print(f"DEBUG Transformer: Saindo mk_program com {len(valid_items)} itens válidos.") # DEBUG
         return ast.Program(body=valid_items)
     @v_args(inline=True)
-    def mk_import_decl(self, path_node: ast.StringLiteral) -> ast.ImportDecl:
+    def mk_import_decl(self, kw_import: Token, path_node: Union[Token, ast.StringLiteral]) -> ast.ImportDecl:
+        if isinstance(path_node, Token): path_node = ast.StringLiteral(path_node.value[1:-1]) # Terminal cru, como em abi_string
         if not isinstance(path_node, ast.StringLiteral): raise TypeError("mk_import_decl: path not StringLiteral")
         return ast.ImportDecl(path=path_node)
     def mk_const_def(self, items: List) -> ast.ConstDef:
@@ -835,8 +875,11 @@ class AtomTransformer(Transformer):
         item_iter = iter(items) # Usar iterador
 
         try:
-            # 1. KW_FUNC
-            token = next(item_iter); assert isinstance(token, Token) and token.type == 'KW_FUNC'
+            # 1. [KW_UNCHECKED] KW_FUNC
+            token = next(item_iter)
+            unchecked = isinstance(token, Token) and token.type == 'KW_UNCHECKED'
+            if unchecked: token = next(item_iter)
+            assert isinstance(token, Token) and token.type == 'KW_FUNC'
             # 2. Name
             name_intermediate = next(item_iter)
             if isinstance(name_intermediate, ast.Identifier): name_node = name_intermediate
@@ -898,20 +941,12 @@ class AtomTransformer(Transformer):
             # print(f"  DEBUG Parser: Body Stmts = ({len(body_stmts)} statements)")
 
             # Cria o nó
-            func_def_node = ast.FunctionDef(name=name_node, params=params, return_type=return_type_node, body=body_stmts)
+            func_def_node = ast.FunctionDef(name=name_node, params=params, return_type=return_type_node, body=body_stmts, unchecked=unchecked)
             # print(f"DEBUG Parser: Saindo mk_func_def, retornando nó: {type(func_def_node)}")
             return func_def_node
 
         except (StopIteration, AssertionError, TypeError, ValueError) as e:
-             print(f"ERROR: Falha interna em mk_func_def: {e}")
-             # Tenta obter índice do iterador se ele tiver (não garantido)
-             items_processed_count = 0
-             # if hasattr(item_iter, '__length_hint__'): # Isso não funciona bem com next()
-             #    items_processed_count = len(items) - item_iter.__length_hint__()
-             # Vamos apenas mostrar os itens originais
-             print(f"       Itens originais: {items!r}")
-             import traceback
-             traceback.print_exc()
+             log.error("Falha interna em mk_func_def: %s. Itens originais: %r", e, items, exc_info=True)
              return None
     
     def mk_func_decl(self, items: List) -> ast.FunctionDecl:
@@ -1046,8 +1081,9 @@ class AtomTransformer(Transformer):
     def else_clause(self, items: List) -> Union[ast.IfStmt, List[ast.Statement]]:
          content_item_or_list = items[1:]
          first_content = content_item_or_list[0] if content_item_or_list else None
-         if isinstance(first_content, ast.IfStmt): return first_content
-         elif isinstance(first_content, Tree) and first_content.data == 'if_stmt': return self.mk_if_stmt(first_content.children)
+         # 'else if' é um else cujo único statement é um if (forma única, sem conflito LALR)
+         if len(content_item_or_list) == 1 and isinstance(first_content, ast.IfStmt): return first_content
+         elif len(content_item_or_list) == 1 and isinstance(first_content, Tree) and first_content.data == 'if_stmt': return self.mk_if_stmt(first_content.children)
          else: return self._collect_statements(content_item_or_list)
     def mk_while_stmt(self, items: List) -> ast.WhileStmt:
         cond_node = self._unwrap_expression_tree(items[1])
@@ -1057,15 +1093,24 @@ class AtomTransformer(Transformer):
         body_block = self._collect_statements(items[1:-1])
         return ast.LoopStmt(body=body_block)
         
+    def mk_for_range_stmt(self, items: List) -> ast.ForRangeStmt:
+        # items: [KW_FOR, Identifier, KW_IN, inicio, DOTDOT, fim, Statement*, KW_END]
+        return ast.ForRangeStmt(var=items[1], start=self._unwrap_expression_tree(items[3]),
+                                end=self._unwrap_expression_tree(items[5]), body=self._collect_statements(items[6:-1]))
+    def mk_for_slice_stmt(self, items: List) -> ast.ForSliceStmt:
+        # items: [KW_FOR, Identifier, KW_IN, colecao, Statement*, KW_END]
+        return ast.ForSliceStmt(var=items[1], iterable=self._unwrap_expression_tree(items[3]), body=self._collect_statements(items[4:-1]))
+
     def mk_mem_block(self, items: List) -> ast.MemBlock:
+        # items: [KW_MEM, KW_UNCHECKED?, Statement*, KW_END]
         body_block = self._collect_statements(items[1:-1])
-        return ast.MemBlock(body=body_block)
+        return ast.MemBlock(body=body_block, unchecked=self._has_token(items, 'KW_UNCHECKED'))
         
     def mk_e_mem_block(self, items: List) -> ast.EMemBlock: # <--- NOVO MÉTODO
-        # items: [KW_E_MEM, Statement*, KW_END]
+        # items: [KW_E_MEM, KW_UNCHECKED?, Statement*, KW_END]
         # O último item é KW_END, então coletamos de items[1] até items[-2]
         body_block = self._collect_statements(items[1:-1])
-        return ast.EMemBlock(body=body_block)
+        return ast.EMemBlock(body=body_block, unchecked=self._has_token(items, 'KW_UNCHECKED'))
 
     # --- Handler genérico para expressões binárias ---
     def bin_op_expr(self, items: List) -> ast.Expression:
@@ -1122,7 +1167,7 @@ class AtomTransformer(Transformer):
 
             # Verifica se suffix_data é a tupla esperada
             if not isinstance(suffix_data, tuple) or len(suffix_data) != 2:
-                 print(f"ERROR: postfix_expr recebeu sufixo inválido: {suffix_data!r}")
+                 log.error("postfix_expr recebeu sufixo inválido: %r", suffix_data)
                  continue # Pula sufixo inválido
 
             suffix_type, suffix_value = suffix_data
@@ -1188,17 +1233,17 @@ class AtomTransformer(Transformer):
                  if isinstance(single_arg, ast.Expression):
                      args = [single_arg] # Cria lista com o único argumento
                  else:
-                     print(f"WARN: mk_call_suffix não conseguiu desembrulhar argumento único: {arg_part!r}")
+                     log.warning("mk_call_suffix não conseguiu desembrulhar argumento único: %r", arg_part)
              # Caso 3: Pode ser Tree('arg_list', ...) se a gramática/Lark decidir assim
              elif arg_part.data == 'arg_list':
                  args = self.arg_list(arg_part.children) # Chama arg_list nos filhos
              else:
-                  print(f"WARN: mk_call_suffix recebeu Tree inesperada: {arg_part!r}. Assumindo 0 args.")
+                  log.warning("mk_call_suffix recebeu Tree inesperada: %r. Assumindo 0 args.", arg_part)
         elif arg_part is None:
              # Caso 4: Chamada vazia ()
              args = []
         else:
-             print(f"WARN: mk_call_suffix estrutura inesperada para parte do argumento: {type(arg_part)}. Assumindo 0 args.")
+             log.warning("mk_call_suffix estrutura inesperada para parte do argumento: %s. Assumindo 0 args.", type(arg_part))
              args = []
 
         # print(f"DEBUG Parser: mk_call_suffix - args finais: {args!r}")
@@ -1240,12 +1285,12 @@ class AtomTransformer(Transformer):
                     elements.append(unwrapped_item)
                 # Ignora outros possíveis nós/None que _unwrap não converteu para Expr
                 elif unwrapped_item is not None: # Não reclama de None
-                    print(f"WARN: array_element_list ignorou item inesperado (após unwrap): {type(unwrapped_item)}")
+                    log.warning("array_element_list ignorou item inesperado (após unwrap): %s", type(unwrapped_item))
             except TypeError as e:
                  # Captura erro do _unwrap se ele não conseguir converter algo inesperado
-                 print(f"WARN: array_element_list encontrou erro ao desembrulhar: {e}. Item original: {item!r}")
+                 log.warning("array_element_list encontrou erro ao desembrulhar: %s. Item original: %r", e, item)
             except Exception as e_unwrap: # Captura outros erros
-                 print(f"WARN: array_element_list encontrou erro inesperado ao desembrulhar: {e_unwrap}. Item original: {item!r}")
+                 log.warning("array_element_list encontrou erro inesperado ao desembrulhar: %s. Item original: %r", e_unwrap, item)
 
         return elements
     def mk_array_literal(self, items: List) -> ast.ArrayLiteral:
@@ -1261,7 +1306,7 @@ class AtomTransformer(Transformer):
         elif len(items) == 2: # Apenas '[' e ']'
              elements = []
         else:
-             print(f"WARN: mk_array_literal estrutura inesperada: {items!r}. Assumindo array vazio.")
+             log.warning("mk_array_literal estrutura inesperada: %r. Assumindo array vazio.", items)
              elements = []
 
         # print(f"DEBUG Parser: mk_array_literal - elementos finais: {elements!r}") # DEBUG
@@ -1322,21 +1367,21 @@ class AtomTransformer(Transformer):
             elif isinstance(fields_from_rule, ast.StructLiteralField): 
                 # Caso: Apenas um campo, Lark passou o StructLiteralField diretamente
                 actual_fields = [fields_from_rule]
-                print(f"    INFO mk_struct_literal: items[2] é um único StructLiteralField. Envolvendo em lista.")
+                log.debug("mk_struct_literal: items[2] é um único StructLiteralField. Envolvendo em lista.")
             # <=== FIM NOVA CONDIÇÃO ===>
 
             elif fields_from_rule is None: 
                 # print(f"    INFO mk_struct_literal: items[2] (fields_from_rule) é None. Usando lista de campos vazia.")
                 actual_fields = [] 
             else: # Não é lista, nem StructLiteralField, nem None
-                print(f"    WARN mk_struct_literal: items[2] (fields_from_rule) tipo inesperado {type(fields_from_rule)}. Usando lista de campos vazia.")
+                log.warning("mk_struct_literal: items[2] (fields_from_rule) tipo inesperado %s. Usando lista de campos vazia.", type(fields_from_rule))
                 actual_fields = []
             
         elif len(items) == 3: # Esperado: type_name, LBRACE, RBRACE (sem campos)
             # print(f"  len(items) == 3. Assumindo sem campos.")
             actual_fields = []
         else:
-            print(f"  ERROR mk_struct_literal: Estrutura de 'items' inesperada. Len={len(items)}. Usando lista de campos vazia como fallback, mas isso é um erro.")
+            log.error("mk_struct_literal: Estrutura de 'items' inesperada. Len=%s. Usando lista de campos vazia como fallback, mas isso é um erro.", len(items))
             actual_fields = []
             
         # print(f"  Final actual_fields para '{type_name_node.name}': {actual_fields!r}")
@@ -1384,56 +1429,116 @@ class AtomTransformer(Transformer):
     def shift_expr(self, items): return self.bin_op_expr(items)
 
 
+# --- Cache do Parser ---
+# Construir o Lark reanalisa a gramática inteira (e, hoje, a tentativa LALR falha
+# por conflito antes do fallback Earley). O parser construído é guardado por processo
+# e, em disco, guardamos as tabelas LALR (cache nativo do Lark) ou, se o LALR falhar,
+# um marcador para que processos novos vão direto ao Earley. O Lark desserializa (pickle) as tabelas
+# e o marcador decide o parser: o diretório é do usuário, 0o700, conferido por ensure_private_dir.
+ATOM_PARSER_CACHE_DIR = os.environ.get("ATOM_PARSER_CACHE_DIR") or user_cache_dir("parser")
+_parser_cache: Dict[str, object] = {}
+
+def grammar_hash(grammar: str = atom_v02_grammar) -> str:
+    # Inclui a versão do Lark: tabelas e o resultado do LALR dependem dela.
+    return hashlib.sha256((grammar + "\0" + lark_version).encode('utf8')).hexdigest()
+
+def _parser_cache_paths(key: str) -> Tuple[str, str]:
+    lalr_tables = os.path.join(ATOM_PARSER_CACHE_DIR, f"lalr_{key}.lark")
+    earley_marker = os.path.join(ATOM_PARSER_CACHE_DIR, f"earley_{key}.marker")
+    return lalr_tables, earley_marker
+
+def _build_parser(grammar: str, key: str):
+    from lark import Lark, exceptions as lark_exceptions # Só aqui: o caminho standalone não importa o Lark
+    lalr_tables, earley_marker = _parser_cache_paths(key)
+    use_disk = True
+    try: ensure_private_dir(ATOM_PARSER_CACHE_DIR)
+    except OSError as e:
+        log.warning("cache do parser em disco desativado: %s", e)
+        use_disk = False
+
+    if not (use_disk and os.path.exists(earley_marker)):
+        try:
+            # Tentar LALR primeiro com a gramática de precedência
+            parser = Lark(grammar, start='program', parser='lalr', propagate_positions=True,
+                          cache=lalr_tables if use_disk else False)
+            log.debug("Parser LALR (Precedence Grammar) criado.")
+            return parser
+        except lark_exceptions.LarkError as e_lalr: # Captura especificamente erros do LALR
+             log.warning("Falha ao criar parser LALR (provavelmente conflitos S/R ou R/R): %s. Tentando com Earley como fallback...", e_lalr)
+             if use_disk:
+                 try:
+                     with open(earley_marker, "w") as f: f.write(f"{e_lalr}\n")
+                 except OSError: pass
+        except Exception as e_parser_creation: # Captura outros erros de criação
+             raise RuntimeError(f"Falha ao criar parser: {e_parser_creation}") from e_parser_creation
+    try:
+        parser = Lark(grammar, start='program', parser='earley', propagate_positions=True)
+        log.debug("Parser Earley (Precedence Grammar - Fallback) criado.")
+        return parser
+    except Exception as e_earley_fallback:
+        raise RuntimeError(f"Falha ao criar parser Earley (fallback): {e_earley_fallback}") from e_earley_fallback
+
+def get_parser(grammar: str = atom_v02_grammar):
+    """Retorna o parser Lark da gramática, construído uma única vez por processo."""
+    key = grammar_hash(grammar)
+    parser = _parser_cache.get(key)
+    if parser is None:
+        if _standalone is not None and grammar == atom_v02_grammar:
+            parser = _standalone.Lark_StandAlone(propagate_positions=True)
+            log.debug("Parser LALR standalone (pré-gerado) carregado.")
+        else:
+            if _standalone_outdated and grammar == atom_v02_grammar:
+                log.warning("atom_parser_standalone.py não corresponde à gramática atual (rode build_standalone_parser.py). Usando Lark.")
+            parser = _build_parser(grammar, key)
+        _parser_cache[key] = parser
+    return parser
+
+def clear_parser_cache(disk: bool = False):
+    """Esvazia o cache do processo e, opcionalmente, o cache em disco."""
+    _parser_cache.clear()
+    if disk and os.path.isdir(ATOM_PARSER_CACHE_DIR):
+        for name in os.listdir(ATOM_PARSER_CACHE_DIR):
+            if name.startswith(("lalr_", "earley_")):
+                try: os.remove(os.path.join(ATOM_PARSER_CACHE_DIR, name))
+                except OSError: pass
+
+
 # --- Função Principal de Parsing ---
+@profiler.profiled("parse")
 def parse_atom(code: str) -> ast.Program:
-    parser = None
-    try:
-        # Tentar LALR primeiro com a gramática de precedência
-        parser = Lark(atom_v02_grammar, start='program', parser='lalr', propagate_positions=True)
-        print("DEBUG: Parser LALR (Precedence Grammar) criado.")
-    except exceptions.LarkError as e_lalr: # Captura especificamente erros do LALR
-         print(f"Falha ao criar parser LALR (provavelmente conflitos S/R ou R/R): {e_lalr}")
-         print("Tentando com Earley como fallback...")
-         try:
-             parser = Lark(atom_v02_grammar, start='program', parser='earley', propagate_positions=True)
-             print("DEBUG: Parser Earley (Precedence Grammar - Fallback) criado.")
-         except Exception as e_earley_fallback:
-             raise RuntimeError(f"Falha ao criar parser Earley (fallback): {e_earley_fallback}") from e_earley_fallback
-    except Exception as e_parser_creation: # Captura outros erros de criação
-         raise RuntimeError(f"Falha ao criar parser: {e_parser_creation}") from e_parser_creation
+    profiler.step("parse.load_parser")
+    parser = get_parser()
 
     try:
+        profiler.step("parse.lark")
         parse_tree = parser.parse(code)
-        print("DEBUG: Parsing concluído.")
+        log.debug("Parsing concluído.")
     except exceptions.UnexpectedInput as e: # Captura especificamente UnexpectedInput
          context = e.get_context(code)
          # Para UnexpectedCharacters, e.allowed existe. Para outros, pode ser e.expected.
          # Fornece um fallback para um conjunto vazio se nenhum existir.
          expected_set = getattr(e, 'allowed', getattr(e, 'expected', set()))
          expected_tokens_str = ", ".join(sorted(list(expected_set))) if expected_set else "desconhecido"
-         print(f"Erro de Parsing: Entrada inesperada na linha {e.line}, coluna {e.column}.\nEsperado (um de): {expected_tokens_str}\n--- Contexto ---\n{context}\n----------------")
-         raise RuntimeError(f"Erro Parsing Lark: {e}") from e
+         raise RuntimeError(f"Erro Parsing Lark: entrada inesperada na linha {e.line}, coluna {e.column}.\n"
+                            f"Esperado (um de): {expected_tokens_str}\n--- Contexto ---\n{context}\n----------------") from e
     except Exception as e_parse: # Captura outros erros de parsing
-        print(f"Erro durante o parsing do código:\n{code}")
         raise RuntimeError(f"Erro Parsing Lark: {e_parse}") from e_parse
 
     try:
-        print("DEBUG: Iniciando transformação...")
+        log.debug("Iniciando transformação...")
+        profiler.step("parse.transform")
         transformer = AtomTransformer() # Sem visit_tokens=True
         ast_tree = transformer.transform(parse_tree)
-        print("DEBUG: Transformação concluída.")
+        log.debug("Transformação concluída.")
     except exceptions.VisitError as e_visit:
-        print(f"Erro durante a transformação visitando regra '{getattr(e_visit.rule, 'origin', e_visit.obj)}':")
         orig_exc = getattr(e_visit, 'orig_exc', e_visit)
-        print(f"  Exceção original: {type(orig_exc).__name__}: {orig_exc}")
         meta = getattr(e_visit.obj, 'meta', None) if hasattr(e_visit, 'obj') else None
-        if meta: print(f"  Próximo à linha {meta.line}, coluna {meta.column}")
-        else: print("  (Localização exata incerta)")
-        print("--- Detalhes do Erro de Transformação ---"); traceback.print_exc(); print("-----------------------------------------")
+        log.error("Erro durante a transformação visitando regra '%s': %s: %s (%s)", getattr(e_visit.rule, 'origin', e_visit.obj),
+                  type(orig_exc).__name__, orig_exc, f"próximo à linha {meta.line}, coluna {meta.column}" if meta else "localização exata incerta",
+                  exc_info=True)
         raise RuntimeError(f"Erro Transformação Lark->AST: {e_visit}") from e_visit
     except Exception as e_transform:
-        print(f"Erro inesperado durante a transformação:")
-        print("--- Detalhes do Erro de Transformação ---"); traceback.print_exc(); print("-----------------------------------------")
+        log.error("Erro inesperado durante a transformação", exc_info=True)
         raise RuntimeError(f"Erro Transformação Lark->AST: {e_transform}") from e_transform
 
     if not isinstance(ast_tree, ast.Program): raise TypeError(f"Resultado final não é ast.Program: {type(ast_tree)}")
@@ -1699,8 +1804,11 @@ if __name__ == '__main__':
 	end # Fim de main
 		"""
 
+    configure_logging() # ATOM_LOG=debug|note|warning|error liga o log do compilador (stderr)
     print(f"Analisando código de teste final (Precedence Grammar):\n{final_test_code_end_syntax}")
     final_ast = None
+    time_trace_path = os.environ.get("ATOM_TIME_TRACE") # Chrome trace por fase (profiler.py)
+    if time_trace_path: profiler.enable(track_allocations=os.environ.get("ATOM_TIME_TRACE_ALLOC", "1") != "0")
     try:
         final_ast = parse_atom(final_test_code_end_syntax)
         print("\nAST gerada com sucesso!")
@@ -1708,7 +1816,8 @@ if __name__ == '__main__':
         # (Restante das etapas)
         print("\n--- Iniciando Análise Semântica ---");
         try:
-            semantic_errors = analyze_semantics(final_ast)
+            prove_bounds = not os.environ.get("ATOM_NO_BOUNDS_ANALYSIS") # Sem o bounds_analysis: mantém todo bounds check
+            semantic_errors = analyze_semantics(final_ast, prove_bounds)
             if not semantic_errors: print("Análise semântica concluída sem erros.")
             else: print(f"\n{len(semantic_errors)} Erros Semânticos:"); [print(f"- {e}") for e in semantic_errors]; raise ValueError("Erros semânticos.")
         except ImportError: print("\nAVISO: semantic_analyzer.py não encontrado.")
@@ -1716,10 +1825,22 @@ if __name__ == '__main__':
 
         print("\n--- Iniciando Geração de Código LLVM IR ---");
         try:
-            llvm_ir = generate_llvm_ir(final_ast)
+            opt_level, opt_preset = parse_opt_level(os.environ.get("ATOM_OPT_LEVEL", "0"))
+            unchecked_indexing = bool(os.environ.get("ATOM_UNCHECKED_INDEX")) # Sem bounds checks em arrays/slices
+            overflow_mode = os.environ.get("ATOM_OVERFLOW", "wrap") # wrap, checked ou assume (nsw)
+            llvm_ir = generate_llvm_ir(final_ast, opt_level, opt_preset, unchecked_indexing, overflow_mode, prove_bounds)
             print("\n--- LLVM IR Gerado ---"); print(llvm_ir); print("----------------------")
             with open("output_precedence.ll", "w") as f: f.write(llvm_ir)
             print("LLVM IR salvo em output_precedence.ll")
+            exe_path = os.environ.get("ATOM_EXE")
+            if exe_path: # Reusa o IR acima (já otimizado): o objeto sai dele, sem gerar o código de novo
+                runtime_object = os.path.join(os.path.dirname(os.path.abspath(__file__)), "runtime.o")
+                build_executable(llvm_ir, exe_path, runtime_object, opt_level, opt_preset)
+                print(f"Executável gerado em {exe_path} (objeto via llvmlite + {runtime_object})")
+            if os.environ.get("ATOM_JIT"):
+                print("\n--- Executando via JIT (MCJIT) ---")
+                exit_code = run_jit(llvm_ir, opt_level, opt_preset) # Também reusa o IR gerado acima
+                print(f"--- JIT: main retornou {exit_code} ---")
         except ImportError: print("\nAVISO: codegen_llvm.py não encontrado.")
         except Exception as e_codegen: print(f"\nErro Geração de Código: {e_codegen}"); traceback.print_exc(); raise
 
@@ -1730,4 +1851,8 @@ if __name__ == '__main__':
         print(f"\nErro ao processar código: {e}")
         traceback.print_exc()
     finally:
+        if time_trace_path:
+            phase_profiler = profiler.disable()
+            print("\n--- Tempo por fase ---"); print(phase_profiler.report())
+            phase_profiler.write_chrome_trace(time_trace_path); print(f"Chrome trace gravado em {time_trace_path}")
         print("\nProcessamento concluído.")
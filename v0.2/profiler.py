@@ -0,0 +1,194 @@
+# profiler.py - Tempo (parede e CPU) e alocações por fase do compilador, com exportação Chrome trace
+#
+# Uso: python profiler.py arquivo.atom [-o trace.json] [-O nível] [--obj] [--no-alloc]
+#      (ou ATOM_TIME_TRACE=trace.json python parser_lark.py)
+#
+# As fases são marcadas no próprio compilador:
+#   parse     - parse_atom: carga do parser, parse Lark, AtomTransformer.transform
+#   semantic  - SemanticAnalyzer.analyze: tipos (structs/enums), globais (assinaturas/consts), corpos
+#   codegen   - generate_code: passes 1-4 e a serialização do módulo; optimize_module, emit_object
+# Sem um profiler ativo (enable), phase/step/profiled não fazem nada além de um teste. Com alocações
+# ligadas (padrão), usa tracemalloc: bytes líquidos alocados e pico por fase, ao custo de deixar a
+# compilação algumas vezes mais lenta (compare tempos com --no-alloc). O JSON abre em chrome://tracing
+# ou no Perfetto (eventos 'X', args com cpu_ms / alloc_kb / peak_kb).
+import os
+import sys
+import json
+import time
+import argparse
+import functools
+import contextlib
+import tracemalloc
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+@dataclass
+class PhaseRecord:
+    name: str
+    depth: int
+    start_ns: int          # perf_counter_ns no início
+    wall_ns: int = 0
+    cpu_ns: int = 0
+    alloc_bytes: int = 0   # Memória rastreada ao final - no início (pode ser negativa)
+    peak_bytes: int = 0    # Pico rastreado durante a fase, acima do valor no início
+    is_step: bool = False  # Sub-passo aberto por step(): fecha no próximo step() ou no fim da fase pai
+    _cpu_start: int = 0
+    _mem_start: int = 0
+
+class PhaseProfiler:
+    def __init__(self, track_allocations: bool = True):
+        self.track_allocations = track_allocations
+        self.records: List[PhaseRecord] = [] # Em ordem de início
+        self._stack: List[PhaseRecord] = []
+        self._started_tracemalloc = False
+        self._origin_ns = time.perf_counter_ns()
+
+    def start(self):
+        if self.track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start(); self._started_tracemalloc = True
+
+    def stop(self):
+        while self._stack: self.end()
+        if self._started_tracemalloc: tracemalloc.stop(); self._started_tracemalloc = False
+
+    def _observe_peak(self):
+        # tracemalloc só tem um pico global: antes de zerá-lo, repassa para a fase aberta
+        if self.track_allocations and self._stack and tracemalloc.is_tracing():
+            top = self._stack[-1]
+            top.peak_bytes = max(top.peak_bytes, tracemalloc.get_traced_memory()[1] - top._mem_start)
+            tracemalloc.reset_peak()
+
+    def begin(self, name: str, is_step: bool = False):
+        self._observe_peak()
+        record = PhaseRecord(name=name, depth=len(self._stack), start_ns=time.perf_counter_ns(), is_step=is_step)
+        if self.track_allocations and tracemalloc.is_tracing(): record._mem_start = tracemalloc.get_traced_memory()[0]
+        record._cpu_start = time.process_time_ns()
+        self.records.append(record); self._stack.append(record)
+
+    def end(self):
+        self._observe_peak()
+        record = self._stack.pop()
+        record.wall_ns = time.perf_counter_ns() - record.start_ns
+        record.cpu_ns = time.process_time_ns() - record._cpu_start
+        if self.track_allocations and tracemalloc.is_tracing():
+            record.alloc_bytes = tracemalloc.get_traced_memory()[0] - record._mem_start
+        if self._stack: # O pico do filho também é pico do pai (medido a partir do início do pai)
+            parent = self._stack[-1]
+            parent.peak_bytes = max(parent.peak_bytes, record.peak_bytes + record._mem_start - parent._mem_start)
+
+    def step(self, name: str):
+        if self._stack and self._stack[-1].is_step: self.end()
+        self.begin(name, is_step=True)
+
+    def end_phase(self):
+        while self._stack and self._stack[-1].is_step: self.end()
+        if self._stack: self.end()
+
+    def totals(self) -> Dict[str, Dict[str, float]]:
+        # Soma por nome (uma fase pode rodar várias vezes, ex.: um codegen por módulo)
+        totals: Dict[str, Dict[str, float]] = {}
+        for r in self.records:
+            t = totals.setdefault(r.name, {'count': 0, 'wall_ms': 0.0, 'cpu_ms': 0.0, 'alloc_kb': 0.0, 'peak_kb': 0.0})
+            t['count'] += 1; t['wall_ms'] += r.wall_ns / 1e6; t['cpu_ms'] += r.cpu_ns / 1e6
+            t['alloc_kb'] += r.alloc_bytes / 1024; t['peak_kb'] = max(t['peak_kb'], r.peak_bytes / 1024)
+        return totals
+
+    def report(self) -> str:
+        lines = [f"{'fase':<36} {'parede ms':>10} {'CPU ms':>9}" + (f" {'alocado KB':>11} {'pico KB':>9}" if self.track_allocations else "")]
+        for r in self.records:
+            line = f"{'  ' * r.depth + r.name:<36} {r.wall_ns / 1e6:10.1f} {r.cpu_ns / 1e6:9.1f}"
+            if self.track_allocations: line += f" {r.alloc_bytes / 1024:11.1f} {r.peak_bytes / 1024:9.1f}"
+            lines.append(line)
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> Dict[str, object]:
+        pid = os.getpid()
+        events: List[Dict[str, object]] = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0, 'args': {'name': 'atom compiler'}}]
+        for r in self.records:
+            args = {'cpu_ms': round(r.cpu_ns / 1e6, 3)}
+            if self.track_allocations: args.update(alloc_kb=round(r.alloc_bytes / 1024, 1), peak_kb=round(r.peak_bytes / 1024, 1))
+            events.append({'name': r.name, 'cat': r.name.split('.')[0], 'ph': 'X', 'pid': pid, 'tid': 0,
+                           'ts': (r.start_ns - self._origin_ns) / 1000, 'dur': r.wall_ns / 1000, 'args': args})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path: str):
+        with open(path, "w") as f: json.dump(self.chrome_trace(), f)
+
+_active: Optional[PhaseProfiler] = None
+
+def enable(track_allocations: bool = True) -> PhaseProfiler:
+    global _active
+    if _active is not None: _active.stop()
+    _active = PhaseProfiler(track_allocations); _active.start()
+    return _active
+
+def disable() -> Optional[PhaseProfiler]:
+    global _active
+    profiler, _active = _active, None
+    if profiler is not None: profiler.stop()
+    return profiler
+
+def active() -> Optional[PhaseProfiler]:
+    return _active
+
+@contextlib.contextmanager
+def phase(name: str):
+    profiler = _active
+    if profiler is None: yield; return
+    profiler.begin(name)
+    try: yield
+    finally: profiler.end_phase()
+
+def step(name: str):
+    """Fecha o sub-passo anterior da fase atual e abre 'name' (fecha sozinho no fim da fase)."""
+    if _active is not None: _active.step(name)
+
+def profiled(name: str):
+    """Decorador: a chamada inteira vira a fase 'name' (com os step() feitos dentro dela)."""
+    def wrap(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active is None: return func(*args, **kwargs)
+            with phase(name): return func(*args, **kwargs)
+        return wrapper
+    return wrap
+
+def profile_source(source: str, opt_level: int = 0, opt_preset: str = 'speed', emit_object: bool = False,
+                   track_allocations: bool = True) -> PhaseProfiler:
+    """Compila uma fonte Atom (sem imports) com o profiler ligado e devolve as medições."""
+    from parser_lark import parse_atom
+    from semantic_analyzer import analyze_semantics
+    from codegen_llvm import CodeGenVisitor
+    profiler = enable(track_allocations)
+    try:
+        with phase("compile"):
+            program = parse_atom(source)
+            errors = analyze_semantics(program)
+            if errors: raise ValueError(f"{len(errors)} erros semânticos: {errors[0]}")
+            generator = CodeGenVisitor(opt_level, opt_preset)
+            generator.generate_code(program)
+            if emit_object: generator.emit_object() # Inclui optimize_module
+            elif generator.opt_level > 0: generator.optimize_module()
+    finally:
+        disable()
+    return profiler
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description="Mede tempo e alocações por fase ao compilar uma fonte Atom.")
+    arg_parser.add_argument("source")
+    arg_parser.add_argument("-o", "--trace", default=None, help="Grava o Chrome trace (JSON) neste arquivo")
+    arg_parser.add_argument("-O", dest="opt", default="0", help="Nível de otimização: 0-3, s ou z")
+    arg_parser.add_argument("--obj", action="store_true", help="Inclui a geração do objeto (emit_object)")
+    arg_parser.add_argument("--no-alloc", action="store_true", help="Não rastreia alocações (tempos sem o custo do tracemalloc)")
+    ns = arg_parser.parse_args()
+    from diagnostics import configure_logging
+    from codegen_llvm import parse_opt_level
+    from profiler import profile_source # O compilador importa 'profiler', não '__main__': usa o mesmo estado global
+    configure_logging()
+    opt_level, opt_preset = parse_opt_level(ns.opt)
+    with open(ns.source, encoding="utf8") as f: source = f.read()
+    profiler = profile_source(source, opt_level, opt_preset, ns.obj, not ns.no_alloc)
+    print(profiler.report())
+    if ns.trace:
+        profiler.write_chrome_trace(ns.trace)
+        print(f"Chrome trace gravado em {ns.trace}")
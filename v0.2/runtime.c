@@ -22,3 +22,12 @@ void atom_do_bounds_check(uint64_t index, uint64_t length) {
     }
     // Se estiver dentro dos limites, a função simplesmente retorna
 }
+
+// Overflow de inteiro com sinal no modo checked (op: '+', '-', '*', '/' ou '%')
+void atom_panic_integer_overflow(int32_t op) {
+    fprintf(stderr, "\n------------------------------------------------\n");
+    fprintf(stderr, "ATOM PANIC: Integer overflow in '%c'!\n", (char)op);
+    fprintf(stderr, "------------------------------------------------\n");
+    fflush(stderr);
+    abort();
+}
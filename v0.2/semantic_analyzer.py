@@ -1,9 +1,12 @@
 # semantic_analyzer.py (CORRIGIDO - Parâmetro visit_lvalue)
 
 import ast_nodes as ast
+import profiler
+from bounds_analysis import analyze_bounds
+from diagnostics import DiagnosticEngine, Severity, get_logger, lazy
 from ast_nodes import ( # Importações explícitas
     Node, Expression, Statement, Type, Program, FunctionDef, FunctionDecl,
-    StructDef, EnumDef, ConstDef, ExternBlock, ImportDecl, LetBinding, MutBinding,
+    StructDef, EnumDef, ConstDef, ExternBlock, ImportDecl, LetBinding, MutBinding, ForRangeStmt, ForSliceStmt,
     Assignment, Parameter, CustomType, PointerType, ReferenceType, ArrayType,
     SliceType, PrimitiveType, UnitType, LiteralIntegerType, Identifier,
     IntegerLiteral, FunctionType, BooleanLiteral, CharLiteral, StringLiteral,
@@ -14,9 +17,11 @@ from ast_nodes import ( # Importações explícitas
 from typing import Dict, List, Optional, Union, Tuple, Set
 import traceback
 
+log = get_logger("semantic")
+
 class SemanticAnalyzer:
     def __init__(self):
-        self.errors: List[str] = []
+        self.diagnostics = DiagnosticEngine({Severity.ERROR: "Erro Semântico", Severity.WARNING: "Aviso Semântico"}, log)
         self.global_scope: Dict[str, ast.Node] = {}
         self.struct_defs: Dict[str, ast.StructDef] = {}
         self.enum_defs: Dict[str, ast.EnumDef] = {}
@@ -25,10 +30,16 @@ class SemanticAnalyzer:
         self.current_function_return_type: Optional[ast.Type] = None
         self.current_function_name: Optional[str] = None
         self.is_in_mem_block: bool = False
+        self.unchecked_region: Optional[str] = None # Dentro de 'unchecked func'/'mem unchecked': de onde vem (anotado nos IndexAccess)
+        self.direct_callees: Set[int] = set()      # id() dos Identifier na posição de função chamada
+        self.aliased_params: Set[int] = set()      # id() dos Parameter '&mut' que alguma chamada não empresta com exclusividade
+        self.function_values: Set[int] = set()     # id() das FunctionDef usadas como valor (chamáveis de qualquer lugar)
         self.llvm_types = {"int", "uint", "bool", "char", "i8", "u8", "i16", "u16", "i32", "u32", "i64", "u64", "usize", "isize", "f32", "f64"}
         self.integer_types = {"int", "uint", "i8", "u8", "i16", "u16", "i32", "u32", "i64", "u64", "usize", "isize"}
         self.numeric_types = self.integer_types | {"f32", "f64"}
         self.current_loop_level: int = 0
+        self.type_table: Dict[tuple, ast.Type] = {} # Tipos internados (intern_type)
+        self.resolved_type_cache: Dict[int, Tuple[ast.Type, ast.Type]] = {} # id(nó de tipo) -> (nó, tipo internado)
 
 
     def type_to_string(self, type_node: Optional[ast.Type]) -> str:
@@ -39,14 +50,12 @@ class SemanticAnalyzer:
         except Exception as e:
             return f"<repr_falhou:{type(type_node).__name__}:{e}>"
 
+    @property
+    def errors(self) -> List[str]:
+        return self.diagnostics.messages(Severity.ERROR)
+
     def add_error(self, message: str, node: Optional[ast.Node] = None):
-        pos_info = ""
-        if node and hasattr(node, 'meta') and hasattr(node.meta, 'line'):
-            pos_info = f" (linha {node.meta.line}, col {getattr(node.meta, 'column', '?')})"
-        full_message = f"Erro Semântico{pos_info}: {message}"
-        if full_message not in self.errors:
-            self.errors.append(full_message)
-            print(f"SEMANTIC ERROR:{pos_info} {message}")
+        self.diagnostics.error(message, node=node) # Repetições (mesma mensagem e posição) são ignoradas
 
     def check_unsafe_context(self, operation_desc: str, node: ast.Node):
         if not self.is_in_mem_block:
@@ -59,18 +68,18 @@ class SemanticAnalyzer:
     def exit_scope(self):
          if self.local_scopes: self.local_scopes.pop()
 
-    def declare_local(self, name: str, node: Union[ast.LetBinding, ast.MutBinding, ast.Parameter]) -> bool:
+    def declare_local(self, name: str, node: Union[ast.LetBinding, ast.MutBinding, ast.Parameter, ast.ForRangeStmt, ast.ForSliceStmt]) -> bool:
          if not self.local_scopes: self.add_error(f"Erro Interno: Declarar local '{name}' fora de escopo.", node); return False
          current_local_scope = self.local_scopes[-1]
          if name in current_local_scope: return False
          current_local_scope[name] = node
          return True
 
-    def lookup_local(self, name: str) -> Optional[Union[ast.LetBinding, ast.MutBinding, ast.Parameter]]:
+    def lookup_local(self, name: str) -> Optional[Union[ast.LetBinding, ast.MutBinding, ast.Parameter, ast.ForRangeStmt, ast.ForSliceStmt]]:
          for scope in reversed(self.local_scopes):
               if name in scope:
                    found_node = scope[name]
-                   if isinstance(found_node, (ast.LetBinding, ast.MutBinding, ast.Parameter)): return found_node
+                   if isinstance(found_node, (ast.LetBinding, ast.MutBinding, ast.Parameter, ast.ForRangeStmt, ast.ForSliceStmt)): return found_node
                    else: self.add_error(f"Erro Interno: Nó local inesperado '{type(found_node).__name__}' para '{name}'."); return None
          return None
 
@@ -81,8 +90,9 @@ class SemanticAnalyzer:
          if global_found_node: return global_found_node
          return None
 
+    @profiler.profiled("semantic")
     def analyze(self, program_node: ast.Program) -> List[str]:
-        self.errors = []
+        self.diagnostics.clear()
         self.global_scope = {}
         self.struct_defs = {}
         self.enum_defs = {}
@@ -90,9 +100,17 @@ class SemanticAnalyzer:
         self.current_function_return_type = None
         self.current_function_name = None
         self.is_in_mem_block = False
+        self.unchecked_region = None
+        self.direct_callees = set(); self.aliased_params = set(); self.function_values = set()
         self.current_loop_level = 0
+        self.type_table = {}
+        self.resolved_type_cache = {}
 
-        for item in program_node.body:
+        # Itens das interfaces importadas (module_loader.py) entram antes dos itens do próprio módulo
+        top_level_items = getattr(program_node, 'imported_items', []) + program_node.body
+
+        profiler.step("semantic.types")
+        for item in top_level_items:
             if isinstance(item, ast.StructDef):
                 type_name = item.name.name
                 if type_name in self.global_scope: self.add_error(f"Tipo '{type_name}' já definido", item.name); continue
@@ -113,7 +131,8 @@ class SemanticAnalyzer:
                     self.enum_variant_values[type_name][variant_name] = next_value
                     next_value += 1
 
-        for item in program_node.body:
+        profiler.step("semantic.globals")
+        for item in top_level_items:
             name_to_declare: Optional[str] = None; node_for_scope: Optional[ast.Node] = None; is_function_like = False
             if isinstance(item, ast.FunctionDef):
                 name_to_declare = item.name.name; node_for_scope = item; is_function_like = True
@@ -130,7 +149,8 @@ class SemanticAnalyzer:
                         self.add_error(f"Nome global '{func_name}' (extern) já definido", decl.name); continue
                     if self._validate_signature_types(decl):
                         self.global_scope[func_name] = decl
-                        setattr(decl, 'is_extern', True); setattr(decl, 'is_var_arg_resolved', getattr(decl, 'is_var_arg', False))
+                        # ABI "Atom": função Atom de outro módulo (interfaces do module_loader), não é FFI
+                        setattr(decl, 'is_extern', item.abi.value != "Atom"); setattr(decl, 'is_var_arg_resolved', getattr(decl, 'is_var_arg', False))
                 continue
             if name_to_declare and node_for_scope:
                 if name_to_declare in self.global_scope:
@@ -140,13 +160,28 @@ class SemanticAnalyzer:
                     else: self.add_error(f"Nome global '{name_to_declare}' já definido", getattr(node_for_scope, 'name', node_for_scope))
                 else: self.global_scope[name_to_declare] = node_for_scope
 
-        for item in program_node.body:
+        profiler.step("semantic.bodies")
+        for item in top_level_items:
             if isinstance(item, (ast.FunctionDef, ast.ConstDef, ast.StructDef, ast.EnumDef)):
                  self.visit(item)
-            elif isinstance(item, (ast.ExternBlock, ast.ImportDecl)): pass
+            elif isinstance(item, ast.ExternBlock): pass
+            elif isinstance(item, ast.ImportDecl):
+                 if getattr(item, 'interface', None) is None:
+                      self.add_error(f"Import '{item.path.value}' não resolvido (compile via module_loader.py para carregar módulos importados)", item)
             else: self.add_error(f"Item top-level inesperado: {type(item).__name__}", item)
+        self.annotate_noalias_params(program_node)
         return self.errors
 
+    def annotate_noalias_params(self, program_node: ast.Program):
+        # Um '&mut' do Atom não impede alias (duas variáveis podem guardar o mesmo '&mut'), então o CodeGen só marca
+        # noalias onde todas as chamadas são vistas aqui e cada uma passa um empréstimo exclusivo (veja exclusive_borrow)
+        exported = getattr(program_node, 'exports_functions', False)
+        for item in program_node.body:
+            if not isinstance(item, ast.FunctionDef): continue
+            callable_elsewhere = exported or id(item) in self.function_values
+            for param in item.params:
+                setattr(param, 'noalias', not callable_elsewhere and id(param) not in self.aliased_params)
+
     def _validate_signature_types(self, node: Union[ast.FunctionDef, ast.FunctionDecl]) -> bool:
         valid = True
         for i, param in enumerate(node.params):
@@ -214,6 +249,7 @@ class SemanticAnalyzer:
         if not resolved_return_type: return None
         outer_func_ret_type = self.current_function_return_type; outer_func_name = self.current_function_name
         self.current_function_return_type = resolved_return_type; self.current_function_name = node.name.name
+        self.unchecked_region = f"unchecked func {node.name.name}" if node.unchecked else None
         self.enter_scope()
         valid_params = True
         for param in node.params:
@@ -221,10 +257,10 @@ class SemanticAnalyzer:
             resolved_type = getattr(param, 'resolved_type', None)
             if not resolved_type: self.add_error(f"Erro interno: tipo do parâmetro '{param_name}' não resolvido.", param); valid_params = False; continue
             if not self.declare_local(param_name, param): self.add_error(f"Parâmetro '{param_name}' redeclarado.", param.name); valid_params = False
-        if not valid_params: self.exit_scope(); self.current_function_return_type = outer_func_ret_type; self.current_function_name = outer_func_name; return None
+        if not valid_params: self.exit_scope(); self.current_function_return_type = outer_func_ret_type; self.current_function_name = outer_func_name; self.unchecked_region = None; return None
         for stmt in node.body: self.visit(stmt)
         self.exit_scope()
-        self.current_function_return_type = outer_func_ret_type; self.current_function_name = outer_func_name
+        self.current_function_return_type = outer_func_ret_type; self.current_function_name = outer_func_name; self.unchecked_region = None
         return None
 
     def visit_LetBinding(self, node: ast.LetBinding):
@@ -345,6 +381,41 @@ class SemanticAnalyzer:
         self.current_loop_level -= 1
         return None
 
+    def visit_ForRangeStmt(self, node: ast.ForRangeStmt):
+        # A variável tem o tipo dos limites (o do outro limite se um for literal; i32 se os dois forem)
+        start_type = self.visit(node.start); end_type = self.visit(node.end)
+        var_type: ast.Type = ast.PrimitiveType("_error_")
+        if start_type is not None and end_type is not None:
+            if not self.is_integer_type(start_type) or not self.is_integer_type(end_type):
+                self.add_error(f"Limites do 'for' devem ser inteiros, mas são '{self.type_to_string(start_type)}' e '{self.type_to_string(end_type)}'.", node)
+            else:
+                var_type = self.get_concrete_type(end_type if isinstance(start_type, ast.LiteralIntegerType) else start_type)
+                if not self.check_type_compatibility(var_type, start_type, node.start) or not self.check_type_compatibility(var_type, end_type, node.end):
+                    self.add_error(f"Limites do 'for' com tipos diferentes: '{self.type_to_string(start_type)}' e '{self.type_to_string(end_type)}'.", node.end)
+        setattr(node, 'declared_type', var_type)
+        self.visit_for_body(node)
+        return None
+
+    def visit_ForSliceStmt(self, node: ast.ForSliceStmt):
+        iterable_type = self.get_concrete_type(self.visit(node.iterable))
+        if isinstance(iterable_type, ast.ReferenceType): iterable_type = self._resolve_type(iterable_type.referenced_type) # &[T; N]
+        element_type: Optional[ast.Type] = None
+        if isinstance(iterable_type, (ast.SliceType, ast.ArrayType)): element_type = self._resolve_type(iterable_type.element_type)
+        elif iterable_type is not None:
+            self.add_error(f"'for ... in' precisa de slice ou array, mas recebeu '{self.type_to_string(iterable_type)}'.", node.iterable)
+        setattr(node, 'declared_type', element_type or ast.PrimitiveType("_error_"))
+        self.visit_for_body(node)
+        return None
+
+    def visit_for_body(self, node: Union[ast.ForRangeStmt, ast.ForSliceStmt]):
+        # A variável de laço é imutável e vale só dentro do corpo
+        self.current_loop_level += 1
+        self.enter_scope()
+        self.declare_local(node.var.name, node)
+        for stmt in node.body: self.visit(stmt)
+        self.exit_scope()
+        self.current_loop_level -= 1
+
     def visit_BreakStmt(self, node: ast.BreakStmt):
         if self.current_loop_level == 0: self.add_error("'break' fora de um loop.", node)
         return None
@@ -353,26 +424,28 @@ class SemanticAnalyzer:
         return None
 
     def visit_MemBlock(self, node: ast.MemBlock): # Modificado para não criar escopo
-        outer_mem_block_state = self.is_in_mem_block
+        outer_mem_block_state = self.is_in_mem_block; outer_unchecked_region = self.unchecked_region
         self.is_in_mem_block = True
+        if node.unchecked and not outer_unchecked_region: self.unchecked_region = "mem unchecked"
         
         # Não chama enter_scope/exit_scope
         for stmt in node.body:
             self.visit(stmt) 
             
-        self.is_in_mem_block = outer_mem_block_state
+        self.is_in_mem_block = outer_mem_block_state; self.unchecked_region = outer_unchecked_region
         return None
         
     def visit_EMemBlock(self, node: ast.EMemBlock): # <--- NOVO MÉTODO
-        outer_mem_block_state = self.is_in_mem_block
+        outer_mem_block_state = self.is_in_mem_block; outer_unchecked_region = self.unchecked_region
         self.is_in_mem_block = True
+        if node.unchecked and not outer_unchecked_region: self.unchecked_region = "e_mem unchecked"
         
         self.enter_scope() # CRIA NOVO ESCOPO
         for stmt in node.body:
             self.visit(stmt) # Visita statements no novo escopo
         self.exit_scope()  # SAI DO ESCOPO
         
-        self.is_in_mem_block = outer_mem_block_state
+        self.is_in_mem_block = outer_mem_block_state; self.unchecked_region = outer_unchecked_region
         return None
 
     def visit_IntegerLiteral(self, node: ast.IntegerLiteral) -> Optional[ast.Type]:
@@ -391,13 +464,14 @@ class SemanticAnalyzer:
         symbol_node = self.lookup_symbol_node(name)
         if symbol_node is None: self.add_error(f"Identificador '{name}' não definido.", node); return ast.PrimitiveType("_error_")
         resolved_type: Optional[ast.Type] = None
-        if isinstance(symbol_node, (ast.LetBinding, ast.MutBinding)):
+        if isinstance(symbol_node, (ast.LetBinding, ast.MutBinding, ast.ForRangeStmt, ast.ForSliceStmt)):
             resolved_type = getattr(symbol_node, 'declared_type', None)
         elif isinstance(symbol_node, ast.Parameter):
              resolved_type = getattr(symbol_node, 'resolved_type', None)
         elif isinstance(symbol_node, ast.ConstDef):
              resolved_type = getattr(symbol_node, 'resolved_type', self._resolve_type(symbol_node.type_annot))
         elif isinstance(symbol_node, (ast.FunctionDef, ast.FunctionDecl)):
+             if id(node) not in self.direct_callees: self.function_values.add(id(symbol_node))
              param_types = [getattr(p, 'resolved_type', ast.PrimitiveType("_error_")) for p in symbol_node.params]
              ret_type = getattr(symbol_node, 'resolved_return_type', ast.PrimitiveType("_error_"))
              is_vararg = getattr(symbol_node, 'is_var_arg_resolved', False)
@@ -522,10 +596,9 @@ class SemanticAnalyzer:
             self.add_error(f"Índice para acesso '[]' deve ser um tipo inteiro, mas é '{self.type_to_string(resolved_index_type)}'.", node.index)
         resolved_collection_type = self.get_concrete_type(collection_type_maybe)
         element_type: Optional[ast.Type] = None
-        if isinstance(resolved_collection_type, ast.ArrayType):
-            element_type = resolved_collection_type.element_type
-        elif isinstance(resolved_collection_type, ast.SliceType):
+        if isinstance(resolved_collection_type, (ast.ArrayType, ast.SliceType)):
             element_type = resolved_collection_type.element_type
+            if self.unchecked_region: setattr(node, 'bounds_unchecked', self.unchecked_region) # CodeGen não emite o bounds check
         elif isinstance(resolved_collection_type, ast.PointerType):
             if not self.check_unsafe_context("Indexação de ponteiro bruto", node): return ast.PrimitiveType("_error_")
             element_type = resolved_collection_type.pointee_type
@@ -571,6 +644,7 @@ class SemanticAnalyzer:
         return True
 
     def visit_FunctionCall(self, node: ast.FunctionCall) -> Optional[ast.Type]:
+        if isinstance(node.callee, ast.Identifier): self.direct_callees.add(id(node.callee))
         callee_type_maybe = self.visit(node.callee)
         if callee_type_maybe is None: return None
         callee_type = self.get_concrete_type(callee_type_maybe)
@@ -601,8 +675,65 @@ class SemanticAnalyzer:
             arg_node_for_error = node.args[i]
             if not self.check_type_compatibility(expected_param_type, provided_arg_type_maybe, arg_node_for_error):
                 self.add_error(f"Tipo do argumento {i+1} ({self.type_to_string(provided_arg_type_maybe)}) é incompatível com o tipo do parâmetro esperado ({self.type_to_string(expected_param_type)}).", arg_node_for_error)
+        self.record_call_borrows(node)
         return self._resolve_type(callee_type.return_type)
 
+    def place_path(self, node: ast.Expression) -> Optional[Tuple[str, ...]]:
+        # Caminho de um lugar guardado no próprio quadro: ('p', '.pos', '[2]'). None se passa por referência,
+        # ponteiro ou slice (a memória é de outro). Índice não literal vira '[_]', que pode ser qualquer elemento.
+        if isinstance(node, ast.Identifier):
+            definition = getattr(node, 'definition_node', None)
+            if isinstance(definition, ast.Parameter): declared_type = getattr(definition, 'resolved_type', None)
+            elif isinstance(definition, (ast.LetBinding, ast.MutBinding, ast.ForRangeStmt)): declared_type = getattr(definition, 'declared_type', None)
+            else: return None # Variável de 'for v in s' pode ser o próprio elemento do slice
+            return (node.name,) if self.is_pointer_free(declared_type) else None
+        if isinstance(node, ast.FieldAccess):
+            base = self.place_path(node.obj)
+            return None if base is None else base + ('.' + node.field.name,)
+        if isinstance(node, ast.IndexAccess):
+            base = self.place_path(node.array)
+            if base is None: return None
+            return base + (f"[{node.index.value}]" if isinstance(node.index, ast.IntegerLiteral) else '[_]',)
+        return None
+
+    def is_pointer_free(self, type_node: Optional[ast.Type]) -> bool:
+        # Um valor deste tipo não alcança outra memória (sem referência, ponteiro ou slice dentro)
+        concrete = self.get_concrete_type(type_node)
+        if concrete is None or isinstance(concrete, (ast.PointerType, ast.ReferenceType, ast.SliceType)): return False
+        if isinstance(concrete, ast.ArrayType): return self.is_pointer_free(concrete.element_type)
+        if isinstance(concrete, ast.CustomType) and concrete.name.name in self.struct_defs:
+            return all(self.is_pointer_free(getattr(f, 'resolved_type', None)) for f in self.struct_defs[concrete.name.name].fields)
+        return True
+
+    def borrow_path(self, node: ast.Expression) -> Optional[Tuple[str, ...]]:
+        # '&lugar' ou '&mut lugar' novo, de um lugar do quadro de quem chama
+        if not (isinstance(node, ast.UnaryOp) and node.op in ('&', '&mut')): return None
+        return self.place_path(node.operand)
+
+    def exclusive_borrow(self, args: List[ast.Expression], index: int) -> bool:
+        # O argumento é um '&mut lugar' novo e nenhum outro argumento alcança esse lugar: os outros são empréstimos
+        # novos de lugares disjuntos ou valores sem referência/ponteiro/slice. Um '&mut' guardado numa variável
+        # (ou 'r' duas vezes em f(r, r)) não prova nada e deixa o parâmetro sem noalias.
+        if not (isinstance(args[index], ast.UnaryOp) and args[index].op == '&mut'): return False
+        path = self.borrow_path(args[index])
+        if path is None: return False
+        for j, other in enumerate(args):
+            if j == index: continue
+            other_path = self.borrow_path(other)
+            if other_path is None:
+                if not self.is_pointer_free(getattr(other, 'atom_type', None)): return False
+            elif all(a == b or '[_]' in (a, b) for a, b in zip(path, other_path)): return False # Um contém o outro
+        return True
+
+    def record_call_borrows(self, node: ast.FunctionCall):
+        if not isinstance(node.callee, ast.Identifier): return
+        callee_node = getattr(node.callee, 'definition_node', None)
+        if not isinstance(callee_node, ast.FunctionDef) or len(node.args) != len(callee_node.params): return
+        for index, param in enumerate(callee_node.params):
+            param_type = self.get_concrete_type(getattr(param, 'resolved_type', None))
+            if isinstance(param_type, ast.ReferenceType) and param_type.is_mutable and not self.exclusive_borrow(node.args, index):
+                self.aliased_params.add(id(param))
+
     def visit_ArrayLiteral(self, node: ast.ArrayLiteral) -> Optional[ast.Type]:
         if not node.elements: return ast.ArrayType(element_type=ast.PrimitiveType("_empty_array_"), size=ast.IntegerLiteral(value=0))
         element_types_maybe = [self.visit(el) for el in node.elements]
@@ -634,7 +765,7 @@ class SemanticAnalyzer:
             field_def_name = f_def.name.name
             resolved_type = getattr(f_def, 'resolved_type', ast.PrimitiveType("_UNRESOLVED_IN_STRUCT_DEF_"))
             defined_fields_map[field_def_name] = resolved_type
-            print(f"    - Defined Field: '{field_def_name}', Resolved Type: {self.type_to_string(resolved_type)}")
+            log.debug("StructLiteral: Defined Field: '%s', Resolved Type: %s", field_def_name, lazy(self.type_to_string, resolved_type))
         
         # print(f"  DEBUG SemAna: defined_fields_map = { {k: self.type_to_string(v) for k,v in defined_fields_map.items()} }")
 
@@ -645,7 +776,7 @@ class SemanticAnalyzer:
         # print(f"  DEBUG SemAna: Processando campos fornecidos no literal:")
         for field_literal_node in node.fields: # Renomeado para evitar conflito com 'field' de struct_def
             field_name_in_literal = field_literal_node.name.name
-            print(f"    - Literal Field: '{field_name_in_literal}' (Node: {field_literal_node.name!r})")
+            log.debug("StructLiteral: Literal Field: '%s' (Node: %r)", field_name_in_literal, field_literal_node.name)
 
             if field_name_in_literal in provided_field_names:
                 self.add_error(f"Campo '{field_name_in_literal}' duplicado no literal de struct '{type_name}'.", field_literal_node.name)
@@ -661,12 +792,13 @@ class SemanticAnalyzer:
             # Se o campo existe na definição, processa seu valor
             value_type_maybe = self.visit(field_literal_node.value) # Visita o valor do campo do literal
             if value_type_maybe is None:
-                print(f"      WARN SemAna: Valor para campo '{field_name_in_literal}' não pôde ser determinado (visit retornou None).")
+                log.warning("Valor para campo '%s' não pôde ser determinado (visit retornou None).", field_name_in_literal)
                 has_errors = True
                 continue
 
             expected_field_type = defined_fields_map[field_name_in_literal]
-            print(f"      - Checking compatibility for field '{field_name_in_literal}': Value type = {self.type_to_string(value_type_maybe)}, Expected type = {self.type_to_string(expected_field_type)}")
+            log.debug("StructLiteral: Checking compatibility for field '%s': Value type = %s, Expected type = %s", field_name_in_literal,
+                      lazy(self.type_to_string, value_type_maybe), lazy(self.type_to_string, expected_field_type))
             if not self.check_type_compatibility(expected_field_type, value_type_maybe, field_literal_node.value):
                  self.add_error(f"Tipo do valor para o campo '{field_name_in_literal}' ({self.type_to_string(value_type_maybe)}) é incompatível com o tipo esperado do campo ({self.type_to_string(expected_field_type)}) no literal de '{type_name}'.", field_literal_node.value)
                  has_errors = True
@@ -715,44 +847,78 @@ class SemanticAnalyzer:
          self.add_error("Underscore '_' não pode ser usado como um valor em uma expressão.", node)
          return None
 
+    def intern_type(self, key: tuple, make) -> ast.Type:
+        # Hash-consing: cada tipo resolvido distinto existe uma única vez (chave usa id() dos filhos já internados)
+        interned = self.type_table.get(key)
+        if interned is None:
+            interned = self.type_table[key] = make()
+            self.resolved_type_cache[id(interned)] = (interned, interned); setattr(interned, 'canonical_type', interned)
+        return interned
+
+    def is_interned(self, type_node: ast.Type) -> bool:
+        entry = self.resolved_type_cache.get(id(type_node))
+        return entry is not None and entry[1] is type_node
+
+    def primitive_type(self, name: str) -> ast.Type:
+        interned = self.type_table.get(('prim', name))
+        return interned if interned is not None else self.intern_type(('prim', name), lambda: ast.PrimitiveType(name))
+
     def _resolve_type(self, type_node: Optional[ast.Type]) -> Optional[ast.Type]:
+        # Memoizado por nó de tipo; o nó fica guardado na entrada, então o id() não é reutilizado
         if type_node is None: return None
-        if isinstance(type_node, (ast.PrimitiveType, ast.UnitType, ast.LiteralIntegerType)):
-            if isinstance(type_node, ast.PrimitiveType) and type_node.name != "_error_" and type_node.name not in self.llvm_types:
+        entry = self.resolved_type_cache.get(id(type_node))
+        if entry is not None: return entry[1]
+        resolved = self._resolve_type_uncached(type_node)
+        # Primitivos temporários (um por expressão) não entram no cache: reinternar pelo nome já é barato
+        if resolved is not None and not isinstance(type_node, ast.PrimitiveType) and self.is_interned(resolved):
+            self.resolved_type_cache[id(type_node)] = (type_node, resolved); setattr(type_node, 'canonical_type', resolved)
+        return resolved
+
+    def _resolve_type_uncached(self, type_node: ast.Type) -> Optional[ast.Type]:
+        # Só resultados internados são memoizados: erros (e CustomType ainda não definido) são reavaliados
+        if isinstance(type_node, ast.LiteralIntegerType): return type_node
+        if isinstance(type_node, ast.UnitType): return self.intern_type(('unit',), ast.UnitType)
+        if isinstance(type_node, ast.PrimitiveType):
+            if type_node.name == "_error_": return type_node
+            if type_node.name not in self.llvm_types:
                  self.add_error(f"Tipo primitivo desconhecido: '{type_node.name}'", type_node); return ast.PrimitiveType("_error_")
-            return type_node
+            return self.primitive_type(type_node.name)
         if isinstance(type_node, ast.PointerType):
             resolved_pointee = self._resolve_type(type_node.pointee_type)
             if resolved_pointee is None or (isinstance(resolved_pointee, PrimitiveType) and resolved_pointee.name == "_error_"): return ast.PrimitiveType("_error_")
-            return ast.PointerType(pointee_type=resolved_pointee, is_mutable=type_node.is_mutable)
+            if not self.is_interned(resolved_pointee): return ast.PointerType(pointee_type=resolved_pointee, is_mutable=type_node.is_mutable)
+            return self.intern_type(('ptr', id(resolved_pointee), type_node.is_mutable), lambda: ast.PointerType(pointee_type=resolved_pointee, is_mutable=type_node.is_mutable))
         if isinstance(type_node, ast.ReferenceType):
             resolved_referenced = self._resolve_type(type_node.referenced_type)
             if resolved_referenced is None or (isinstance(resolved_referenced, PrimitiveType) and resolved_referenced.name == "_error_"): return ast.PrimitiveType("_error_")
-            return ast.ReferenceType(referenced_type=resolved_referenced, is_mutable=type_node.is_mutable)
+            if not self.is_interned(resolved_referenced): return ast.ReferenceType(referenced_type=resolved_referenced, is_mutable=type_node.is_mutable)
+            return self.intern_type(('ref', id(resolved_referenced), type_node.is_mutable), lambda: ast.ReferenceType(referenced_type=resolved_referenced, is_mutable=type_node.is_mutable))
         if isinstance(type_node, ast.ArrayType):
             resolved_element = self._resolve_type(type_node.element_type)
             if resolved_element is None or (isinstance(resolved_element, PrimitiveType) and resolved_element.name == "_error_"): return ast.PrimitiveType("_error_")
-            return ast.ArrayType(element_type=resolved_element, size=type_node.size)
+            # Tamanho não literal: nunca é igual a outro tipo array (ver types_are_equal), então não é internado
+            if not isinstance(type_node.size, ast.IntegerLiteral) or not self.is_interned(resolved_element):
+                return ast.ArrayType(element_type=resolved_element, size=type_node.size)
+            return self.intern_type(('array', id(resolved_element), type_node.size.value), lambda: ast.ArrayType(element_type=resolved_element, size=type_node.size))
         if isinstance(type_node, ast.SliceType):
             resolved_element = self._resolve_type(type_node.element_type)
             if resolved_element is None or (isinstance(resolved_element, PrimitiveType) and resolved_element.name == "_error_"): return ast.PrimitiveType("_error_")
-            return ast.SliceType(element_type=resolved_element, is_mutable=type_node.is_mutable)
+            if not self.is_interned(resolved_element): return ast.SliceType(element_type=resolved_element, is_mutable=type_node.is_mutable)
+            return self.intern_type(('slice', id(resolved_element), type_node.is_mutable), lambda: ast.SliceType(element_type=resolved_element, is_mutable=type_node.is_mutable))
         if isinstance(type_node, ast.FunctionType):
              resolved_params = [self._resolve_type(p) for p in type_node.param_types]
              # Checa se algum parâmetro não pôde ser resolvido
              if any(rp is None or (isinstance(rp, PrimitiveType) and rp.name=="_error_") for rp in resolved_params): return ast.PrimitiveType("_error_")
-             # Força os tipos None/erro a serem _error_ para consistência
-             safe_resolved_params = [rp if rp else ast.PrimitiveType("_error_") for rp in resolved_params]
-
              resolved_ret = self._resolve_type(type_node.return_type)
              if resolved_ret is None or (isinstance(resolved_ret, PrimitiveType) and resolved_ret.name=="_error_"): return ast.PrimitiveType("_error_")
-             safe_resolved_ret = resolved_ret if resolved_ret else ast.PrimitiveType("_error_")
-
-             return ast.FunctionType(param_types=safe_resolved_params, return_type=safe_resolved_ret, is_var_arg=type_node.is_var_arg)
+             if not all(self.is_interned(t) for t in resolved_params + [resolved_ret]):
+                 return ast.FunctionType(param_types=resolved_params, return_type=resolved_ret, is_var_arg=type_node.is_var_arg)
+             key = ('func', tuple(id(p) for p in resolved_params), id(resolved_ret), type_node.is_var_arg)
+             return self.intern_type(key, lambda: ast.FunctionType(param_types=resolved_params, return_type=resolved_ret, is_var_arg=type_node.is_var_arg))
         if isinstance(type_node, ast.CustomType):
             type_name = type_node.name.name
             if type_name in self.struct_defs or type_name in self.enum_defs:
-                return type_node
+                return self.intern_type(('custom', type_name), lambda: type_node)
             else: self.add_error(f"Tipo customizado '{type_name}' não definido.", type_node.name); return ast.PrimitiveType("_error_")
         self.add_error(f"Tipo AST não suportado na resolução: {type(type_node).__name__}", type_node)
         return ast.PrimitiveType("_error_")
@@ -760,40 +926,18 @@ class SemanticAnalyzer:
     def get_concrete_type(self, type_node: Optional[ast.Type]) -> Optional[ast.Type]:
         resolved = self._resolve_type(type_node)
         if isinstance(resolved, ast.LiteralIntegerType):
-            return ast.PrimitiveType(name=resolved.default_type_name)
+            return self.primitive_type(resolved.default_type_name)
         return resolved
 
     def types_are_equal(self, type1_maybe_literal: Optional[ast.Type], type2_maybe_literal: Optional[ast.Type]) -> bool:
+        # Tipos resolvidos são internados: igualdade estrutural == identidade
         t1 = self.get_concrete_type(type1_maybe_literal)
         t2 = self.get_concrete_type(type2_maybe_literal)
         if t1 is None or t2 is None: return False
         if isinstance(t1, PrimitiveType) and t1.name == "_error_": return True # Erro é compatível com tudo para evitar cascata
         if isinstance(t2, PrimitiveType) and t2.name == "_error_": return True
-        if type(t1) is not type(t2): return False
-        if isinstance(t1, ast.PrimitiveType): return t1.name == t2.name
-        if isinstance(t1, ast.UnitType): return True
-        if isinstance(t1, ast.CustomType): return t1.name.name == t2.name.name
-        if isinstance(t1, ast.PointerType): return t1.is_mutable == t2.is_mutable and self.types_are_equal(t1.pointee_type, t2.pointee_type)
-        if isinstance(t1, ast.ReferenceType): return t1.is_mutable == t2.is_mutable and self.types_are_equal(t1.referenced_type, t2.referenced_type)
-        if isinstance(t1, ast.SliceType): return t1.is_mutable == t2.is_mutable and self.types_are_equal(t1.element_type, t2.element_type)
-        if isinstance(t1, ast.ArrayType):
-            elements_equal = self.types_are_equal(t1.element_type, t2.element_type)
-            size1_val = getattr(t1.size, 'value', None) if isinstance(t1.size, ast.IntegerLiteral) else None
-            size2_val = getattr(t2.size, 'value', None) if isinstance(t2.size, ast.IntegerLiteral) else None
-            # Para igualdade de tipos array, os tamanhos DEVEM ser conhecidos e iguais em tempo de compilação.
-            # Se um dos tamanhos não for literal, não podemos dizer que são iguais aqui.
-            if size1_val is None or size2_val is None or size1_val != size2_val:
-                return False # Tamanhos diferentes ou não conhecidos como literais
-            return elements_equal
-        if isinstance(t1, ast.FunctionType):
-            if len(t1.param_types) != len(t2.param_types) or \
-               t1.is_var_arg != t2.is_var_arg or \
-               not self.types_are_equal(t1.return_type, t2.return_type):
-                return False
-            for p1_type, p2_type in zip(t1.param_types, t2.param_types):
-                if not self.types_are_equal(p1_type, p2_type): return False
-            return True
-        return False
+        # Não internados (contêm array de tamanho não literal) são recriados a cada resolução e nunca são iguais
+        return t1 is t2
 
     def check_type_compatibility(self, target_type: Optional[ast.Type], value_type_maybe_literal: Optional[ast.Type], value_node: Optional[ast.Node] = None) -> bool:
         target_resolved = self.get_concrete_type(target_type)
@@ -998,6 +1142,7 @@ class SemanticAnalyzer:
         if isinstance(node, ast.Identifier):
             symbol_node = getattr(node, 'definition_node', self.lookup_symbol_node(node.name)) # Usa anotação se existir
             if not symbol_node: self.add_error(f"Identificador '{node.name}' não definido.", node); return None
+            setattr(node, 'definition_node', symbol_node) # Alvos de atribuição e de '&'/'&mut' também (bounds_analysis)
 
             if isinstance(symbol_node, ast.MutBinding):
                 lvalue_type = getattr(symbol_node, 'declared_type', None)
@@ -1006,6 +1151,10 @@ class SemanticAnalyzer:
                 lvalue_type = getattr(symbol_node, 'declared_type', None)
                 is_assignable = False; can_form_mut_ref = False
                 error_msg = f"Não é possível modificar variável imutável 'let {node.name}'."
+            elif isinstance(symbol_node, (ast.ForRangeStmt, ast.ForSliceStmt)):
+                lvalue_type = getattr(symbol_node, 'declared_type', None)
+                is_assignable = False; can_form_mut_ref = False
+                error_msg = f"Não é possível modificar a variável de laço '{node.name}' do 'for'."
             elif isinstance(symbol_node, ast.Parameter):
                 param_base_type = getattr(symbol_node, 'resolved_type', None)
                 lvalue_type = param_base_type # Tipo do L-Value é o tipo do parâmetro
@@ -1128,10 +1277,16 @@ class SemanticAnalyzer:
         return (lvalue_type, can_form_mut_ref)
 
 
-def analyze_semantics(program_node: ast.Program) -> List[str]:
+def analyze_semantics(program_node: ast.Program, prove_bounds: bool = True) -> List[str]:
+    # prove_bounds=False não roda o bounds_analysis: todo bounds check fica no código (útil para comparar builds)
     analyzer = SemanticAnalyzer()
     try:
-        return analyzer.analyze(program_node)
+        errors = analyzer.analyze(program_node)
+        # Sem erros, a árvore está anotada: marca as indexações que dispensam bounds check
+        if not errors and prove_bounds:
+            report = analyze_bounds(program_node)
+            log.debug("bounds checks provados desnecessários: %d de %d indexações; %d operações sem overflow", report.proven, report.sites, report.no_wrap)
+        return errors
     except Exception as e:
         print(f"ERRO INTERNO IRRECUPERÁVEL DO ANALISADOR SEMÂNTICO: {e}")
         traceback.print_exc()